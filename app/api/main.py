@@ -31,6 +31,8 @@ from app.api.registration_rate_limiter import (
     cleanup_old_registration_attempts
 )
 from app.services.hcaptcha_service import HCaptchaService
+from app.services.email_service import close_email_service
+from app.services.local_specialist_phi3 import close_llama_server_client
 
 from app.api.session_manager import (
     create_session,
@@ -55,7 +57,7 @@ from app.db.models import User
 from app.api.routes.direct_chat import router as direct_chat_router
 
 import os
-import json
+import orjson
 import asyncio
 
 rag_app: Optional[RAGAgentApp] = None
@@ -159,6 +161,12 @@ async def lifespan(app: FastAPI):
         logger.error(f"✗ RAG Agent Application initialization failed: {e}", exc_info=True)
         raise
 
+    try:
+        await rag_app.warmup()
+        logger.info("✓ Provider clients prewarmed")
+    except Exception as e:
+        logger.warning(f"Provider prewarm failed, continuing: {e}")
+
     # Start background cleanup tasks
     async def cleanup_loop():
         while True:
@@ -184,6 +192,9 @@ async def lifespan(app: FastAPI):
         await cleanup_task
     except asyncio.CancelledError:
         pass
+    await close_email_service()
+    await hcaptcha_service.close()
+    await close_llama_server_client()
     await close_db()
     rag_app = None
 
@@ -515,6 +526,8 @@ async def logout(request: Request, response: Response):
     """Logout and clear session."""
     session = await get_session(request)
     if session:
+        if rag_app and session.get("chat_session_id"):
+            rag_app.close_coordinator_session(session["chat_session_id"])
         await clear_session(response, request)
         return {"message": "Logged out successfully"}
     return {"message": "No active session"}
@@ -630,14 +643,14 @@ async def chat_coordinator_stream(
                 from app.api.session_manager import verify_csrf_token
                 if not await verify_csrf_token(request):
                     error_event = {"type": "error", "data": {"message": "Invalid CSRF token"}}
-                    yield f"data: {json.dumps(error_event)}\n\n"
+                    yield f"data: {orjson.dumps(error_event).decode()}\n\n"
                     return
                 chat_session_id = session["chat_session_id"]
             elif request_data.session_id:
                 chat_session_id = request_data.session_id
             else:
                 error_event = {"type": "error", "data": {"message": "Session ID required"}}
-                yield f"data: {json.dumps(error_event)}\n\n"
+                yield f"data: {orjson.dumps(error_event).decode()}\n\n"
                 return
 
             async for event in app.coordinator_chat_stream(
@@ -645,18 +658,18 @@ async def chat_coordinator_stream(
                     user_id=str(current_user.id),
                     session_id=chat_session_id
             ):
-                sse_data = f"data: {json.dumps(event)}\n\n"
+                sse_data = f"data: {orjson.dumps(event).decode()}\n\n"
                 yield sse_data
                 await asyncio.sleep(0.001)
 
         except InputSanitizationError as e:
             logger.warning(f"Input sanitization failed: {e}")
             error_event = {"type": "error", "data": {"message": f"Input validation failed: {str(e)}"}}
-            yield f"data: {json.dumps(error_event)}\n\n"
+            yield f"data: {orjson.dumps(error_event).decode()}\n\n"
         except Exception as e:
             logger.error(f"Error in streaming chat: {e}", exc_info=True)
             error_event = {"type": "error", "data": {"message": str(e)}}
-            yield f"data: {json.dumps(error_event)}\n\n"
+            yield f"data: {orjson.dumps(error_event).decode()}\n\n"
 
     return StreamingResponse(
         event_generator(),
@@ -1,7 +1,7 @@
 """
 Direct chat routes - bypasses coordinator for direct provider communication.
 """
-import json
+import orjson
 import asyncio
 from fastapi import APIRouter, Request, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
@@ -17,6 +17,7 @@ from app.api.rate_limiter import check_rate_limit, RATE_LIMITS
 from app.db.models import User
 from app.services.cloud_router_anthropic import CloudRouterAnthropicService
 from app.services.cloud_router_google import CloudRouterGoogleService
+from app.services.cloud_specialist_google import configure_client
 
 
 router = APIRouter(prefix="/chat/direct", tags=["direct-chat"])
@@ -63,12 +64,12 @@ async def chat_direct_anthropic_stream(
             session = await get_session(request)
             if not session:
                 error_event = {"type": "error", "data": {"message": "Session required"}}
-                yield f"data: {json.dumps(error_event)}\n\n"
+                yield f"data: {orjson.dumps(error_event).decode()}\n\n"
                 return
 
             if not await verify_csrf_token(request):
                 error_event = {"type": "error", "data": {"message": "Invalid CSRF token"}}
-                yield f"data: {json.dumps(error_event)}\n\n"
+                yield f"data: {orjson.dumps(error_event).decode()}\n\n"
                 return
 
             # Get API key from header or fall back to .env
@@ -78,7 +79,7 @@ async def chat_direct_anthropic_stream(
                 api_key = settings.anthropic_api_key
                 if not api_key:
                     error_event = {"type": "error", "data": {"message": "API key required"}}
-                    yield f"data: {json.dumps(error_event)}\n\n"
+                    yield f"data: {orjson.dumps(error_event).decode()}\n\n"
                     return
 
             # Create client with user's API key (never stored)
@@ -93,21 +94,21 @@ async def chat_direct_anthropic_stream(
             ) as stream:
                 async for text in stream.text_stream:
                     content_event = {"type": "content", "data": {"content": text}}
-                    yield f"data: {json.dumps(content_event)}\n\n"
+                    yield f"data: {orjson.dumps(content_event).decode()}\n\n"
                     await asyncio.sleep(0.001)
 
             # Send done event
             done_event = {"type": "done", "data": {}}
-            yield f"data: {json.dumps(done_event)}\n\n"
+            yield f"data: {orjson.dumps(done_event).decode()}\n\n"
 
         except APIError as e:
             logger.error(f"Anthropic API error: {e}", exc_info=True)
             error_event = {"type": "error", "data": {"message": f"Anthropic API error: {str(e)}"}}
-            yield f"data: {json.dumps(error_event)}\n\n"
+            yield f"data: {orjson.dumps(error_event).decode()}\n\n"
         except Exception as e:
             logger.error(f"Error in direct Anthropic streaming: {e}", exc_info=True)
             error_event = {"type": "error", "data": {"message": str(e)}}
-            yield f"data: {json.dumps(error_event)}\n\n"
+            yield f"data: {orjson.dumps(error_event).decode()}\n\n"
 
     return StreamingResponse(
         event_generator(),
@@ -260,12 +261,12 @@ async def chat_direct_google_stream(
             session = await get_session(request)
             if not session:
                 error_event = {"type": "error", "data": {"message": "Session required"}}
-                yield f"data: {json.dumps(error_event)}\n\n"
+                yield f"data: {orjson.dumps(error_event).decode()}\n\n"
                 return
 
             if not await verify_csrf_token(request):
                 error_event = {"type": "error", "data": {"message": "Invalid CSRF token"}}
-                yield f"data: {json.dumps(error_event)}\n\n"
+                yield f"data: {orjson.dumps(error_event).decode()}\n\n"
                 return
 
             # Get API key from header or fall back to .env
@@ -275,11 +276,11 @@ async def chat_direct_google_stream(
                 api_key = settings.google_api_key
                 if not api_key:
                     error_event = {"type": "error", "data": {"message": "API key required"}}
-                    yield f"data: {json.dumps(error_event)}\n\n"
+                    yield f"data: {orjson.dumps(error_event).decode()}\n\n"
                     return
 
             # Configure Google API with user's key (never stored)
-            genai.configure(api_key=api_key)
+            configure_client(api_key)
 
             # Create model
             model = genai.GenerativeModel(
@@ -302,21 +303,21 @@ async def chat_direct_google_stream(
             for chunk in response_iterator:
                 if chunk.text:
                     content_event = {"type": "content", "data": {"content": chunk.text}}
-                    yield f"data: {json.dumps(content_event)}\n\n"
+                    yield f"data: {orjson.dumps(content_event).decode()}\n\n"
                     await asyncio.sleep(0.001)
 
             # Send done event
             done_event = {"type": "done", "data": {}}
-            yield f"data: {json.dumps(done_event)}\n\n"
+            yield f"data: {orjson.dumps(done_event).decode()}\n\n"
 
         except google_exceptions.ResourceExhausted as e:
             logger.error(f"Google rate limit error: {e}", exc_info=True)
             error_event = {"type": "error", "data": {"message": "Google API rate limit exceeded"}}
-            yield f"data: {json.dumps(error_event)}\n\n"
+            yield f"data: {orjson.dumps(error_event).decode()}\n\n"
         except Exception as e:
             logger.error(f"Error in direct Google streaming: {e}", exc_info=True)
             error_event = {"type": "error", "data": {"message": str(e)}}
-            yield f"data: {json.dumps(error_event)}\n\n"
+            yield f"data: {orjson.dumps(error_event).decode()}\n\n"
 
     return StreamingResponse(
         event_generator(),
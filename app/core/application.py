@@ -140,6 +140,11 @@ class RAGAgentApp:
 
         logger.info("🚀 RAG Agent Application initialized successfully")
 
+    async def warmup(self) -> None:
+        """Prewarm provider clients used by the coordinator agent."""
+        if self.coordinator_agent:
+            await self.coordinator_agent.warmup()
+
     async def create_session(self, user_id: str = "local_user") -> str:
         """
         Create a new chat session.
@@ -173,6 +178,16 @@ class RAGAgentApp:
             import uuid
             return str(uuid.uuid4())
 
+    def close_coordinator_session(self, session_id: str) -> None:
+        """
+        Release coordinator state held for a chat session.
+
+        Args:
+            session_id: Session identifier
+        """
+        if self.coordinator_agent:
+            self.coordinator_agent.close_session(session_id)
+
     async def chat(
         self,
         message: str,
@@ -76,5 +76,6 @@ class ProviderFactory:
             n_threads=kwargs.get('n_threads'),
             temperature=kwargs.get('temperature', 0.7),
             max_tokens=kwargs.get('max_tokens', 512),
-            verbose=kwargs.get('verbose', False)
+            verbose=kwargs.get('verbose', False),
+            prompt_cache_bytes=kwargs.get('prompt_cache_bytes', 0)
         )
\ No newline at end of file
@@ -46,7 +46,8 @@ class LlamaCppChatProvider(ChatProvider):
             n_threads: Optional[int] = None,
             temperature: float = 0.7,
             max_tokens: int = 512,
-            verbose: bool = False
+            verbose: bool = False,
+            prompt_cache_bytes: int = 0
     ):
         self.model_path = model_path
         self.n_ctx = n_ctx
@@ -55,6 +56,7 @@ class LlamaCppChatProvider(ChatProvider):
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.verbose = verbose
+        self.prompt_cache_bytes = prompt_cache_bytes
         self._llm = None
 
     def _get_llm(self):
@@ -68,6 +70,15 @@ class LlamaCppChatProvider(ChatProvider):
                 max_tokens=self.max_tokens,
                 verbose=self.verbose
             )
+
+            # RAG prompts share a fixed preamble; cached KV states let
+            # llama.cpp resume from the longest matching prefix instead of
+            # prefilling it again for every query
+            if self.prompt_cache_bytes > 0:
+                from llama_cpp import LlamaRAMCache
+                self._llm.client.set_cache(
+                    LlamaRAMCache(capacity_bytes=self.prompt_cache_bytes)
+                )
         return self._llm
 
     def generate(self, prompt: str, **kwargs) -> str:
@@ -101,7 +112,8 @@ class LlamaCppProvider(ModelProvider):
             n_threads: Optional[int] = None,
             temperature: float = 0.7,
             max_tokens: int = 512,
-            verbose: bool = False
+            verbose: bool = False,
+            prompt_cache_bytes: int = 0
     ):
         self.embedding_model_path = embedding_model_path
         self.chat_model_path = chat_model_path
@@ -111,6 +123,7 @@ class LlamaCppProvider(ModelProvider):
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.verbose = verbose
+        self.prompt_cache_bytes = prompt_cache_bytes
 
         self._embedding_provider = None
         self._chat_provider = None
@@ -134,6 +147,7 @@ class LlamaCppProvider(ModelProvider):
                 n_threads=self.n_threads,
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,
-                verbose=self.verbose
+                verbose=self.verbose,
+                prompt_cache_bytes=self.prompt_cache_bytes
             )
         return self._chat_provider
\ No newline at end of file
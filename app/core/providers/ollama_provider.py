@@ -38,7 +38,6 @@ class OllamaChatProvider(ChatProvider):
         self.model = model
         self.base_url = base_url
         self.debug = debug
-        litellm.set_verbose = debug
 
     def generate(self, prompt: str, **kwargs) -> str:
         messages = [{"role": "user", "content": prompt}]
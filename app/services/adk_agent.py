@@ -1,6 +1,7 @@
 """
 Google ADK Agent service with multi-provider tool support.
 """
+import logging
 import uuid
 from typing import Optional
 
@@ -273,18 +274,25 @@ class ADKAgentService:
         # Collect events and look for final response
         final_response = None
         event_count = 0
+        debug_events = logger.isEnabledFor(logging.DEBUG)
 
-        async for event in result_generator:
-            event_count += 1
-            logger.debug(f"Event #{event_count}: {type(event).__name__}")
-
-            # Check if this is the final response using the official method
-            if event.is_final_response():
-                logger.info(f"Found final response in event #{event_count}")
-                if event.content and event.content.parts:
-                    final_response = event.content.parts[0].text
-                    logger.info(f"Final response text: {final_response[:100]}")
-                    break
+        try:
+            async for event in result_generator:
+                event_count += 1
+                if debug_events:
+                    logger.debug("Event #%d: %s", event_count, type(event).__name__)
+
+                # Check if this is the final response using the official method
+                if event.is_final_response():
+                    logger.info(f"Found final response in event #{event_count}")
+                    if event.content and event.content.parts:
+                        final_response = event.content.parts[0].text
+                        logger.info(f"Final response text: {final_response[:100]}")
+                        break
+        finally:
+            # Close the runner generator now rather than at GC time so its
+            # model connection is released as soon as we stop reading
+            await result_generator.aclose()
 
         logger.info(f"Total events processed: {event_count}")
 
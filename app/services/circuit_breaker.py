@@ -1,12 +1,30 @@
 """
 Circuit breaker pattern for handling provider failures.
 """
+import math
+import random
 import time
-from typing import Optional
+from collections import deque
+from typing import Deque, Optional
 
 from config import logger
 
 
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 8.0) -> float:
+    """
+    Exponential backoff with jitter for retrying a provider call.
+
+    Args:
+        attempt: Zero-based attempt number that just failed
+        base: Delay after the first failure, in seconds
+        cap: Upper bound before jitter, in seconds
+
+    Returns:
+        Seconds to sleep; randomized by +/-50% so concurrent retries spread out
+    """
+    return min(cap, base * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+
 class CircuitBreaker:
     """
     Circuit breaker to prevent repeated calls to failing services.
@@ -15,6 +33,9 @@ class CircuitBreaker:
     - CLOSED: Normal operation, requests pass through
     - OPEN: Service failing, requests blocked
     - HALF_OPEN: Testing if service recovered
+
+    Besides consecutive failures, the circuit can open when the p95 of recent
+    call latencies exceeds a threshold - a slow but answering provider.
     """
 
     def __init__(
@@ -22,7 +43,10 @@ class CircuitBreaker:
             name: str,
             failure_threshold: int = 5,
             timeout: int = 60,
-            half_open_attempts: int = 1
+            half_open_attempts: int = 1,
+            latency_threshold_ms: Optional[float] = None,
+            latency_window: int = 100,
+            min_latency_samples: int = 20
     ):
         """
         Initialize circuit breaker.
@@ -32,11 +56,17 @@ class CircuitBreaker:
             failure_threshold: Number of failures before opening circuit
             timeout: Seconds to wait before attempting recovery
             half_open_attempts: Number of successful attempts needed to close
+            latency_threshold_ms: p95 latency that opens the circuit (None disables)
+            latency_window: Number of recent latencies kept
+            min_latency_samples: Samples required before latency can open the circuit
         """
         self.name = name
         self.failure_threshold = failure_threshold
         self.timeout = timeout
         self.half_open_attempts = half_open_attempts
+        self.latency_threshold_ms = latency_threshold_ms
+        self.min_latency_samples = min_latency_samples
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
 
         self.failures = 0
         self.successes = 0
@@ -97,11 +127,44 @@ class CircuitBreaker:
             # Shouldn't happen, but handle gracefully
             logger.warning(f"Circuit breaker [{self.name}] received success while OPEN")
 
+    def record_latency(self, latency_ms: float):
+        """
+        Record a successful call's latency and open the circuit if p95 is too high.
+
+        Args:
+            latency_ms: Call duration in milliseconds
+        """
+        self._latencies.append(latency_ms)
+
+        if (
+                self.latency_threshold_ms is None
+                or self.state != "CLOSED"
+                or len(self._latencies) < self.min_latency_samples
+        ):
+            return
+
+        p95 = self.latency_p95()
+        if p95 > self.latency_threshold_ms:
+            self._open_circuit()
+            logger.warning(
+                f"Circuit breaker [{self.name}] OPENED on p95 latency {p95:.0f}ms "
+                f"(> {self.latency_threshold_ms:.0f}ms), blocking for {self.timeout}s"
+            )
+
+    def latency_p95(self) -> Optional[float]:
+        """p95 of the recorded latency window in milliseconds, if any."""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[math.ceil(0.95 * len(ordered)) - 1]
+
     def _open_circuit(self):
         """Open the circuit."""
         self.state = "OPEN"
         self.open_until = time.time() + self.timeout
         self.failures = 0
+        # Judge the provider afresh after recovery
+        self._latencies.clear()
 
     def _close_circuit(self):
         """Close the circuit."""
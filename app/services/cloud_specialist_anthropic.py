@@ -2,10 +2,29 @@
 Cloud specialist service using Anthropic's Claude API.
 """
 import asyncio
-from typing import Dict, Any, AsyncGenerator
-from anthropic import AsyncAnthropic, RateLimitError, APIError
+from typing import Dict, Any, AsyncGenerator, Optional
+import httpx
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient, RateLimitError, APIError
 
 from config import settings, logger
+from app.services.circuit_breaker import backoff_delay
+
+# Connection pool sizing shared by every Anthropic client in the app
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Shared client so every specialist reuses one connection pool
+_client: Optional[AsyncAnthropic] = None
+
+
+def get_anthropic_client() -> AsyncAnthropic:
+    """Get or create the shared AsyncAnthropic client (HTTP/2, pooled)."""
+    global _client
+    if _client is None:
+        _client = AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            http_client=DefaultAsyncHttpxClient(http2=True, limits=HTTP_LIMITS)
+        )
+    return _client
 
 
 class CloudSpecialistAnthropicService:
@@ -70,7 +89,7 @@ Be helpful and engaging."""
             specialist_type: Type of specialist (code_validation, etc.)
         """
         self.specialist_type = specialist_type
-        self.client = AsyncAnthropic(api_key=settings.anthropic_api_key)
+        self.client = get_anthropic_client()
         self.model = settings.anthropic_model
         self.system_prompt = self.SPECIALIST_PROMPTS.get(
             specialist_type,
@@ -105,8 +124,8 @@ Be helpful and engaging."""
                     f"[Anthropic {self.specialist_type}] Rate limit hit (attempt {attempt + 1}/{retries}): {e}"
                 )
                 if attempt < retries - 1:
-                    # Exponential backoff: 1s, 2s, 4s
-                    wait_time = 2 ** attempt
+                    # Exponential backoff with jitter: ~1s, 2s, 4s
+                    wait_time = backoff_delay(attempt)
                     await asyncio.sleep(wait_time)
                     continue
                 else:
@@ -149,7 +168,7 @@ Be helpful and engaging."""
                     f"[Anthropic {self.specialist_type}] Rate limit hit (attempt {attempt + 1}/{retries}): {e}"
                 )
                 if attempt < retries - 1:
-                    wait_time = 2 ** attempt
+                    wait_time = backoff_delay(attempt)
                     await asyncio.sleep(wait_time)
                     continue
                 else:
@@ -181,7 +200,7 @@ Be helpful and engaging."""
 
         response = await self.client.messages.create(
             model=self.model,
-            max_tokens=2048,
+            max_tokens=settings.specialist_max_tokens,
             temperature=0.7,
             system=self.system_prompt,
             messages=[
@@ -213,7 +232,7 @@ Be helpful and engaging."""
 
         async with self.client.messages.stream(
             model=self.model,
-            max_tokens=2048,
+            max_tokens=settings.specialist_max_tokens,
             temperature=0.7,
             system=self.system_prompt,
             messages=[
@@ -2,11 +2,24 @@
 Cloud specialist service using Google's Gemini API.
 """
 import asyncio
-from typing import Dict, Any, AsyncGenerator
+from typing import Dict, Any, AsyncGenerator, Optional
 import google.generativeai as genai
 from google.api_core import exceptions
 
 from config import settings, logger
+from app.services.circuit_breaker import backoff_delay
+
+# API key the SDK was last configured with; genai.configure() drops the
+# cached gRPC clients, so only call it when the key actually changes
+_configured_key: Optional[str] = None
+
+
+def configure_client(api_key: Optional[str]):
+    """Configure the Gemini SDK once per API key so its channel is reused."""
+    global _configured_key
+    if _configured_key is None or _configured_key != api_key:
+        genai.configure(api_key=api_key)
+        _configured_key = api_key
 
 
 class CloudSpecialistGoogleService:
@@ -71,7 +84,7 @@ Be helpful and engaging."""
             specialist_type: Type of specialist (code_validation, etc.)
         """
         self.specialist_type = specialist_type
-        genai.configure(api_key=settings.google_api_key)
+        configure_client(settings.google_api_key)
         self.model_name = settings.google_model
 
         system_instruction = self.SPECIALIST_PROMPTS.get(
@@ -83,7 +96,7 @@ Be helpful and engaging."""
             self.model_name,
             generation_config={
                 "temperature": 0.7,
-                "max_output_tokens": 2048,
+                "max_output_tokens": settings.specialist_max_tokens,
             },
             system_instruction=system_instruction
         )
@@ -116,8 +129,8 @@ Be helpful and engaging."""
                     f"[Google {self.specialist_type}] Rate limit hit (attempt {attempt + 1}/{retries}): {e}"
                 )
                 if attempt < retries - 1:
-                    # Exponential backoff: 1s, 2s, 4s
-                    wait_time = 2 ** attempt
+                    # Exponential backoff with jitter: ~1s, 2s, 4s
+                    wait_time = backoff_delay(attempt)
                     await asyncio.sleep(wait_time)
                     continue
                 else:
@@ -156,7 +169,7 @@ Be helpful and engaging."""
                     f"[Google {self.specialist_type}] Rate limit hit (attempt {attempt + 1}/{retries}): {e}"
                 )
                 if attempt < retries - 1:
-                    wait_time = 2 ** attempt
+                    wait_time = backoff_delay(attempt)
                     await asyncio.sleep(wait_time)
                     continue
                 else:
@@ -2,18 +2,59 @@
 Coordinator Agent service with cloud-first specialist delegation using router-based classification.
 """
 import asyncio
+import hashlib
+import re
+import time
 import uuid
-from typing import Optional, Dict, Any, List, AsyncGenerator
-
-from google.genai import types
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple, Awaitable, AsyncGenerator, TYPE_CHECKING
 
 from config import settings, logger
-from app.services.rag import RAGService
-from app.services.rag_anthropic import RAGAnthropicService
-from app.services.rag_google import RAGGoogleService
-from app.services.router import RouterService
 from app.services.specialist_manager import SpecialistManager
 from app.db.session_service import PostgreSQLSessionService
+from app.services.ttl_cache import TTLCache
+
+# Upper bound on cached specialist responses before expired entries are pruned
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+
+# Unambiguous single-intent phrasings that can skip the router classifier
+FAST_ROUTE_PATTERNS = {
+    "code_validation": re.compile(
+        r"\b(validate|check|verify|lint)\s+(this|the|my)\s+(code|syntax|function|script)\b",
+        re.IGNORECASE
+    ),
+    "code_generation": re.compile(
+        r"\b(write|generate|create|implement)\s+(me\s+)?(a|an)\s+"
+        r"(\w+\s+)?(function|class|script|program|method)\b",
+        re.IGNORECASE
+    ),
+    "code_analysis": re.compile(
+        r"\b(explain|review|analy[sz]e)\s+(this|the|my)\s+(code|function|class|script)\b",
+        re.IGNORECASE
+    ),
+    "rag_query": re.compile(
+        r"\b(search|check)\s+(the\s+)?(docs|documents|documentation|knowledge\s+base)\b",
+        re.IGNORECASE
+    ),
+    # Whole-message greetings/thanks (or nothing at all)
+    "general_chat": re.compile(
+        r"^\s*((hi|hello|hey|thanks|thank\s+you|good\s+(morning|afternoon|evening))"
+        r"(\s+there)?[\s,.!?]*)?$",
+        re.IGNORECASE
+    ),
+}
+
+# Connectors that suggest a multi-part request the router should classify
+MULTI_INTENT_PATTERN = re.compile(r"\b(and|also|then|plus)\b|[?!.;]\s+\S", re.IGNORECASE)
+
+# Type-only imports - the services are injected, so avoid pulling in their SDKs here
+if TYPE_CHECKING:
+    from app.services.rag import RAGService
+    from app.services.rag_anthropic import RAGAnthropicService
+    from app.services.rag_base import Retrieval
+    from app.services.rag_google import RAGGoogleService
+    from app.services.router import RouterService
 
 
 class CoordinatorAgentService:
@@ -21,10 +62,10 @@ class CoordinatorAgentService:
 
     def __init__(
         self,
-        rag_service: RAGService,
-        router_service: RouterService,
-        rag_anthropic_service: Optional[RAGAnthropicService] = None,
-        rag_google_service: Optional[RAGGoogleService] = None
+        rag_service: 'RAGService',
+        router_service: 'RouterService',
+        rag_anthropic_service: Optional['RAGAnthropicService'] = None,
+        rag_google_service: Optional['RAGGoogleService'] = None
     ):
         """
         Initialize coordinator agent service with cloud specialists.
@@ -46,6 +87,18 @@ class CoordinatorAgentService:
         # Use PostgreSQL session service
         self.session_service = PostgreSQLSessionService()
 
+        # Caps concurrent specialist calls so fan-out doesn't flood the backend
+        self._fanout_semaphore = asyncio.Semaphore(max(1, settings.max_parallel_specialists))
+
+        # LRU of session IDs already confirmed in the database
+        self._known_sessions: 'OrderedDict[str, None]' = OrderedDict()
+
+        # Router classifier runs off the event loop, one call at a time
+        self._router_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="router")
+
+        # TTL cache of specialist responses keyed on (category, message hash)
+        self._response_cache = TTLCache(RESPONSE_CACHE_MAX_ENTRIES)
+
         # Human-readable names for specialists
         self.specialist_names = {
             "code_validation": "Code Validator",
@@ -64,6 +117,26 @@ class CoordinatorAgentService:
             f"Local: {status['local']['available']}"
         )
 
+    async def warmup(self) -> None:
+        """
+        Prewarm provider clients so the first chat turn skips SDK
+        initialization and connection setup.
+
+        Failures are logged and ignored - warmup is best effort. The local
+        fallback model, if any, keeps loading in the background.
+        """
+        self.specialist_manager.prewarm_local()
+
+        results = await asyncio.gather(
+            self.specialist_manager.prewarm_anthropic(),
+            self.specialist_manager.prewarm_google(),
+            return_exceptions=True
+        )
+
+        for provider, result in zip(("Anthropic", "Google"), results):
+            if isinstance(result, Exception):
+                logger.warning(f"{provider} prewarm failed: {result}")
+
     async def create_session(self, user_id: str = "local_user") -> str:
         """
         Create a new conversation session.
@@ -81,9 +154,22 @@ class CoordinatorAgentService:
             session_id=session_id,
             agent_type="coordinator"
         )
+        self._remember_session(session_id)
         logger.info(f"Created coordinator session: {session_id}")
         return session_id
 
+    def close_session(self, session_id: str) -> None:
+        """
+        Release in-memory state held for a session.
+
+        The conversation history stays in the database; only the
+        coordinator's cached knowledge of the session is dropped.
+
+        Args:
+            session_id: Session identifier
+        """
+        self._known_sessions.pop(session_id, None)
+
     async def chat(
         self,
         message: str,
@@ -108,9 +194,26 @@ class CoordinatorAgentService:
         # FIXED: Ensure session exists before processing
         await self._ensure_session_exists(session_id, user_id)
 
+        speculative_task = None
+        rag_task = None
         try:
             # Route to appropriate specialist(s)
-            routing_decision = self.router_service.route(message)
+            routing_decision = self._lookup_route(message)
+            if routing_decision is None:
+                if settings.speculative_rag_context:
+                    # Retrieve knowledge base documents while the classifier runs;
+                    # the answer is only generated if the router picks rag_query
+                    rag_task = asyncio.ensure_future(self._retrieve_rag_documents(message))
+                if settings.speculative_general_chat:
+                    # Start the likeliest specialist while the classifier runs
+                    speculative_task = asyncio.ensure_future(
+                        self._run_specialist_safe(
+                            "general_chat",
+                            self._execute_specialist("general_chat", message)
+                        )
+                    )
+                routing_decision = await self._route(message)
+
             primary_agent = routing_decision["primary_agent"]
             parallel_agents = routing_decision.get("parallel_agents", [])
             confidence = routing_decision["confidence"]
@@ -123,14 +226,37 @@ class CoordinatorAgentService:
             # Check if parallel execution needed
             if parallel_agents:
                 categories = [primary_agent] + parallel_agents
-                responses = await self._run_parallel_specialists(
+
+                # Low confidence - take whichever specialist answers first
+                if confidence < settings.hedge_confidence_threshold:
+                    response = await self._run_first_successful(categories, message)
+                    if response:
+                        return response
+                    return await self._fallback_to_general_assistant(message, session_id)
+
+                results = await self._run_parallel_specialists(
                     categories, message, session_id
                 )
-                return self._aggregate_responses(categories, responses)
+                if not any(response for _, response in results):
+                    logger.warning("All parallel specialists failed")
+                    return await self._fallback_to_general_assistant(message, session_id)
+
+                return self._aggregate_responses(results)
             else:
                 # Single specialist execution
+                if primary_agent == "general_chat" and speculative_task:
+                    _, response = await speculative_task
+                    speculative_task = None
+                    if response:
+                        await self._add_to_session(session_id, message, response)
+                        return response
+
+                context = None
+                if primary_agent == "rag_query" and rag_task:
+                    context = await self._get_rag_context(message, retrieval=await rag_task)
+
                 return await self._run_single_specialist(
-                    primary_agent, message, session_id
+                    primary_agent, message, session_id, context=context
                 )
 
         except Exception as e:
@@ -138,6 +264,12 @@ class CoordinatorAgentService:
             logger.info("Falling back to general assistant due to error")
             return await self._fallback_to_general_assistant(message, session_id)
 
+        finally:
+            # Router picked something else - drop the speculative work
+            for task in (speculative_task, rag_task):
+                if task and not task.done():
+                    task.cancel()
+
     async def chat_stream(
         self,
         message: str,
@@ -162,7 +294,7 @@ class CoordinatorAgentService:
 
         try:
             # Route to appropriate specialist(s)
-            routing_decision = self.router_service.route(message)
+            routing_decision = await self._route(message)
             primary_agent = routing_decision["primary_agent"]
             confidence = routing_decision["confidence"]
             reasoning = routing_decision.get("reasoning", "")
@@ -187,17 +319,19 @@ class CoordinatorAgentService:
                 }
             }
 
-            # Stream specialist response
-            full_response = ""
-            async for chunk in self._run_streaming_specialist(
-                primary_agent, message, session_id
+            # Stream specialist response, coalescing small chunks into fewer events
+            response_parts: List[str] = []
+            async for text in self._coalesce_chunks(
+                self._run_streaming_specialist(primary_agent, message, session_id)
             ):
-                full_response += chunk
+                response_parts.append(text)
                 yield {
                     "type": "content",
-                    "data": chunk
+                    "data": text
                 }
 
+            full_response = "".join(response_parts)
+
             # Yield completion event BEFORE database write
             yield {
                 "type": "done",
@@ -214,14 +348,108 @@ class CoordinatorAgentService:
                 "data": {"message": str(e)}
             }
 
+    def _lookup_route(self, message: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a routing decision without running the router classifier.
+
+        Covers fast-path keyword matches and the router-less default. Repeated
+        prompts are cached by the router service itself.
+
+        Args:
+            message: User's message
+
+        Returns:
+            Routing decision dict, or None if the classifier must run
+        """
+        fast_decision = self._fast_route(message)
+        if fast_decision is not None:
+            return fast_decision
+
+        if self.router_service is None:
+            # Cloud mode runs without a router
+            return {
+                "primary_agent": "general_chat",
+                "parallel_agents": [],
+                "confidence": 1.0,
+                "reasoning": "Router not configured - using default agent"
+            }
+
+        return None
+
+    async def _route(self, message: str) -> Dict[str, Any]:
+        """
+        Route a message, running the router classifier unless a shortcut applies.
+
+        The router classifier is synchronous (llama.cpp or a blocking SDK), so
+        it runs on a dedicated single worker thread to keep the event loop free
+        while never calling the model concurrently.
+
+        Args:
+            message: User's message
+
+        Returns:
+            Routing decision dict
+        """
+        routing_decision = self._lookup_route(message)
+        if routing_decision is not None:
+            return routing_decision
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._router_executor,
+            self.router_service.route,
+            message
+        )
+
+    @staticmethod
+    def _fast_route(message: str) -> Optional[Dict[str, Any]]:
+        """
+        Classify obvious single-intent messages without calling the router.
+
+        Args:
+            message: User's message
+
+        Returns:
+            Routing decision dict, or None if the router should decide
+        """
+        if MULTI_INTENT_PATTERN.search(message):
+            return None
+
+        matches = [
+            category for category, pattern in FAST_ROUTE_PATTERNS.items()
+            if pattern.search(message)
+        ]
+        if len(matches) != 1:
+            return None
+
+        logger.info(f"Fast-path routed to '{matches[0]}'")
+        return {
+            "primary_agent": matches[0],
+            "parallel_agents": [],
+            "confidence": 0.9,
+            "reasoning": "Matched fast-path keyword pattern"
+        }
+
+    @staticmethod
+    def _message_key(message: str) -> str:
+        """Hash a case/whitespace-normalized message for cache lookups."""
+        normalized = " ".join(message.split()).lower()
+        return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
     async def _ensure_session_exists(self, session_id: str, user_id: str) -> None:
         """
         Ensure session exists in database, create if missing.
 
+        Sessions already seen by this service skip the database check.
+
         Args:
             session_id: Session identifier
             user_id: User identifier
         """
+        if session_id in self._known_sessions:
+            self._known_sessions.move_to_end(session_id)
+            return
+
         exists = await self.session_service.session_exists(session_id)
         if not exists:
             logger.warning(
@@ -233,12 +461,21 @@ class CoordinatorAgentService:
                 session_id=session_id,
                 agent_type="coordinator"
             )
+        self._remember_session(session_id)
+
+    def _remember_session(self, session_id: str) -> None:
+        """Record a session as existing, evicting the least recently used ones."""
+        self._known_sessions[session_id] = None
+        self._known_sessions.move_to_end(session_id)
+        while len(self._known_sessions) > max(0, settings.known_sessions_cache_size):
+            self._known_sessions.popitem(last=False)
 
     async def _run_single_specialist(
         self,
         agent_type: str,
         message: str,
-        session_id: str
+        session_id: str,
+        context: Optional[str] = None
     ) -> str:
         """
         Run a single specialist with cloud-first fallback.
@@ -247,6 +484,7 @@ class CoordinatorAgentService:
             agent_type: Specialist category
             message: User's message
             session_id: Session identifier
+            context: Pre-fetched RAG context; fetched here for rag_query if None
 
         Returns:
             Specialist's response string
@@ -255,15 +493,19 @@ class CoordinatorAgentService:
 
         try:
             # Get context for RAG queries
-            context = ""
-            if agent_type == "rag_query":
-                context = await self._get_rag_context(message)
+            if context is None:
+                context = ""
+                if agent_type == "rag_query":
+                    context = await self._get_rag_context(message)
 
             # Execute with automatic fallback (Anthropic → Google → Phi-3)
-            response = await self.specialist_manager.execute_with_fallback(
-                specialist_type=agent_type,
-                message=message,
-                context=context
+            response = await asyncio.wait_for(
+                self.specialist_manager.execute_with_fallback(
+                    specialist_type=agent_type,
+                    message=message,
+                    context=context
+                ),
+                timeout=settings.specialist_timeout
             )
 
             # Store in session history
@@ -275,6 +517,66 @@ class CoordinatorAgentService:
             logger.error(f"Specialist execution failed: {e}")
             return await self._fallback_to_general_assistant(message, session_id)
 
+    @staticmethod
+    async def _coalesce_chunks(chunks: AsyncGenerator[str, None]) -> AsyncGenerator[str, None]:
+        """
+        Join streamed chunks into fewer, larger pieces.
+
+        The first chunk is passed on immediately to keep time to first token
+        low. After that, buffered text is flushed once settings.stream_flush_chunks
+        chunks are waiting or its oldest chunk has waited
+        settings.stream_flush_interval_ms, whichever comes first - also while
+        the model is pausing between chunks.
+
+        Args:
+            chunks: Specialist text stream
+
+        Yields:
+            Coalesced text
+        """
+        flush_interval = settings.stream_flush_interval_ms / 1000
+        pending: List[str] = []
+        flush_at = 0.0  # when the oldest pending chunk is due
+        flushed = False
+        next_chunk: Optional[asyncio.Future] = None
+
+        try:
+            while True:
+                if next_chunk is None:
+                    next_chunk = asyncio.ensure_future(chunks.__anext__())
+                if pending:
+                    # asyncio.wait leaves the read running if the interval ends first
+                    done, _ = await asyncio.wait(
+                        {next_chunk}, timeout=max(0.0, flush_at - time.monotonic())
+                    )
+                    if not done:
+                        yield "".join(pending)
+                        pending.clear()
+                        continue
+
+                try:
+                    chunk = await next_chunk
+                except StopAsyncIteration:
+                    break
+                next_chunk = None
+
+                if not pending:
+                    flush_at = time.monotonic() + flush_interval
+                pending.append(chunk)
+                if (not flushed or len(pending) >= settings.stream_flush_chunks
+                        or time.monotonic() >= flush_at):
+                    yield "".join(pending)
+                    pending.clear()
+                    flushed = True
+        finally:
+            if next_chunk is not None and not next_chunk.done():
+                next_chunk.cancel()
+                await asyncio.wait({next_chunk})
+            await chunks.aclose()
+
+        if pending:
+            yield "".join(pending)
+
     async def _run_streaming_specialist(
         self,
         agent_type: str,
@@ -294,6 +596,7 @@ class CoordinatorAgentService:
         """
         logger.info(f"Streaming from specialist category: {agent_type}")
 
+        sent = False
         try:
             # Get context for RAG queries
             context = ""
@@ -301,15 +604,42 @@ class CoordinatorAgentService:
                 context = await self._get_rag_context(message)
 
             # Execute with streaming and automatic fallback
-            async for chunk in self.specialist_manager.execute_stream_with_fallback(
+            stream = self.specialist_manager.execute_stream_with_fallback(
                 specialist_type=agent_type,
                 message=message,
                 context=context
-            ):
-                yield chunk
+            )
+
+            # Bound the wait for each chunk so a stalled upstream is detected
+            # mid-stream; closing the generator releases the provider stream
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(
+                            stream.__anext__(),
+                            timeout=settings.stream_idle_timeout
+                        )
+                    except StopAsyncIteration:
+                        break
+                    sent = True
+                    yield chunk
+            finally:
+                await stream.aclose()
 
         except Exception as e:
-            logger.error(f"Streaming specialist execution failed: {e}")
+            if isinstance(e, asyncio.TimeoutError):
+                logger.error(
+                    f"Streaming specialist {agent_type} idle for more than "
+                    f"{settings.stream_idle_timeout}s"
+                )
+            else:
+                logger.error(f"Streaming specialist execution failed: {e}")
+
+            if sent:
+                # Part of the answer is already out; a second answer would follow it
+                yield "\n\n❌ Response interrupted. Please try again."
+                return
+
             # Fallback to non-streaming general assistant
             response = await self._fallback_to_general_assistant(message, session_id)
             yield response
@@ -319,108 +649,265 @@ class CoordinatorAgentService:
         categories: List[str],
         message: str,
         session_id: str
-    ) -> List[str]:
+    ) -> List[Tuple[str, Optional[str]]]:
         """
         Run multiple specialists concurrently with cloud providers.
 
         Cloud providers enable TRUE parallelism (~600ms for 3 specialists)
         vs local sequential execution (~9s for 3 specialists)
 
+        Duplicate categories run once, and responses cached within
+        SPECIALIST_CACHE_TTL for the same message are reused. Specialists still
+        running when SPECIALIST_TIMEOUT elapses are cancelled and omitted.
+
         Args:
             categories: List of specialist categories
             message: User's message
             session_id: Session identifier
 
         Returns:
-            List of specialist responses (successful only)
+            List of (category, response) tuples in category order.
+            Response is None when that specialist failed.
         """
+        # Router may repeat a category - run each specialist once
+        categories = list(dict.fromkeys(categories))
         logger.info(f"Running {len(categories)} specialists in PARALLEL: {categories}")
 
+        message_key = self._message_key(message)
+        responses: Dict[str, Optional[str]] = {}
+
         tasks = []
         for category in categories:
-            # Get context for RAG queries
-            context = ""
-            if category == "rag_query":
-                context_task = self._get_rag_context(message)
-                context = await context_task
+            cached = self._get_cached_response(category, message_key)
+            if cached is not None:
+                logger.info(f"Using cached response for specialist {category}")
+                responses[category] = cached
+                continue
 
             # Create task for each specialist
-            task = self.specialist_manager.execute_with_fallback(
-                specialist_type=category,
-                message=message,
-                context=context
-            )
-            tasks.append(task)
+            tasks.append(self._run_specialist_safe(
+                category,
+                self._execute_specialist(category, message)
+            ))
 
         # Run in parallel - cloud APIs enable true concurrency!
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # The whole fan-out shares one deadline so queued specialists can't
+        # stretch the response past a single timeout
+        futures = [asyncio.ensure_future(task) for task in tasks]
+        if futures:
+            done, pending = await asyncio.wait(futures, timeout=settings.specialist_timeout)
+
+            for future in pending:
+                future.cancel()
+            if pending:
+                logger.warning(
+                    f"Cancelled {len(pending)} specialist(s) still running after "
+                    f"{settings.specialist_timeout}s"
+                )
 
-        # Filter successful results
-        successful_results = [
-            r for r in results
-            if isinstance(r, str) and r
-        ]
+            for future in done:
+                category, response = future.result()
+                responses[category] = response
+                if response:
+                    self._cache_response(category, message_key, response)
 
+        results = [(category, responses.get(category)) for category in categories]
+
+        successful = sum(1 for _, response in results if response)
         logger.info(
-            f"Parallel execution completed: {len(successful_results)}/{len(tasks)} successful "
-            f"(cloud parallel = fast!)"
+            f"Parallel execution completed: {successful}/{len(categories)} successful "
+            f"({len(tasks)} executed, cloud parallel = fast!)"
         )
 
-        return successful_results
+        return results
 
-    def _aggregate_responses(
+    def _get_cached_response(self, category: str, message_key: str) -> Optional[str]:
+        """Return a cached specialist response if it is still within the TTL."""
+        return self._response_cache.get((category, message_key), settings.specialist_cache_ttl)
+
+    def _cache_response(self, category: str, message_key: str, response: str):
+        """Store a specialist response, pruning expired and oldest entries."""
+        self._response_cache.set((category, message_key), response, settings.specialist_cache_ttl)
+
+    async def _run_first_successful(
         self,
         categories: List[str],
-        responses: List[str]
+        message: str
+    ) -> Optional[str]:
+        """
+        Run specialists concurrently and return the first usable response.
+
+        Used when the router is unsure which specialist fits - the remaining
+        specialists are cancelled as soon as one answers.
+
+        Args:
+            categories: List of specialist categories
+            message: User's message
+
+        Returns:
+            First non-empty response, or None if every specialist failed
+        """
+        categories = list(dict.fromkeys(categories))
+        logger.info(f"Racing {len(categories)} specialists for first response: {categories}")
+
+        futures = [
+            asyncio.ensure_future(
+                self._run_specialist_safe(category, self._execute_specialist(category, message))
+            )
+            for category in categories
+        ]
+
+        try:
+            for next_done in asyncio.as_completed(futures, timeout=settings.specialist_timeout):
+                category, response = await next_done
+                if response:
+                    logger.info(f"First response from specialist {category}")
+                    return response
+        except asyncio.TimeoutError:
+            logger.warning(f"No specialist answered within {settings.specialist_timeout}s")
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return None
+
+    async def _execute_specialist(self, category: str, message: str) -> str:
+        """
+        Run one specialist for a fan-out, once a fan-out slot is free.
+
+        Args:
+            category: Specialist category
+            message: User's message
+
+        Returns:
+            Specialist's response string
+        """
+        # Get context for RAG queries
+        context = ""
+        if category == "rag_query":
+            context = await self._get_rag_context(message)
+
+        async with self._fanout_semaphore:
+            return await asyncio.wait_for(
+                self.specialist_manager.execute_with_fallback(
+                    specialist_type=category,
+                    message=message,
+                    context=context
+                ),
+                timeout=settings.specialist_timeout
+            )
+
+    async def _run_specialist_safe(
+        self,
+        category: str,
+        coro: Awaitable[str]
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Await a specialist call, converting failures into a None response.
+
+        Args:
+            category: Specialist category (kept alongside the result)
+            coro: Specialist coroutine to await
+
+        Returns:
+            Tuple of (category, response or None on failure)
+        """
+        try:
+            return category, await coro
+        except Exception as e:
+            logger.warning(f"Specialist {category} failed: {e}")
+            return category, None
+
+    def _aggregate_responses(
+        self,
+        results: List[Tuple[str, Optional[str]]]
     ) -> str:
         """
         Combine multiple specialist responses with labeled sections.
 
+        Failed or empty responses are skipped without shifting the labels
+        of the remaining specialists. Callers handle the case where every
+        specialist failed.
+
         Args:
-            categories: List of specialist categories (in order)
-            responses: List of specialist responses (in order)
+            results: List of (category, response) tuples (in order)
 
         Returns:
             Aggregated response string
         """
+        responses = [(category, response) for category, response in results if response]
+
         if len(responses) == 1:
-            return responses[0]
+            return responses[0][1]
 
         # Build aggregated response with specialist names
-        aggregated = "Here are the results from multiple specialists:\n\n"
+        parts = ["Here are the results from multiple specialists:\n\n"]
 
-        for i, (category, response) in enumerate(zip(categories, responses)):
+        for category, response in responses:
             specialist_name = self.specialist_names.get(
                 category,
                 category.replace("_", " ").title()
             )
-            aggregated += f"**{specialist_name}:**\n{response}\n\n"
+            parts.append(f"**{specialist_name}:**\n{response}\n\n")
 
-        return aggregated.strip()
+        return "".join(parts).strip()
 
-    async def _get_rag_context(self, message: str) -> str:
+    def _context_rag_service(self):
         """
-        Get RAG context for knowledge queries.
+        Pick the RAG service that answers knowledge queries.
 
         Priority: Anthropic RAG > Google RAG > Local RAG
+        """
+        # Try cloud RAG first for better quality
+        if self.rag_anthropic_service:
+            return self.rag_anthropic_service
+        if self.rag_google_service:
+            return self.rag_google_service
+        return self.rag_service
+
+    async def _retrieve_rag_documents(self, message: str) -> Optional['Retrieval']:
+        """
+        Fetch knowledge base documents for a message without generating an answer.
 
         Args:
             message: User's message
 
+        Returns:
+            Retrieval for _get_rag_context, or None if retrieval failed
+        """
+        try:
+            return await self._context_rag_service().aretrieve(message)
+        except Exception as e:
+            logger.debug(f"Speculative RAG retrieval failed: {e}")
+            return None
+
+    async def _get_rag_context(
+        self,
+        message: str,
+        retrieval: Optional['Retrieval'] = None
+    ) -> str:
+        """
+        Get RAG context for knowledge queries.
+
+        Args:
+            message: User's message
+            retrieval: Documents already retrieved for the message, if any
+
         Returns:
             Context string from RAG
         """
+        rag_service = self._context_rag_service()
         try:
-            # Try cloud RAG first for better quality
-            if self.rag_anthropic_service:
-                answer, _ = self.rag_anthropic_service.query(message, include_sources=False)
-                return answer
-            elif self.rag_google_service:
-                answer, _ = self.rag_google_service.query(message, include_sources=False)
-                return answer
-            else:
-                answer, _ = self.rag_service.query(message, include_sources=False)
-                return answer
+            answer, _ = await asyncio.wait_for(
+                rag_service.aquery(message, include_sources=False, retrieval=retrieval),
+                timeout=settings.specialist_timeout
+            )
+            return answer
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"RAG context retrieval timed out after {settings.specialist_timeout}s"
+            )
+            return ""
         except Exception as e:
             logger.warning(f"RAG context retrieval failed: {e}")
             return ""
@@ -443,10 +930,13 @@ class CoordinatorAgentService:
         logger.warning("Using fallback: general_assistant")
 
         try:
-            response = await self.specialist_manager.execute_with_fallback(
-                specialist_type="general_chat",
-                message=message,
-                context=""
+            response = await asyncio.wait_for(
+                self.specialist_manager.execute_with_fallback(
+                    specialist_type="general_chat",
+                    message=message,
+                    context=""
+                ),
+                timeout=settings.specialist_timeout
             )
             return response
 
@@ -0,0 +1,197 @@
+"""
+Persistent SQLite-backed cache used as a second tier behind in-memory caches.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import settings, logger
+
+
+class DiskCache:
+    """
+    Small key/value cache stored in a SQLite file so results survive restarts.
+
+    Values are stored as JSON and expire after a TTL measured in wall-clock
+    time. Keys are hashed, so callers can pass arbitrary strings.
+    """
+
+    # Expired rows are purged every this many writes
+    PURGE_INTERVAL = 256
+    # Keys per SELECT in get_many, below SQLite's bound-parameter limit
+    SQL_BATCH = 500
+
+    def __init__(self, path: Path, ttl_seconds: int):
+        """
+        Open (or create) a disk cache.
+
+        Args:
+            path: SQLite database file
+            ttl_seconds: Seconds an entry stays valid
+        """
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _hash(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Stored value, or None if missing or expired
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM cache WHERE key = ?",
+                    (self._hash(key),)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache read failed ({self.path.name}): {e}")
+            return None
+
+        if row is None or row[1] <= time.time():
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        """
+        Store a JSON-serializable value.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (self._hash(key), json.dumps(value), now + self.ttl_seconds)
+                )
+                self._writes += 1
+                if self._writes % self.PURGE_INTERVAL == 0:
+                    self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache write failed ({self.path.name}): {e}")
+
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Look up several cached values with one query per SQL_BATCH keys.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Stored value (or None if missing or expired) for each key, in order
+        """
+        hashes = [self._hash(key) for key in keys]
+        found: Dict[str, Any] = {}
+        now = time.time()
+        try:
+            with self._lock:
+                for start in range(0, len(hashes), self.SQL_BATCH):
+                    chunk = hashes[start:start + self.SQL_BATCH]
+                    rows = self._conn.execute(
+                        "SELECT key, value FROM cache WHERE expires_at > ? AND key IN "
+                        f"({', '.join('?' * len(chunk))})",
+                        (now, *chunk)
+                    ).fetchall()
+                    found.update(rows)
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache read failed ({self.path.name}): {e}")
+            return [None] * len(keys)
+
+        return [json.loads(found[h]) if h in found else None for h in hashes]
+
+    def set_many(self, items: List[Tuple[str, Any]]):
+        """
+        Store several JSON-serializable values in one transaction.
+
+        Args:
+            items: (key, value) pairs
+        """
+        if not items:
+            return
+        now = time.time()
+        rows = [(self._hash(key), json.dumps(value), now + self.ttl_seconds) for key, value in items]
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    rows
+                )
+                purge = self._writes // self.PURGE_INTERVAL != (self._writes + len(rows)) // self.PURGE_INTERVAL
+                self._writes += len(rows)
+                if purge:
+                    self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache write failed ({self.path.name}): {e}")
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+
+def open_disk_cache(name: str, default_dir: Optional[Path] = None) -> Optional[DiskCache]:
+    """
+    Open the named persistent cache if one is configured.
+
+    Args:
+        name: Cache name, used as the database file name
+        default_dir: Directory used when settings.persistent_cache_dir is unset
+
+    Returns:
+        DiskCache, or None when persistent caching is disabled or unavailable
+    """
+    directory = settings.persistent_cache_dir or default_dir
+    if not directory or settings.persistent_cache_ttl <= 0:
+        return None
+
+    path = Path(directory) / f"{name}.sqlite3"
+    try:
+        return DiskCache(path, settings.persistent_cache_ttl)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Persistent cache '{name}' disabled: {e}")
+        return None
+
+
+def prompt_version(template: str) -> str:
+    """
+    Short digest of a prompt template, for cache key prefixes.
+
+    Persisted results outlive the process, so editing a prompt must not keep
+    serving answers generated from the old one.
+
+    Args:
+        template: Prompt text with placeholders for the per-request parts
+
+    Returns:
+        Hex digest of the template
+    """
+    return hashlib.blake2b(template.encode("utf-8"), digest_size=8).hexdigest()
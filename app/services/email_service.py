@@ -11,6 +11,28 @@ class EmailService:
         self.from_email = "noreply@vibecoder.buzz"  # Custom verified domain
         self.from_name = "VIBE Code App Team"
         self.base_url = "https://api.resend.com"
+        self.from_header = f"{self.from_name} <{self.from_email}>"
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get or create the pooled HTTP client for the Resend API."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def send_verification_email(
         self,
@@ -93,29 +115,23 @@ class EmailService:
         """
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/emails",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "from": f"{self.from_name} <{self.from_email}>",
-                        "to": [to_email],
-                        "subject": "Verify your email address",
-                        "html": html_content,
-                        "text": text_content
-                    },
-                    timeout=10.0
-                )
-
-                if response.status_code == 200:
-                    logger.info(f"Verification email sent to {to_email}")
-                    return True
-                else:
-                    logger.error(f"Failed to send email to {to_email}: {response.status_code} - {response.text}")
-                    return False
+            response = await self._get_client().post(
+                "/emails",
+                json={
+                    "from": self.from_header,
+                    "to": [to_email],
+                    "subject": "Verify your email address",
+                    "html": html_content,
+                    "text": text_content
+                }
+            )
+
+            if response.status_code == 200:
+                logger.info(f"Verification email sent to {to_email}")
+                return True
+            else:
+                logger.error(f"Failed to send email to {to_email}: {response.status_code} - {response.text}")
+                return False
 
         except Exception as e:
             logger.error(f"Error sending verification email to {to_email}: {e}", exc_info=True)
@@ -131,4 +147,10 @@ def get_email_service() -> EmailService:
     global _email_service
     if _email_service is None:
         _email_service = EmailService()
-    return _email_service
\ No newline at end of file
+    return _email_service
+
+
+async def close_email_service() -> None:
+    """Close the email service singleton's HTTP client, if created."""
+    if _email_service is not None:
+        await _email_service.aclose()
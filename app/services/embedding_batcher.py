@@ -0,0 +1,95 @@
+"""
+Micro-batching of concurrent query embeddings.
+"""
+import threading
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from config import logger
+
+
+class _Batch:
+    """Queries collected within one window, and their shared result."""
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results: Optional[List[List[float]]] = None
+        self.error: Optional[Exception] = None
+
+
+class CoalescingEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that merges concurrent embed_query calls into one request.
+
+    The first caller in a window waits up to window_ms for others (or until
+    max_batch queries are waiting), then embeds them all with a single
+    embed_documents call and hands each caller its vector. Retrievals from
+    concurrent agent tool calls thus share one embedding round-trip; the
+    vector lookups themselves stay per query.
+
+    Only wrap models whose embed_query equals embed_documents([query])[0].
+    """
+
+    def __init__(self, inner: Embeddings, window_ms: float = 5.0, max_batch: int = 16):
+        """
+        Initialize the wrapper.
+
+        Args:
+            inner: Embeddings doing the actual work
+            window_ms: How long the first query waits for others
+            max_batch: Queries that close a window early
+        """
+        self.inner = inner
+        self.window_s = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+
+        self._lock = threading.Lock()
+        self._pending: Optional[_Batch] = None
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents directly; ingestion already batches."""
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a query, sharing the request with concurrent callers.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Query embedding
+        """
+        with self._lock:
+            batch = self._pending
+            leader = batch is None
+            if leader:
+                batch = self._pending = _Batch()
+            index = len(batch.texts)
+            batch.texts.append(text)
+            if len(batch.texts) >= self.max_batch:
+                self._pending = None
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window_s)
+            with self._lock:
+                if self._pending is batch:
+                    self._pending = None
+            try:
+                batch.results = self.inner.embed_documents(batch.texts)
+                if len(batch.texts) > 1:
+                    logger.debug(f"Embedded {len(batch.texts)} concurrent queries in one request")
+            except Exception as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[index]
@@ -8,6 +8,24 @@ class HCaptchaService:
 
     VERIFY_URL = "https://hcaptcha.com/siteverify"
 
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the shared HTTP session (must run inside the event loop)."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     async def verify_token(self, token: str, client_ip: Optional[str] = None) -> Tuple[bool, Optional[str]]:
         """
         Verify hCaptcha token with hCaptcha API.
@@ -32,34 +50,30 @@ class HCaptchaService:
             payload["remoteip"] = client_ip
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                        self.VERIFY_URL,
-                        data=payload,
-                        timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status != 200:
-                        logger.error(f"hCaptcha API error: {response.status}")
-                        return False, "CAPTCHA verification failed"
-
-                    result = await response.json()
-
-                    if result.get("success"):
-                        return True, None
-
-                    # Log error codes for debugging
-                    error_codes = result.get("error-codes", [])
-                    logger.warning(f"hCaptcha verification failed: {error_codes}")
-
-                    # Provide user-friendly error messages
-                    if "missing-input-response" in error_codes:
-                        return False, "CAPTCHA response missing"
-                    elif "invalid-input-response" in error_codes:
-                        return False, "Invalid CAPTCHA response"
-                    elif "timeout-or-duplicate" in error_codes:
-                        return False, "CAPTCHA expired or already used"
-                    else:
-                        return False, "CAPTCHA verification failed"
+            session = await self._get_session()
+            async with session.post(self.VERIFY_URL, data=payload) as response:
+                if response.status != 200:
+                    logger.error(f"hCaptcha API error: {response.status}")
+                    return False, "CAPTCHA verification failed"
+
+                result = await response.json()
+
+                if result.get("success"):
+                    return True, None
+
+                # Log error codes for debugging
+                error_codes = result.get("error-codes", [])
+                logger.warning(f"hCaptcha verification failed: {error_codes}")
+
+                # Provide user-friendly error messages
+                if "missing-input-response" in error_codes:
+                    return False, "CAPTCHA response missing"
+                elif "invalid-input-response" in error_codes:
+                    return False, "Invalid CAPTCHA response"
+                elif "timeout-or-duplicate" in error_codes:
+                    return False, "CAPTCHA expired or already used"
+                else:
+                    return False, "CAPTCHA verification failed"
 
         except aiohttp.ClientError as e:
             logger.error(f"hCaptcha API request failed: {e}")
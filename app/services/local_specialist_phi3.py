@@ -3,14 +3,21 @@ Local specialist service using Phi-3 via llama.cpp.
 Note: This service is only available in non-production environments.
 """
 import asyncio
-from typing import Optional, AsyncGenerator
+import string
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, AsyncGenerator
+
+import httpx
+import orjson
 
 from config import settings, logger
 
 # Gate llama_cpp imports for production
 if settings.environment != "production":
     try:
-        from llama_cpp import Llama
+        from llama_cpp import Llama, LlamaRAMCache
         LLAMA_CPP_AVAILABLE = True
     except ImportError:
         LLAMA_CPP_AVAILABLE = False
@@ -20,6 +27,148 @@ else:
     LLAMA_CPP_AVAILABLE = False
     Llama = None  # Type hint placeholder
 
+# One Phi-3 model per process, shared by every local specialist
+_shared_model: Optional['Llama'] = None
+_model_lock = threading.Lock()
+
+# llama.cpp contexts are not thread-safe - all inference on the shared model runs
+# on one dedicated worker, which also keeps long CPU-bound calls off the default pool
+_inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="phi3")
+
+# Generations currently queued or running on the worker, keyed by prompt
+_inflight: Dict[str, asyncio.Future] = {}
+
+# Marks the end of a streamed generation
+_STREAM_END = object()
+
+
+# Shared client for a running llama-server (the one the ADK agents also use)
+_server_client: Optional[httpx.AsyncClient] = None
+
+# Phi-3 chat markers that end a specialist answer
+STOP_SEQUENCES = ["<|end|>", "<|user|>", "<|system|>"]
+
+
+def llama_server_url() -> str:
+    """Base URL of the Phi-3 llama-server's OpenAI-compatible API."""
+    return f"http://{settings.llama_server_host}:{settings.llama_server_port}/v1"
+
+
+async def llama_server_available(timeout: float = 2.0) -> bool:
+    """
+    Check whether the Phi-3 llama-server is up.
+
+    Args:
+        timeout: Seconds to wait for the probe
+
+    Returns:
+        True if the server lists its models
+    """
+    try:
+        response = await get_llama_server_client().get("/models", timeout=timeout)
+        return response.status_code == 200
+    except httpx.HTTPError:
+        return False
+
+
+def get_llama_server_client() -> httpx.AsyncClient:
+    """Get or create the shared llama-server client."""
+    global _server_client
+    if _server_client is None:
+        # Generation can take a while; the specialist manager bounds each call
+        _server_client = httpx.AsyncClient(
+            base_url=llama_server_url(),
+            timeout=httpx.Timeout(None, connect=2.0)
+        )
+    return _server_client
+
+
+async def close_llama_server_client():
+    """Close the shared llama-server client (call on application shutdown)."""
+    global _server_client
+    if _server_client is not None:
+        await _server_client.aclose()
+        _server_client = None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, if the platform reports it."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def get_shared_phi3() -> 'Llama':
+    """
+    Get or load the process-wide Phi-3 model.
+
+    Raises:
+        RuntimeError: If used in production environment or llama_cpp is missing
+    """
+    global _shared_model
+    if _shared_model is None:
+        with _model_lock:
+            if _shared_model is None:
+                if settings.environment == "production":
+                    raise RuntimeError("Cannot load local model in production environment")
+
+                if not LLAMA_CPP_AVAILABLE:
+                    raise RuntimeError("llama_cpp not available")
+
+                logger.info("Loading shared Phi-3 model for local specialists")
+                _shared_model = Llama(
+                    model_path=settings.llamacpp_chat_model_path,
+                    n_ctx=settings.llamacpp_n_ctx,
+                    n_batch=settings.llamacpp_n_batch,
+                    n_threads=settings.llamacpp_n_threads,
+                    temperature=settings.llamacpp_temperature,
+                    use_mmap=settings.llamacpp_use_mmap,
+                    use_mlock=settings.llamacpp_use_mlock,
+                    n_gpu_layers=settings.llamacpp_n_gpu_layers,
+                    verbose=settings.debug
+                )
+
+                # Specialist prompts share a fixed system block; caching KV state
+                # lets later calls skip prefilling the common prefix
+                if settings.llamacpp_prompt_cache_bytes > 0:
+                    _shared_model.set_cache(
+                        LlamaRAMCache(capacity_bytes=settings.llamacpp_prompt_cache_bytes)
+                    )
+
+                rss = _peak_rss_mb()
+                if rss is not None:
+                    logger.info(f"Phi-3 model loaded (peak RSS: {rss:.0f} MB)")
+    return _shared_model
+
+
+def _compile_prompt(template: str) -> Callable[[str, str], str]:
+    """
+    Pre-parse a prompt template into literal chunks and placeholders.
+
+    Args:
+        template: Template using {message} and optionally {context}
+
+    Returns:
+        Function rendering the template from (message, context)
+    """
+    pieces = [
+        (literal, field)
+        for literal, field, _, _ in string.Formatter().parse(template)
+    ]
+
+    def render(message: str, context: str = "") -> str:
+        values = {"message": message, "context": context}
+        return "".join(
+            literal + values[field] if field else literal
+            for literal, field in pieces
+        )
+
+    return render
+
 
 class LocalSpecialistPhi3Service:
     """
@@ -71,13 +220,19 @@ You are a helpful assistant. Provide clear, friendly, and professional responses
 <|assistant|>"""
     }
 
+    # Templates parsed once at class load
+    COMPILED_PROMPTS = {
+        specialist_type: _compile_prompt(template)
+        for specialist_type, template in SPECIALIST_PROMPTS.items()
+    }
+
     def __init__(self, specialist_type: str, model: Optional['Llama'] = None):
         """
         Initialize local Phi-3 specialist.
 
         Args:
             specialist_type: Type of specialist (code_validation, etc.)
-            model: Optional pre-loaded Llama model (for sharing)
+            model: Optional pre-loaded Llama model (defaults to the shared model)
 
         Raises:
             RuntimeError: If used in production environment
@@ -95,40 +250,14 @@ You are a helpful assistant. Provide clear, friendly, and professional responses
             )
 
         self.specialist_type = specialist_type
-        self.prompt_template = self.SPECIALIST_PROMPTS.get(
+        self.render_prompt = self.COMPILED_PROMPTS.get(
             specialist_type,
-            self.SPECIALIST_PROMPTS["general_chat"]
+            self.COMPILED_PROMPTS["general_chat"]
         )
 
-        # Use shared model or load new one
-        if model:
-            self.model = model
-            logger.info(f"LocalSpecialistPhi3 using shared model: {specialist_type}")
-        else:
-            self.model = self._load_model()
-            logger.info(f"LocalSpecialistPhi3 loaded new model: {specialist_type}")
-
-    def _load_model(self) -> 'Llama':
-        """
-        Load Phi-3 model.
-
-        Raises:
-            RuntimeError: If used in production environment
-        """
-        if settings.environment == "production":
-            raise RuntimeError("Cannot load local model in production environment")
-
-        if not LLAMA_CPP_AVAILABLE:
-            raise RuntimeError("llama_cpp not available")
-
-        return Llama(
-            model_path=settings.llamacpp_chat_model_path,
-            n_ctx=settings.llamacpp_n_ctx,
-            n_batch=settings.llamacpp_n_batch,
-            n_threads=settings.llamacpp_n_threads,
-            temperature=settings.llamacpp_temperature,
-            verbose=settings.debug
-        )
+        # Always share one model - never load a copy per specialist
+        self.model = model or get_shared_phi3()
+        logger.info(f"LocalSpecialistPhi3 using shared model: {specialist_type}")
 
     async def execute(
             self,
@@ -152,20 +281,24 @@ You are a helpful assistant. Provide clear, friendly, and professional responses
             raise RuntimeError("Local specialist execution not allowed in production")
 
         try:
-            # Build prompt with context if provided
-            if context and "{context}" in self.prompt_template:
-                prompt = self.prompt_template.format(message=message, context=context)
-            else:
-                prompt = self.prompt_template.format(message=message)
-
-            # Run inference in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self._generate(prompt)
-            )
-
-            return response
+            # Build prompt (context is ignored by templates without a slot for it)
+            prompt = self.render_prompt(message, context)
+
+            # Identical prompts already waiting on the worker share its result
+            future = _inflight.get(prompt)
+            if future is None:
+                # Run inference on the dedicated Phi-3 worker to avoid blocking
+                loop = asyncio.get_running_loop()
+                future = loop.run_in_executor(
+                    _inference_executor,
+                    self._generate,
+                    prompt
+                )
+                _inflight[prompt] = future
+                future.add_done_callback(lambda _: _inflight.pop(prompt, None))
+
+            # Shielded so one cancelled caller does not fail the others
+            return await asyncio.shield(future)
 
         except Exception as e:
             logger.error(f"[Local Phi-3 {self.specialist_type}] Error: {e}")
@@ -193,11 +326,8 @@ You are a helpful assistant. Provide clear, friendly, and professional responses
             raise RuntimeError("Local specialist streaming not allowed in production")
 
         try:
-            # Build prompt with context if provided
-            if context and "{context}" in self.prompt_template:
-                prompt = self.prompt_template.format(message=message, context=context)
-            else:
-                prompt = self.prompt_template.format(message=message)
+            # Build prompt (context is ignored by templates without a slot for it)
+            prompt = self.render_prompt(message, context)
 
             # Stream inference
             async for chunk in self._generate_stream(prompt):
@@ -221,7 +351,7 @@ You are a helpful assistant. Provide clear, friendly, and professional responses
             prompt,
             max_tokens=settings.llamacpp_max_tokens,
             temperature=settings.llamacpp_temperature,
-            stop=["<|end|>", "<|user|>", "<|system|>"]
+            stop=STOP_SEQUENCES
         )
 
         return response['choices'][0]['text'].strip()
@@ -236,35 +366,44 @@ You are a helpful assistant. Provide clear, friendly, and professional responses
         if settings.environment == "production":
             raise RuntimeError("Local streaming not allowed in production")
 
-        loop = asyncio.get_event_loop()
-
-        # Create the streaming generator in executor
-        def create_stream():
-            return self.model(
-                prompt,
-                max_tokens=settings.llamacpp_max_tokens,
-                temperature=settings.llamacpp_temperature,
-                stop=["<|end|>", "<|user|>", "<|system|>"],
-                stream=True
-            )
-
-        stream_gen = await loop.run_in_executor(None, create_stream)
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
 
-        # Process each chunk in executor to avoid blocking
-        def get_next_chunk(iterator):
+        # The whole generation runs as one job on the Phi-3 worker, so concurrent
+        # calls never interleave on the model; chunks are handed back to the loop
+        def produce():
             try:
-                return next(iterator)
-            except StopIteration:
-                return None
-
-        while True:
-            chunk = await loop.run_in_executor(None, get_next_chunk, stream_gen)
-            if chunk is None:
-                break
-            if 'choices' in chunk and len(chunk['choices']) > 0:
-                text = chunk['choices'][0].get('text', '')
-                if text:
-                    yield text
+                for chunk in self.model(
+                    prompt,
+                    max_tokens=settings.llamacpp_max_tokens,
+                    temperature=settings.llamacpp_temperature,
+                    stop=STOP_SEQUENCES,
+                    stream=True
+                ):
+                    if stop.is_set():
+                        break
+                    if 'choices' in chunk and len(chunk['choices']) > 0:
+                        text = chunk['choices'][0].get('text', '')
+                        if text:
+                            loop.call_soon_threadsafe(queue.put_nowait, text)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, _STREAM_END)
+
+        loop.run_in_executor(_inference_executor, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Free the worker early if the consumer stops reading
+            stop.set()
 
     def get_specialist_name(self) -> str:
         """Get human-readable specialist name."""
@@ -276,4 +415,100 @@ You are a helpful assistant. Provide clear, friendly, and professional responses
             "complex_reasoning": "Reasoning Specialist (Phi-3)",
             "general_chat": "General Assistant (Phi-3)"
         }
-        return names.get(self.specialist_type, f"{self.specialist_type} (Phi-3)")
\ No newline at end of file
+        return names.get(self.specialist_type, f"{self.specialist_type} (Phi-3)")
+
+
+class LlamaServerPhi3Service(LocalSpecialistPhi3Service):
+    """
+    Local Phi-3 specialist served by a running llama-server.
+
+    Uses the same prompts as the in-process specialist, but sends them to the
+    server's completions endpoint, so the process does not load a second copy
+    of the weights the server already holds.
+    """
+
+    def __init__(self, specialist_type: str):
+        """
+        Initialize llama-server backed Phi-3 specialist.
+
+        Args:
+            specialist_type: Type of specialist (code_validation, etc.)
+
+        Raises:
+            RuntimeError: If used in production environment
+        """
+        if settings.environment == "production":
+            raise RuntimeError(
+                "LlamaServerPhi3Service cannot be used in production environment. "
+                "Please use cloud-based specialists (Anthropic or Google)."
+            )
+
+        self.specialist_type = specialist_type
+        self.render_prompt = self.COMPILED_PROMPTS.get(
+            specialist_type,
+            self.COMPILED_PROMPTS["general_chat"]
+        )
+        self.model = None
+        self.client = get_llama_server_client()
+
+    def _payload(self, prompt: str, stream: bool = False) -> dict:
+        """Build a completions request body."""
+        return {
+            "prompt": prompt,
+            "max_tokens": settings.llamacpp_max_tokens,
+            "temperature": settings.llamacpp_temperature,
+            "stop": STOP_SEQUENCES,
+            "stream": stream
+        }
+
+    async def execute(
+            self,
+            message: str,
+            context: str = ""
+    ) -> str:
+        """
+        Execute specialist task on the llama-server.
+
+        Args:
+            message: User's message/request
+            context: Additional context (e.g., RAG results)
+
+        Returns:
+            Specialist's response
+        """
+        if settings.environment == "production":
+            raise RuntimeError("Local specialist execution not allowed in production")
+
+        try:
+            response = await self.client.post(
+                "/completions",
+                json=self._payload(self.render_prompt(message, context))
+            )
+            response.raise_for_status()
+            return orjson.loads(response.content)["choices"][0]["text"].strip()
+
+        except Exception as e:
+            logger.error(f"[llama-server Phi-3 {self.specialist_type}] Error: {e}")
+            raise
+
+    async def _generate_stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        """Stream completion text from the llama-server (server-sent events)."""
+        if settings.environment == "production":
+            raise RuntimeError("Local streaming not allowed in production")
+
+        async with self.client.stream(
+            "POST",
+            "/completions",
+            json=self._payload(prompt, stream=True)
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = line[len("data: "):]
+                if data == "[DONE]":
+                    break
+                choices = orjson.loads(data).get("choices") or []
+                text = choices[0].get("text", "") if choices else ""
+                if text:
+                    yield text
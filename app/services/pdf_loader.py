@@ -0,0 +1,39 @@
+"""
+PDF loading for ingestion worker processes.
+
+Kept free of app imports so spawned workers start quickly.
+"""
+from typing import List
+
+from langchain_community.document_loaders import PyPDFLoader
+from langchain_core.documents import Document
+
+# PyMuPDF extracts text in C, many times faster than pure-Python pypdf
+try:
+    import pymupdf
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+
+def load_pdf(path: str) -> List[Document]:
+    """
+    Load every page of one PDF.
+
+    Uses PyMuPDF when installed and pypdf otherwise; both produce one
+    Document per page with the same source/page metadata.
+
+    Args:
+        path: PDF file path
+
+    Returns:
+        Document per page
+    """
+    if not PYMUPDF_AVAILABLE:
+        return PyPDFLoader(path).load()
+
+    with pymupdf.open(path) as pdf:
+        return [
+            Document(page_content=page.get_text("text"), metadata={"source": path, "page": i})
+            for i, page in enumerate(pdf)
+        ]
@@ -1,14 +1,22 @@
 """
 RAG (Retrieval-Augmented Generation) service.
 """
-import os
+import asyncio
+import hashlib
 from typing import List, Tuple, Optional
 
 from config import settings, logger
-from app.services.vector_store import VectorStoreService
+from app.services.vector_store import VectorStoreService, source_name
+from app.services.rag_base import Retrieval, build_prompt
+from app.services.disk_cache import open_disk_cache, prompt_version
+from app.services.ttl_cache import TTLCache
 from app.core.providers import ProviderFactory
 
 
+# Upper bound on cached answers kept by a RAG service
+ANSWER_CACHE_MAX_ENTRIES = 1024
+
+
 class RAGService:
     """Service for answering queries using RAG."""
 
@@ -23,6 +31,17 @@ class RAGService:
         self.vector_store = vector_store
         provider_type = provider_type or settings.provider_type
 
+        # Generated answers keyed on (question, retrieved contexts)
+        self._answer_cache = TTLCache(ANSWER_CACHE_MAX_ENTRIES)
+        self._disk_cache = open_disk_cache("rag_answers")
+        # Persisted answers are only reused for the same chat model and prompt
+        chat_model = {
+            'ollama': settings.chat_model,
+            'llamacpp': settings.llamacpp_chat_model_path,
+        }.get(provider_type) or ""
+        template = build_prompt("{question}", ["{context}"])
+        self._disk_key_prefix = "\0".join((provider_type, chat_model, prompt_version(template)))
+
         # Cloud mode - no local RAG
         if provider_type == 'cloud':
             logger.info("Cloud mode: local RAG disabled")
@@ -55,7 +74,8 @@ class RAGService:
                 n_threads=settings.llamacpp_n_threads,
                 temperature=settings.llamacpp_temperature,
                 max_tokens=settings.llamacpp_max_tokens,
-                verbose=settings.debug
+                verbose=settings.debug,
+                prompt_cache_bytes=settings.llamacpp_prompt_cache_bytes
             )
         else:
             raise ValueError(f"Unsupported provider type: {provider_type}")
@@ -66,7 +86,8 @@ class RAGService:
         self,
         question: str,
         k: Optional[int] = None,
-        include_sources: bool = True
+        include_sources: bool = True,
+        retrieval: Optional[Retrieval] = None
     ) -> Tuple[str, Optional[List[str]]]:
         """
         Answer a question using RAG.
@@ -75,6 +96,7 @@ class RAGService:
             question: User's question
             k: Number of documents to retrieve
             include_sources: Whether to include source citations
+            retrieval: Result of an earlier retrieve for this question and k
 
         Returns:
             Tuple of (answer, sources)
@@ -89,8 +111,7 @@ class RAGService:
 
         # Retrieve relevant documents
         try:
-            retriever = self.vector_store.get_retriever(k=k)
-            results = retriever.invoke(question)
+            results = (retrieval or self.retrieve(question, k)).documents
         except ValueError as e:
             return (
                 "📚 No documents in knowledge base. Please run ingestion first.",
@@ -107,10 +128,20 @@ class RAGService:
         contexts = [doc.page_content for doc in results]
         sources = None
         if include_sources:
-            sources = list(set([
-                os.path.basename(doc.metadata.get('source', 'Unknown'))
+            # Deduplicate in retrieval order so citations follow relevance
+            sources = list(dict.fromkeys(
+                source_name(doc.metadata.get('source', 'Unknown'))
                 for doc in results
-            ]))
+            ))
+
+        # Same question over the same documents - reuse the earlier answer
+        cache_key = self._answer_key(question, contexts)
+        answer = self._get_cached_answer(cache_key)
+        if answer is not None:
+            logger.info("Using cached answer")
+            if include_sources and sources:
+                answer = f"{answer}\n\n📚 Sources: {', '.join(sources)}"
+            return answer, sources
 
         # Build prompt
         prompt = self._build_prompt(question, contexts)
@@ -119,6 +150,7 @@ class RAGService:
         try:
             answer = self.chat_provider.generate(prompt)
             logger.info("Answer generated successfully")
+            self._cache_answer(cache_key, answer)
 
             if include_sources and sources:
                 answer = f"{answer}\n\n📚 Sources: {', '.join(sources)}"
@@ -128,18 +160,101 @@ class RAGService:
             logger.error(f"Generation error: {e}")
             return f"❌ Error generating answer: {str(e)}", sources
 
+    async def aquery(
+        self,
+        question: str,
+        k: Optional[int] = None,
+        include_sources: bool = True,
+        retrieval: Optional[Retrieval] = None
+    ) -> Tuple[str, Optional[List[str]]]:
+        """
+        Answer a question using RAG without blocking the event loop.
+
+        Local providers are synchronous, so the whole query runs in a worker thread.
+
+        Args:
+            question: User's question
+            k: Number of documents to retrieve
+            include_sources: Whether to include source citations
+            retrieval: Result of an earlier aretrieve for this question and k
+
+        Returns:
+            Tuple of (answer, sources)
+        """
+        return await asyncio.to_thread(self.query, question, k, include_sources, retrieval)
+
+    def retrieve(self, question: str, k: Optional[int] = None) -> Retrieval:
+        """
+        Fetch the documents for a question without generating an answer.
+
+        Args:
+            question: User's question
+            k: Number of documents to retrieve
+
+        Returns:
+            Retrieval to pass to query
+
+        Raises:
+            ValueError: If there is no vector store or the knowledge base is empty
+        """
+        if self.vector_store is None:
+            raise ValueError("Vector store not initialized")
+        retriever = self.vector_store.get_retriever(k=k)
+        return Retrieval(retriever.invoke(question))
+
+    async def aretrieve(self, question: str, k: Optional[int] = None) -> Retrieval:
+        """
+        Fetch the documents for a question in a worker thread.
+
+        Args:
+            question: User's question
+            k: Number of documents to retrieve
+
+        Returns:
+            Retrieval to pass to aquery
+        """
+        return await asyncio.to_thread(self.retrieve, question, k)
+
     def _build_prompt(self, question: str, contexts: List[str]) -> str:
         """Build prompt for the LLM."""
-        context_text = "\n\n".join([
-            f"[Context {i+1}]\n{ctx}"
-            for i, ctx in enumerate(contexts)
-        ])
+        return build_prompt(question, contexts)
+
+    @staticmethod
+    def _answer_key(question: str, contexts: List[str]) -> Tuple[str, str]:
+        """Build the answer cache key from the normalized question and retrieved contexts."""
+        digest = hashlib.blake2b(digest_size=16)
+        for ctx in contexts:
+            digest.update(ctx.encode("utf-8"))
+            digest.update(b"\0")
+        return " ".join(question.lower().split()), digest.hexdigest()
+
+    def _disk_key(self, key: Tuple[str, str]) -> str:
+        """Build the persistent cache key, prefixed with the chat model and prompt version."""
+        return "\0".join((self._disk_key_prefix, *key))
 
-        return f"""You are a helpful assistant. Answer the question concisely using only the provided context below. If you cannot answer based on the context, say so clearly.
+    def _get_cached_answer(self, key: Tuple[str, str]) -> Optional[str]:
+        """Return a cached answer if it is still within the TTL."""
+        if settings.rag_answer_cache_ttl <= 0:
+            return None
 
-Context:
-{context_text}
+        answer = self._answer_cache.get(key, settings.rag_answer_cache_ttl)
+        if answer is not None:
+            return answer
+
+        # Second tier: answers persisted by earlier processes
+        if self._disk_cache is None:
+            return None
+        answer = self._disk_cache.get(self._disk_key(key))
+        if answer is not None:
+            self._cache_answer(key, answer, persist=False)
+        return answer
+
+    def _cache_answer(self, key: Tuple[str, str], answer: str, persist: bool = True):
+        """Store a generated answer, pruning expired and oldest entries."""
+        if settings.rag_answer_cache_ttl <= 0:
+            return
 
-Question: {question}
+        if persist and self._disk_cache is not None:
+            self._disk_cache.set(self._disk_key(key), answer)
 
-Answer:"""
\ No newline at end of file
+        self._answer_cache.set(key, answer, settings.rag_answer_cache_ttl)
@@ -1,17 +1,36 @@
 """
 RAG service using Anthropic's Claude API.
 """
-import os
-from typing import List, Tuple, Optional
-from anthropic import Anthropic
+from typing import AsyncGenerator, Optional
+
+from anthropic import Anthropic, DefaultHttpxClient
 
 from config import settings, logger
+from app.services.cloud_specialist_anthropic import HTTP_LIMITS, get_anthropic_client
+from app.services.rag_base import BaseRAGService
 from app.services.vector_store import VectorStoreService
 
+# Shared client so every service instance reuses warm connections; the async
+# client is the one the cloud specialists already share
+_client: Optional[Anthropic] = None
+
+
+def get_client() -> Anthropic:
+    """Get or create the shared Anthropic client (HTTP/2, pooled)."""
+    global _client
+    if _client is None:
+        _client = Anthropic(
+            api_key=settings.anthropic_api_key,
+            http_client=DefaultHttpxClient(http2=True, limits=HTTP_LIMITS)
+        )
+    return _client
+
 
-class RAGAnthropicService:
+class RAGAnthropicService(BaseRAGService):
     """Service for answering queries using RAG with Anthropic Claude."""
 
+    provider_name = "Anthropic"
+
     def __init__(self, vector_store: VectorStoreService):
         """
         Initialize RAG Anthropic service.
@@ -19,87 +38,12 @@ class RAGAnthropicService:
         Args:
             vector_store: VectorStoreService instance
         """
-        self.vector_store = vector_store
-        self.client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-        self.model = os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-20250514")
+        super().__init__(vector_store)
+        self.client = get_client()
+        self.async_client = get_anthropic_client()
+        self.model = settings.anthropic_model
         logger.info(f"RAGAnthropicService initialized with model: {self.model}")
 
-    def query(
-            self,
-            question: str,
-            k: Optional[int] = None,
-            include_sources: bool = True
-    ) -> Tuple[str, Optional[List[str]]]:
-        """
-        Answer a question using RAG with Anthropic.
-
-        Args:
-            question: User's question
-            k: Number of documents to retrieve
-            include_sources: Whether to include source citations
-
-        Returns:
-            Tuple of (answer, sources)
-        """
-        logger.info(f"[Anthropic] Processing query: '{question}'")
-
-        # Retrieve relevant documents
-        try:
-            retriever = self.vector_store.get_retriever(k=k)
-            results = retriever.invoke(question)
-        except ValueError:
-            return (
-                "📚 No documents in knowledge base. Please run ingestion first.",
-                None
-            )
-        except Exception as e:
-            logger.error(f"[Anthropic] Retrieval error: {e}")
-            return f"❌ Error during retrieval: {str(e)}", None
-
-        if not results:
-            return "❓ No relevant information found in the knowledge base.", None
-
-        # Extract context and sources
-        contexts = [doc.page_content for doc in results]
-        sources = None
-        if include_sources:
-            sources = list(set([
-                os.path.basename(doc.metadata.get('source', 'Unknown'))
-                for doc in results
-            ]))
-
-        # Build prompt
-        prompt = self._build_prompt(question, contexts)
-
-        # Generate answer using Anthropic
-        try:
-            answer = self._generate(prompt)
-            logger.info("[Anthropic] Answer generated successfully")
-
-            if include_sources and sources:
-                answer = f"{answer}\n\n📚 Sources: {', '.join(sources)}"
-
-            return answer, sources
-        except Exception as e:
-            logger.error(f"[Anthropic] Generation error: {e}")
-            return f"❌ Error generating answer: {str(e)}", sources
-
-    def _build_prompt(self, question: str, contexts: List[str]) -> str:
-        """Build prompt for Claude."""
-        context_text = "\n\n".join([
-            f"[Context {i + 1}]\n{ctx}"
-            for i, ctx in enumerate(contexts)
-        ])
-
-        return f"""You are a helpful assistant. Answer the question concisely using only the provided context below. If you cannot answer based on the context, say so clearly.
-
-Context:
-{context_text}
-
-Question: {question}
-
-Answer:"""
-
     def _generate(self, prompt: str) -> str:
         """Generate answer using Anthropic Claude."""
         message = self.client.messages.create(
@@ -110,4 +54,28 @@ Answer:"""
             ]
         )
 
-        return message.content[0].text.strip()
\ No newline at end of file
+        return message.content[0].text.strip()
+
+    async def _agenerate(self, prompt: str) -> str:
+        """Generate answer using Anthropic Claude via the async client."""
+        message = await self.async_client.messages.create(
+            model=self.model,
+            max_tokens=1024,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+
+        return message.content[0].text.strip()
+
+    async def _agenerate_stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        """Stream answer text from Anthropic Claude as it is generated."""
+        async with self.async_client.messages.stream(
+            model=self.model,
+            max_tokens=1024,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
@@ -0,0 +1,501 @@
+"""
+Shared retrieval, caching and prompt logic for the cloud RAG services.
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncGenerator, Callable, Dict, List, NamedTuple, Tuple, Optional
+
+from config import settings, logger
+from app.services.vector_store import VectorStoreService, source_name
+from app.services.semantic_cache import SemanticCache
+
+
+# Bounded pool for blocking retrieval work (embedding + vector search), shared by
+# all cloud RAG services so concurrent requests cannot spawn unbounded threads
+_retriever_executor = ThreadPoolExecutor(
+    max_workers=settings.rag_retriever_workers,
+    thread_name_prefix="rag-retriever"
+)
+
+
+async def run_in_retriever_pool(func: Callable, *args):
+    """
+    Run a blocking retrieval call on the shared retriever pool.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments for func
+
+    Returns:
+        Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_retriever_executor, func, *args)
+
+
+class Retrieval(NamedTuple):
+    """Documents retrieved for a question, ahead of generating the answer."""
+    documents: list
+    embedding: Optional[List[float]] = None  # Question embedding, when one was computed
+
+
+# Static prompt header, built once; contexts and question are appended per query
+PROMPT_HEADER = (
+    "You are a helpful assistant. Answer the question concisely using only the "
+    "provided context below. If you cannot answer based on the context, say so clearly.\n"
+    "\n"
+    "Context:\n"
+)
+
+
+def build_prompt(question: str, contexts: List[str]) -> str:
+    """
+    Build the RAG answer prompt.
+
+    Args:
+        question: User's question
+        contexts: Retrieved document contents, most relevant first
+
+    Returns:
+        Prompt text
+    """
+    # One join over all pieces - the contexts are copied once, not re-copied
+    # into an outer template
+    parts = [PROMPT_HEADER]
+    for i, ctx in enumerate(contexts, 1):
+        parts += ("[Context ", str(i), "]\n", ctx, "\n\n")
+    parts += ("Question: ", question, "\n\nAnswer:")
+    return "".join(parts)
+
+
+class BaseRAGService(ABC):
+    """
+    Base class for RAG services backed by a cloud LLM.
+
+    Subclasses set up their client in __init__ and implement _generate and
+    _agenerate; retrieval, caching and prompt building live here.
+    """
+
+    # Label used in log messages
+    provider_name = "RAG"
+
+    def __init__(self, vector_store: VectorStoreService):
+        """
+        Initialize shared RAG state.
+
+        Args:
+            vector_store: VectorStoreService instance
+        """
+        self.vector_store = vector_store
+        self.semantic_cache = SemanticCache(
+            max_size=settings.semantic_cache_size,
+            ttl_seconds=settings.semantic_cache_ttl,
+            threshold=settings.semantic_cache_threshold
+        )
+
+    def query(
+            self,
+            question: str,
+            k: Optional[int] = None,
+            include_sources: bool = True
+    ) -> Tuple[str, Optional[List[str]]]:
+        """
+        Answer a question using RAG.
+
+        Args:
+            question: User's question
+            k: Number of documents to retrieve
+            include_sources: Whether to include source citations
+
+        Returns:
+            Tuple of (answer, sources)
+        """
+        logger.info(f"[{self.provider_name}] Processing query: '{question}'")
+
+        embedding = self._embed_question(question, k)
+        cached = self._cached_result(embedding, include_sources)
+        if cached is not None:
+            return cached
+
+        # Sources are also needed to cache the answer with its citations
+        prompt, sources, error = self._prepare_prompt(
+            question, k, include_sources or embedding is not None, embedding
+        )
+        if error:
+            return error, None
+
+        # Generate answer
+        try:
+            answer = self._generate(prompt)
+            logger.info(f"[{self.provider_name}] Answer generated successfully")
+        except Exception as e:
+            logger.error(f"[{self.provider_name}] Generation error: {e}")
+            return f"❌ Error generating answer: {str(e)}", sources if include_sources else None
+
+        if embedding is not None:
+            self.semantic_cache.put(embedding, answer, sources)
+        return self._result(answer, sources, include_sources)
+
+    async def aquery(
+            self,
+            question: str,
+            k: Optional[int] = None,
+            include_sources: bool = True,
+            retrieval: Optional[Retrieval] = None
+    ) -> Tuple[str, Optional[List[str]]]:
+        """
+        Answer a question using RAG without blocking the event loop.
+
+        Retrieval runs on the shared retriever pool and generation uses the async API,
+        so many queries can be in flight from one process.
+
+        Args:
+            question: User's question
+            k: Number of documents to retrieve
+            include_sources: Whether to include source citations
+            retrieval: Result of an earlier aretrieve for this question and k
+
+        Returns:
+            Tuple of (answer, sources)
+        """
+        logger.info(f"[{self.provider_name}] Processing async query: '{question}'")
+
+        if retrieval is None:
+            embedding = await run_in_retriever_pool(self._embed_question, question, k)
+        else:
+            embedding = retrieval.embedding
+        cached = self._cached_result(embedding, include_sources)
+        if cached is not None:
+            return cached
+
+        with_sources = include_sources or embedding is not None
+        if retrieval is None:
+            prepared = await run_in_retriever_pool(
+                self._prepare_prompt, question, k, with_sources, embedding
+            )
+        else:
+            prepared = self._prompt_from_results(question, retrieval.documents, with_sources)
+        return await self._answer_async(prepared, include_sources, embedding)
+
+    async def aretrieve(self, question: str, k: Optional[int] = None) -> Retrieval:
+        """
+        Embed a question and fetch its documents without generating an answer.
+
+        Args:
+            question: User's question
+            k: Number of documents to retrieve
+
+        Returns:
+            Retrieval to pass to aquery
+
+        Raises:
+            ValueError: If the knowledge base is empty
+        """
+        return await run_in_retriever_pool(self._retrieve, question, k)
+
+    def _retrieve(self, question: str, k: Optional[int]) -> Retrieval:
+        """Blocking part of aretrieve."""
+        embedding = self._embed_question(question, k)
+        return Retrieval(self._search(question, k, embedding), embedding)
+
+    async def aquery_stream(
+            self,
+            question: str,
+            k: Optional[int] = None,
+            include_sources: bool = True
+    ) -> AsyncGenerator[str, None]:
+        """
+        Answer a question using RAG, yielding the answer as it is generated.
+
+        Args:
+            question: User's question
+            k: Number of documents to retrieve
+            include_sources: Whether to append source citations as a final chunk
+
+        Yields:
+            Text chunks of the answer
+        """
+        logger.info(f"[{self.provider_name}] Processing streaming query: '{question}'")
+
+        embedding = await run_in_retriever_pool(self._embed_question, question, k)
+        cached = self._cached_result(embedding, include_sources)
+        if cached is not None:
+            yield cached[0]
+            return
+
+        prompt, sources, error = await run_in_retriever_pool(
+            self._prepare_prompt, question, k, include_sources or embedding is not None, embedding
+        )
+        if error:
+            yield error
+            return
+
+        chunks = []
+        try:
+            async for chunk in self._agenerate_stream(prompt):
+                chunks.append(chunk)
+                yield chunk
+            logger.info(f"[{self.provider_name}] Answer streamed successfully")
+        except Exception as e:
+            logger.error(f"[{self.provider_name}] Generation error: {e}")
+            yield f"❌ Error generating answer: {str(e)}"
+            return
+
+        # The full text is only assembled here, for the semantic cache
+        if embedding is not None:
+            self.semantic_cache.put(embedding, "".join(chunks).strip(), sources)
+        if include_sources and sources:
+            yield f"\n\n📚 Sources: {', '.join(sources)}"
+
+    async def query_batch(
+            self,
+            questions: List[str],
+            k: Optional[int] = None,
+            include_sources: bool = True
+    ) -> List[Tuple[str, Optional[List[str]]]]:
+        """
+        Answer several questions with one retrieval pass and concurrent generation.
+
+        Args:
+            questions: User questions
+            k: Number of documents to retrieve per question
+            include_sources: Whether to include source citations
+
+        Returns:
+            List of (answer, sources) tuples in the same order as questions
+        """
+        logger.info(f"[{self.provider_name}] Processing batch of {len(questions)} queries")
+
+        prepared = await run_in_retriever_pool(self._prepare_prompts, questions, k, include_sources)
+        return list(await asyncio.gather(
+            *(self._answer_async(item, include_sources) for item in prepared)
+        ))
+
+    async def _answer_async(
+            self,
+            prepared: Tuple[Optional[str], Optional[List[str]], Optional[str]],
+            include_sources: bool,
+            embedding: Optional[List[float]] = None
+    ) -> Tuple[str, Optional[List[str]]]:
+        """
+        Generate the answer for a prepared (prompt, sources, error) tuple.
+
+        Args:
+            prepared: Output of _prepare_prompt
+            include_sources: Whether to include source citations
+            embedding: Question embedding to cache the answer under, if any
+
+        Returns:
+            Tuple of (answer, sources)
+        """
+        prompt, sources, error = prepared
+        if error:
+            return error, None
+
+        try:
+            answer = await self._agenerate(prompt)
+            logger.info(f"[{self.provider_name}] Answer generated successfully")
+        except Exception as e:
+            logger.error(f"[{self.provider_name}] Generation error: {e}")
+            return f"❌ Error generating answer: {str(e)}", sources if include_sources else None
+
+        if embedding is not None:
+            self.semantic_cache.put(embedding, answer, sources)
+        return self._result(answer, sources, include_sources)
+
+    def _embed_question(self, question: str, k: Optional[int]) -> Optional[List[float]]:
+        """
+        Embed a question for the semantic cache.
+
+        Args:
+            question: User's question
+            k: Requested retrieval depth; only default-depth queries are cached
+
+        Returns:
+            Question embedding, or None when the cache cannot be used
+        """
+        embeddings = getattr(self.vector_store, "embeddings", None)
+        if k is not None or embeddings is None or not self.semantic_cache.enabled:
+            return None
+
+        try:
+            return embeddings.embed_query(question)
+        except Exception as e:
+            logger.warning(f"[{self.provider_name}] Question embedding failed, skipping semantic cache: {e}")
+            return None
+
+    def _cached_result(
+            self,
+            embedding: Optional[List[float]],
+            include_sources: bool
+    ) -> Optional[Tuple[str, Optional[List[str]]]]:
+        """Return the cached result for a similar question, if any."""
+        if embedding is None:
+            return None
+
+        cached = self.semantic_cache.get(embedding)
+        if cached is None:
+            return None
+
+        logger.info(f"[{self.provider_name}] Semantic cache hit")
+        answer, sources = cached
+        return self._result(answer, sources, include_sources)
+
+    def _prepare_prompt(
+            self,
+            question: str,
+            k: Optional[int],
+            with_sources: bool = True,
+            embedding: Optional[List[float]] = None
+    ) -> Tuple[Optional[str], Optional[List[str]], Optional[str]]:
+        """
+        Retrieve documents and build the prompt.
+
+        Args:
+            question: User's question
+            k: Number of documents to retrieve
+            with_sources: Whether to collect source names (None otherwise)
+            embedding: Question embedding already computed for the semantic
+                cache; reused so the question is not embedded twice
+
+        Returns:
+            Tuple of (prompt, sources, error); error is set when there is nothing to generate
+        """
+        # Retrieve relevant documents
+        try:
+            results = self._search(question, k, embedding)
+        except ValueError:
+            return None, None, "📚 No documents in knowledge base. Please run ingestion first."
+        except Exception as e:
+            logger.error(f"[{self.provider_name}] Retrieval error: {e}")
+            return None, None, f"❌ Error during retrieval: {str(e)}"
+
+        return self._prompt_from_results(question, results, with_sources)
+
+    def _search(
+            self,
+            question: str,
+            k: Optional[int],
+            embedding: Optional[List[float]] = None
+    ) -> list:
+        """Search the vector store, reusing the question embedding when there is one."""
+        if embedding is not None:
+            return self.vector_store.search_by_vector(embedding, k=k)
+        retriever = self.vector_store.get_retriever(k=k)
+        return retriever.invoke(question)
+
+    def _prepare_prompts(
+            self,
+            questions: List[str],
+            k: Optional[int],
+            with_sources: bool = True
+    ) -> List[Tuple[Optional[str], Optional[List[str]], Optional[str]]]:
+        """
+        Retrieve documents for several questions in one batched retriever call.
+
+        Args:
+            questions: User questions
+            k: Number of documents to retrieve per question
+            with_sources: Whether to collect source names (None otherwise)
+
+        Returns:
+            One (prompt, sources, error) tuple per question
+        """
+        try:
+            retriever = self.vector_store.get_retriever(k=k)
+            batch_results = retriever.batch(questions)
+        except ValueError:
+            error = "📚 No documents in knowledge base. Please run ingestion first."
+            return [(None, None, error)] * len(questions)
+        except Exception as e:
+            logger.error(f"[{self.provider_name}] Retrieval error: {e}")
+            return [(None, None, f"❌ Error during retrieval: {str(e)}")] * len(questions)
+
+        return [
+            self._prompt_from_results(question, results, with_sources)
+            for question, results in zip(questions, batch_results)
+        ]
+
+    def _prompt_from_results(
+            self,
+            question: str,
+            results: list,
+            with_sources: bool = True
+    ) -> Tuple[Optional[str], Optional[List[str]], Optional[str]]:
+        """Build the prompt and (optionally) source list from retrieved documents."""
+        if not results:
+            return None, None, "❓ No relevant information found in the knowledge base."
+
+        contexts = [doc.page_content for doc in results]
+        if not with_sources:
+            return self._build_prompt(question, contexts), None, None
+
+        # Deduplicate in retrieval order so citations follow relevance
+        sources = list(dict.fromkeys(
+            source_name(doc.metadata.get('source', 'Unknown'))
+            for doc in results
+        ))
+
+        return self._build_prompt(question, contexts), sources, None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get semantic cache statistics."""
+        return self.semantic_cache.get_stats()
+
+    @staticmethod
+    def _result(
+            answer: str,
+            sources: Optional[List[str]],
+            include_sources: bool
+    ) -> Tuple[str, Optional[List[str]]]:
+        """Build the (answer, sources) result, appending citations when requested."""
+        if not include_sources:
+            return answer, None
+        if sources:
+            answer = f"{answer}\n\n📚 Sources: {', '.join(sources)}"
+        return answer, sources
+
+    def _build_prompt(self, question: str, contexts: List[str]) -> str:
+        """Build prompt for the LLM."""
+        return build_prompt(question, contexts)
+
+    @abstractmethod
+    def _generate(self, prompt: str) -> str:
+        """
+        Generate an answer for a prompt.
+
+        Args:
+            prompt: Full RAG prompt
+
+        Returns:
+            Generated answer text
+        """
+        pass
+
+    @abstractmethod
+    async def _agenerate(self, prompt: str) -> str:
+        """
+        Generate an answer for a prompt without blocking the event loop.
+
+        Args:
+            prompt: Full RAG prompt
+
+        Returns:
+            Generated answer text
+        """
+        pass
+
+    async def _agenerate_stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        """
+        Generate an answer for a prompt as a stream of text chunks.
+
+        Providers without a streaming API fall back to a single chunk.
+
+        Args:
+            prompt: Full RAG prompt
+
+        Yields:
+            Text chunks as they arrive
+        """
+        yield await self._agenerate(prompt)
@@ -3,10 +3,17 @@ Router service for analyzing and classifying incoming requests.
 Supports both local llama.cpp routing and cloud-based routing via Anthropic/Google.
 """
 import json
-from typing import Optional, Dict, Any
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Union
 from pathlib import Path
 
+import orjson
+
 from config import settings, logger
+from app.services.disk_cache import open_disk_cache, prompt_version
 
 # Gate llama_cpp imports for production
 if settings.environment != "production":
@@ -19,6 +26,54 @@ if settings.environment != "production":
 else:
     LLAMA_CPP_AVAILABLE = False
 
+# Agent categories a routing decision may name
+VALID_AGENTS = frozenset({
+    "code_validation",
+    "rag_query",
+    "code_generation",
+    "code_analysis",
+    "complex_reasoning",
+    "general_chat"
+})
+
+REQUIRED_ROUTING_FIELDS = ("primary_agent", "parallel_agents", "confidence", "reasoning")
+
+
+def validate_routing_decision(routing_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate and normalize a decoded routing decision.
+
+    Shared by the local and cloud routers.
+
+    Args:
+        routing_data: Decoded routing JSON
+
+    Returns:
+        The same dict with agent, confidence and parallel agents normalized
+
+    Raises:
+        ValueError: If a required field is missing
+    """
+    for field in REQUIRED_ROUTING_FIELDS:
+        if field not in routing_data:
+            raise ValueError(f"Missing required field: {field}")
+
+    if routing_data["primary_agent"] not in VALID_AGENTS:
+        logger.warning(
+            f"Invalid agent category: {routing_data['primary_agent']}, "
+            f"defaulting to general_chat"
+        )
+        routing_data["primary_agent"] = "general_chat"
+
+    # Ensure confidence is a float between 0 and 1
+    routing_data["confidence"] = max(0.0, min(1.0, float(routing_data["confidence"])))
+
+    # Ensure parallel_agents is a list
+    if not isinstance(routing_data["parallel_agents"], list):
+        routing_data["parallel_agents"] = []
+
+    return routing_data
+
 
 class RouterService:
     """Service for routing requests to appropriate agents."""
@@ -34,12 +89,60 @@ array ::= "[" ws (string (ws "," ws string)*)? ws "]"
 ws ::= [ \t\n]*
 '''
 
+    # Fallback for malformed output: first JSON object, allowing one level of nesting
+    _JSON_RE = re.compile(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}')
+
+    # Static routing instructions around the user message. The prefix is identical
+    # for every call, so llama.cpp reuses its KV state and only prefills the message
+    ROUTING_PROMPT_PREFIX = """You are a request classifier. Analyze the user's message and classify it.
+
+Categories:
+1. code_validation - Check syntax or validate code
+2. rag_query - Questions needing information from documents/knowledge base
+3. code_generation - Write/create new code
+4. code_analysis - Explain or review existing code
+5. complex_reasoning - Multi-step problems requiring deep thinking or algorithms
+6. general_chat - Casual conversation, greetings, or simple questions
+
+For SIMPLE requests, use ONE category as primary_agent with empty parallel_agents.
+For COMPLEX requests needing multiple perspectives, add relevant categories to parallel_agents.
+
+Examples:
+- "validate this code" → {"primary_agent": "code_validation", "parallel_agents": [], "confidence": 0.95, "reasoning": "simple validation request"}
+- "validate and explain this code" → {"primary_agent": "code_validation", "parallel_agents": ["code_analysis"], "confidence": 0.9, "reasoning": "needs validation and explanation"}
+- "is this code correct and how can I improve it?" → {"primary_agent": "code_validation", "parallel_agents": ["code_analysis"], "confidence": 0.9, "reasoning": "validation plus improvement suggestions"}
+- "write a function" → {"primary_agent": "code_generation", "parallel_agents": [], "confidence": 0.95, "reasoning": "straightforward code generation"}
+- "search docs for X" → {"primary_agent": "rag_query", "parallel_agents": [], "confidence": 0.95, "reasoning": "knowledge base query"}
+
+User message:"""
+
+    ROUTING_PROMPT_SUFFIX = """
+
+Respond ONLY with valid JSON in this exact format:
+{
+    "primary_agent": "category_name",
+    "parallel_agents": [],
+    "confidence": 0.95,
+    "reasoning": "brief explanation"
+}
+
+JSON Response:"""
+
     def __init__(self):
         """Initialize router service with cloud or local routing."""
         self.enabled = self._check_enabled()
         self.llm = None
         self.cloud_router = None
         self.router_type = None
+        self._grammar = None
+        # Token ids of the static prompt prefix/suffix, set once the local model loads
+        self._prefix_ids: Optional[List[int]] = None
+        self._suffix_ids: Optional[List[int]] = None
+
+        # LRU of routing decisions keyed on the normalized message
+        self._decision_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._decision_cache_lock = threading.Lock()
+        self._disk_cache = open_disk_cache("router")
 
         if self.enabled:
             # Try cloud routers first (Anthropic preferred over Google)
@@ -57,6 +160,9 @@ ws ::= [ \t\n]*
         else:
             logger.info("RouterService disabled - no router configured")
 
+        # Persisted decisions are only reused for the same routing model and prompt
+        self._disk_key_prefix = self._routing_setup_id()
+
     def _check_enabled(self) -> bool:
         """
         Check if router is enabled.
@@ -127,15 +233,63 @@ ws ::= [ \t\n]*
                 n_batch=settings.router_n_batch,
                 n_threads=settings.router_n_threads,
                 temperature=settings.router_temperature,
+                use_mmap=settings.llamacpp_use_mmap,
+                use_mlock=settings.llamacpp_use_mlock,
                 verbose=settings.debug
             )
+            # Parse the JSON grammar up front rather than on the first request
+            self._grammar = LlamaGrammar.from_string(self.ROUTING_GRAMMAR)
+            self._pretokenize_prompt()
             self.router_type = "local"
             logger.info(f"✓ RouterService enabled with local model: {settings.router_model_path}")
+            self._warmup()
 
         except Exception as e:
             logger.error(f"Failed to initialize local router LLM: {e}")
             self.enabled = False
 
+    def _pretokenize_prompt(self):
+        """
+        Tokenize the static prompt parts once, so only the message is tokenized per call.
+
+        Tokenizing the parts separately only equals tokenizing the joined
+        prompt if the tokenizer does not merge or add pieces at the seams
+        (SentencePiece, for one, prefixes every call with a space piece). This
+        is checked on a sample message; on a mismatch the router keeps sending
+        the prompt as a string.
+        """
+        prefix_ids = self.llm.tokenize(self.ROUTING_PROMPT_PREFIX.encode("utf-8"), add_bos=True)
+        suffix_ids = self.llm.tokenize(self.ROUTING_PROMPT_SUFFIX.encode("utf-8"), add_bos=False)
+
+        sample = "write a function"
+        joined = self.llm.tokenize(self._build_routing_prompt(sample).encode("utf-8"), add_bos=True)
+        parts = prefix_ids + self.llm.tokenize(sample.encode("utf-8"), add_bos=False) + suffix_ids
+        if joined != parts:
+            logger.info("Router tokenizer is not split-stable, sending prompts as text")
+            return
+
+        self._prefix_ids = prefix_ids
+        self._suffix_ids = suffix_ids
+
+    def _warmup(self):
+        """
+        Run a one-token inference so the first real request is not cold.
+
+        Touches the mmapped weights and evaluates the static routing prefix,
+        which later prompts share. Best effort - failures are only logged.
+        """
+        start = time.perf_counter()
+        try:
+            self.llm(
+                self._build_routing_tokens("hello"),
+                max_tokens=1,
+                temperature=0.0
+            )
+        except Exception as e:
+            logger.warning(f"Router warmup failed: {e}")
+            return
+        logger.info(f"Router warmup complete in {(time.perf_counter() - start) * 1000:.0f}ms")
+
     def route(self, message: str) -> Dict[str, Any]:
         """
         Route a message to appropriate agent(s).
@@ -161,6 +315,87 @@ ws ::= [ \t\n]*
                 "reasoning": "Router disabled - using default agent"
             }
 
+        key = " ".join(message.lower().split())
+        cached = self._get_cached_decision(key)
+        if cached is not None:
+            return cached
+
+        # Second tier: decisions persisted by earlier processes
+        if self._disk_cache is not None and settings.router_cache_size > 0:
+            persisted = self._disk_cache.get(self._disk_key(key))
+            if persisted is not None:
+                logger.debug("Router disk cache hit: %s", persisted["primary_agent"])
+                self._cache_decision(key, persisted, persist=False)
+                return persisted
+
+        routing_decision = self._route_uncached(message)
+
+        # Error fallbacks are not cached so the next attempt retries the model
+        if not routing_decision.get("reasoning", "").startswith("Routing failed"):
+            self._cache_decision(key, routing_decision)
+
+        return routing_decision
+
+    def _routing_setup_id(self) -> str:
+        """Identify the routing model and prompt template in use."""
+        model = {
+            "anthropic": settings.anthropic_model,
+            "google": settings.google_model,
+            "local": settings.router_model_path,
+        }.get(self.router_type) or ""
+        prompts = self.cloud_router or self
+        template = prompts.ROUTING_PROMPT_PREFIX + "{message}" + prompts.ROUTING_PROMPT_SUFFIX
+        return f"{self.router_type}\0{model}\0{prompt_version(template)}"
+
+    def _disk_key(self, key: str) -> str:
+        """Build the persistent cache key for a normalized message."""
+        return f"{self._disk_key_prefix}\0{key}"
+
+    def _get_cached_decision(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached decision for a normalized message, if any."""
+        with self._decision_cache_lock:
+            cached = self._decision_cache.get(key)
+            if cached is None:
+                return None
+            self._decision_cache.move_to_end(key)
+
+        logger.debug("Router cache hit: %s", cached["primary_agent"])
+        return {**cached, "parallel_agents": list(cached["parallel_agents"])}
+
+    def _cache_decision(self, key: str, routing_decision: Dict[str, Any], persist: bool = True):
+        """Store a routing decision, evicting the least recently used entry."""
+        if settings.router_cache_size <= 0:
+            return
+
+        if persist and self._disk_cache is not None:
+            self._disk_cache.set(self._disk_key(key), routing_decision)
+
+        with self._decision_cache_lock:
+            self._decision_cache[key] = {
+                **routing_decision,
+                "parallel_agents": list(routing_decision["parallel_agents"])
+            }
+            self._decision_cache.move_to_end(key)
+            while len(self._decision_cache) > settings.router_cache_size:
+                self._decision_cache.popitem(last=False)
+
+    def clear_cache(self):
+        """Drop all cached routing decisions (e.g. after a config change)."""
+        with self._decision_cache_lock:
+            self._decision_cache.clear()
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
+
+    def _route_uncached(self, message: str) -> Dict[str, Any]:
+        """
+        Classify a message with the cloud or local router.
+
+        Args:
+            message: User's message
+
+        Returns:
+            Routing decision dict
+        """
         logger.info(f"Routing request: '{message[:100]}...'")
 
         try:
@@ -178,7 +413,7 @@ ws ::= [ \t\n]*
                     "reasoning": "Local routing not available in production"
                 }
 
-            prompt = self._build_routing_prompt(message)
+            prompt = self._build_routing_tokens(message)
             response = self._generate(prompt)
             routing_decision = self._parse_routing_response(response)
 
@@ -201,39 +436,26 @@ ws ::= [ \t\n]*
 
     def _build_routing_prompt(self, message: str) -> str:
         """Build prompt for local routing classification."""
-        return f"""You are a request classifier. Analyze the user's message and classify it.
+        return self.ROUTING_PROMPT_PREFIX + " " + message + self.ROUTING_PROMPT_SUFFIX
 
-Categories:
-1. code_validation - Check syntax or validate code
-2. rag_query - Questions needing information from documents/knowledge base
-3. code_generation - Write/create new code
-4. code_analysis - Explain or review existing code
-5. complex_reasoning - Multi-step problems requiring deep thinking or algorithms
-6. general_chat - Casual conversation, greetings, or simple questions
-
-For SIMPLE requests, use ONE category as primary_agent with empty parallel_agents.
-For COMPLEX requests needing multiple perspectives, add relevant categories to parallel_agents.
-
-Examples:
-- "validate this code" → {{"primary_agent": "code_validation", "parallel_agents": [], "confidence": 0.95, "reasoning": "simple validation request"}}
-- "validate and explain this code" → {{"primary_agent": "code_validation", "parallel_agents": ["code_analysis"], "confidence": 0.9, "reasoning": "needs validation and explanation"}}
-- "is this code correct and how can I improve it?" → {{"primary_agent": "code_validation", "parallel_agents": ["code_analysis"], "confidence": 0.9, "reasoning": "validation plus improvement suggestions"}}
-- "write a function" → {{"primary_agent": "code_generation", "parallel_agents": [], "confidence": 0.95, "reasoning": "straightforward code generation"}}
-- "search docs for X" → {{"primary_agent": "rag_query", "parallel_agents": [], "confidence": 0.95, "reasoning": "knowledge base query"}}
+    def _build_routing_tokens(self, message: str) -> Union[List[int], str]:
+        """
+        Build the local routing prompt as token ids.
 
-User message: {message}
+        Args:
+            message: User's message
 
-Respond ONLY with valid JSON in this exact format:
-{{
-    "primary_agent": "category_name",
-    "parallel_agents": [],
-    "confidence": 0.95,
-    "reasoning": "brief explanation"
-}}
+        Returns:
+            Prefix + message + suffix token ids, or the prompt string if the
+            static parts have not been tokenized
+        """
+        if self._prefix_ids is None or self._suffix_ids is None:
+            return self._build_routing_prompt(message)
 
-JSON Response:"""
+        message_ids = self.llm.tokenize(message.encode("utf-8"), add_bos=False)
+        return self._prefix_ids + message_ids + self._suffix_ids
 
-    def _generate(self, prompt: str) -> str:
+    def _generate(self, prompt: Union[List[int], str]) -> str:
         """Generate response from local router LLM with JSON grammar enforcement."""
         if settings.environment == "production":
             raise RuntimeError("Local generation not available in production")
@@ -241,14 +463,15 @@ JSON Response:"""
         if not LLAMA_CPP_AVAILABLE:
             raise RuntimeError("llama_cpp not available")
 
-        # Create grammar object to enforce JSON structure
-        grammar = LlamaGrammar.from_string(self.ROUTING_GRAMMAR)
+        # Parse the grammar once - it is the same for every routing call
+        if self._grammar is None:
+            self._grammar = LlamaGrammar.from_string(self.ROUTING_GRAMMAR)
 
         response = self.llm(
             prompt,
             max_tokens=settings.router_max_tokens,
             temperature=settings.router_temperature,
-            grammar=grammar,  # Enforce valid JSON output
+            grammar=self._grammar,  # Enforce valid JSON output
             stop=["<|end|>", "<|assistant|>", "<|user|>", "User message:", "\n\n\n"]
         )
 
@@ -266,39 +489,16 @@ JSON Response:"""
         """
         try:
             # With grammar enforcement, response should be clean JSON
-            routing_data = json.loads(response)
-
-            # Validate required fields
-            required_fields = ["primary_agent", "parallel_agents", "confidence", "reasoning"]
-            for field in required_fields:
-                if field not in routing_data:
-                    raise ValueError(f"Missing required field: {field}")
-
-            # Validate agent category
-            valid_agents = [
-                "code_validation",
-                "rag_query",
-                "code_generation",
-                "code_analysis",
-                "complex_reasoning",
-                "general_chat"
-            ]
-
-            if routing_data["primary_agent"] not in valid_agents:
-                logger.warning(
-                    f"Invalid agent category: {routing_data['primary_agent']}, "
-                    f"defaulting to general_chat"
-                )
-                routing_data["primary_agent"] = "general_chat"
-
-            # Ensure confidence is a float between 0 and 1
-            routing_data["confidence"] = max(0.0, min(1.0, float(routing_data["confidence"])))
-
-            # Ensure parallel_agents is a list
-            if not isinstance(routing_data["parallel_agents"], list):
-                routing_data["parallel_agents"] = []
-
-            return routing_data
+            try:
+                routing_data = orjson.loads(response)
+            except json.JSONDecodeError:  # orjson's error subclasses it
+                # Grammar unavailable or output wrapped in text - pull out the object
+                match = self._JSON_RE.search(response)
+                if match is None:
+                    raise
+                routing_data = orjson.loads(match.group(0))
+
+            return validate_routing_decision(routing_data)
 
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode error: {e}\nResponse: {response}")
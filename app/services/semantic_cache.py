@@ -0,0 +1,148 @@
+"""
+Semantic answer cache keyed on question embeddings.
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import logger
+
+
+class SemanticCache:
+    """
+    In-memory cache returning stored answers for semantically similar questions.
+
+    Question embeddings are L2-normalized and kept in one matrix, so a lookup is
+    a single matrix-vector product (cosine similarity) over the live entries.
+    Entries expire after a TTL; when full, expired entries are reused first and
+    then the least recently used one.
+    """
+
+    def __init__(
+            self,
+            max_size: int = 1024,
+            ttl_seconds: int = 300,
+            threshold: float = 0.85
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            max_size: Maximum number of cached answers
+            ttl_seconds: Seconds an answer stays valid
+            threshold: Minimum cosine similarity for a hit
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+
+        self._lock = threading.Lock()
+        self._embeddings: Optional[np.ndarray] = None  # allocated on first put
+        self._entries: List[Tuple[str, Optional[List[str]]]] = []
+        self._expires_at = np.zeros(max_size)
+        self._last_used = np.zeros(max_size)
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything at all."""
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        """L2-normalize an embedding; None for zero vectors."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+
+    def get(self, embedding: Sequence[float]) -> Optional[Tuple[str, Optional[List[str]]]]:
+        """
+        Look up the answer stored for the most similar question.
+
+        Args:
+            embedding: Question embedding
+
+        Returns:
+            Tuple of (answer, sources) on a hit, None otherwise
+        """
+        vector = self._normalize(embedding)
+
+        with self._lock:
+            count = len(self._entries)
+            if vector is None or count == 0 or vector.shape[0] != self._embeddings.shape[1]:
+                self.misses += 1
+                return None
+
+            now = time.monotonic()
+            similarities = self._embeddings[:count] @ vector
+            similarities[self._expires_at[:count] <= now] = -np.inf
+
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                self.misses += 1
+                return None
+
+            self._last_used[best] = now
+            self.hits += 1
+            return self._entries[best]
+
+    def put(self, embedding: Sequence[float], answer: str, sources: Optional[List[str]]):
+        """
+        Store an answer for a question embedding.
+
+        Args:
+            embedding: Question embedding
+            answer: Generated answer (without source citations)
+            sources: Source file names used for the answer
+        """
+        if not self.enabled:
+            return
+
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        with self._lock:
+            if self._embeddings is None or self._embeddings.shape[1] != vector.shape[0]:
+                # First entry (or the embedding model changed) - start fresh
+                self._embeddings = np.zeros((self.max_size, vector.shape[0]), dtype=np.float32)
+                self._entries = []
+
+            now = time.monotonic()
+            count = len(self._entries)
+            if count < self.max_size:
+                slot = count
+                self._entries.append((answer, sources))
+            else:
+                expired = np.flatnonzero(self._expires_at <= now)
+                slot = int(expired[0]) if expired.size else int(np.argmin(self._last_used))
+                self._entries[slot] = (answer, sources)
+
+            self._embeddings[slot] = vector
+            self._expires_at[slot] = now + self.ttl_seconds
+            self._last_used[slot] = now
+
+        logger.debug("Semantic cache stored answer in slot %d", slot)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with size, hits, misses and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
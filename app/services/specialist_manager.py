@@ -1,25 +1,42 @@
 """
 Specialist manager with intelligent fallback and circuit breaker.
 """
-from typing import Optional, Union, AsyncGenerator
+import asyncio
+import inspect
+import time
+import urllib.request
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Iterator, Optional, Tuple, Union
 from pathlib import Path
 
+import google.generativeai as genai
+import httpx
+
 from config import settings, logger
 from app.services.circuit_breaker import CircuitBreaker
-from app.services.cloud_specialist_anthropic import CloudSpecialistAnthropicService
-from app.services.cloud_specialist_google import CloudSpecialistGoogleService
+from app.services.cloud_specialist_anthropic import (
+    CloudSpecialistAnthropicService,
+    get_anthropic_client
+)
+from app.services.cloud_specialist_google import CloudSpecialistGoogleService, configure_client
 
 # Gate llama_cpp imports for production
 if settings.environment != "production":
     try:
-        from llama_cpp import Llama
-        from app.services.local_specialist_phi3 import LocalSpecialistPhi3Service
-        LLAMA_CPP_AVAILABLE = True
+        from app.services.local_specialist_phi3 import (
+            LlamaServerPhi3Service,
+            LocalSpecialistPhi3Service,
+            get_shared_phi3,
+            llama_server_available,
+            LLAMA_CPP_AVAILABLE
+        )
     except ImportError:
         LLAMA_CPP_AVAILABLE = False
+        LlamaServerPhi3Service = None
+        llama_server_available = None
         logger.warning("llama_cpp not available for local specialists")
 else:
     LLAMA_CPP_AVAILABLE = False
+    LlamaServerPhi3Service = None
     LocalSpecialistPhi3Service = None  # Type hint placeholder
 
 
@@ -33,35 +50,64 @@ class SpecialistManager:
     3. Phi-3 (local, slower, reliable) - non-production only
     """
 
+    # Endpoints probed before retrying a cloud provider that just failed
+    PROVIDER_HOSTS = {
+        "Anthropic": "api.anthropic.com",
+        "Google": "generativelanguage.googleapis.com",
+    }
+
     def __init__(self):
         """Initialize specialist manager with circuit breakers."""
         # Circuit breakers for each provider
+        latency_threshold = settings.circuit_breaker_latency_ms or None
         self.anthropic_breaker = CircuitBreaker(
             name="Anthropic",
-            failure_threshold=5,
-            timeout=60
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            timeout=settings.circuit_breaker_timeout,
+            latency_threshold_ms=latency_threshold
         )
         self.google_breaker = CircuitBreaker(
             name="Google",
-            failure_threshold=5,
-            timeout=60
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            timeout=settings.circuit_breaker_timeout,
+            latency_threshold_ms=latency_threshold
         )
 
         # Check provider availability
         self.has_anthropic = bool(settings.anthropic_api_key)
         self.has_google = bool(settings.google_api_key)
 
-        # Only check local availability in non-production
+        # Only check local availability in non-production. A running llama-server
+        # already holds Phi-3, so prefer it over loading a second copy in-process.
+        # It is probed in the background (prewarm_local) and whenever a local
+        # specialist is needed; it only counts as available once it answered.
         self.has_local = False
+        self.llama_server_enabled = False
+        self.has_local_model = False
         if settings.environment != "production":
-            self.has_local = bool(
+            self.llama_server_enabled = bool(
+                settings.local_specialist_via_server and llama_server_available is not None
+            )
+            self.has_local_model = bool(
                 LLAMA_CPP_AVAILABLE and
                 settings.llamacpp_chat_model_path and
                 Path(settings.llamacpp_chat_model_path).exists()
             )
+            self.has_local = self.has_local_model
+        # (checked_at, up) from the last llama-server probe
+        self._llama_server_state: Optional[Tuple[float, bool]] = None
 
         # Shared Phi-3 model (lazy loaded, non-production only)
         self._phi3_model = None
+        self._phi3_lock: Optional[asyncio.Lock] = None  # created on first use, inside the loop
+        self._phi3_preload: Optional[asyncio.Future] = None
+
+        # Provider name -> (checked_at, reachable); only providers that recently failed
+        self._reachability: Dict[str, Tuple[float, bool]] = {}
+
+        # Cloud specialists are stateless per type - build each once and reuse it
+        self._anthropic_specialists: Dict[str, CloudSpecialistAnthropicService] = {}
+        self._google_specialists: Dict[str, CloudSpecialistGoogleService] = {}
 
         logger.info(
             f"SpecialistManager initialized - "
@@ -71,73 +117,328 @@ class SpecialistManager:
             f"(environment: {settings.environment})"
         )
 
-    async def get_specialist(
+    def _anthropic_specialist(self, specialist_type: str) -> CloudSpecialistAnthropicService:
+        """Get the cached Anthropic specialist for a type, creating it on first use."""
+        specialist = self._anthropic_specialists.get(specialist_type)
+        if specialist is None:
+            specialist = CloudSpecialistAnthropicService(specialist_type)
+            self._anthropic_specialists[specialist_type] = specialist
+        return specialist
+
+    def _google_specialist(self, specialist_type: str) -> CloudSpecialistGoogleService:
+        """Get the cached Google specialist for a type, creating it on first use."""
+        specialist = self._google_specialists.get(specialist_type)
+        if specialist is None:
+            specialist = CloudSpecialistGoogleService(specialist_type)
+            self._google_specialists[specialist_type] = specialist
+        return specialist
+
+    async def _ensure_phi3(self) -> 'Llama':
+        """
+        Load the shared Phi-3 model once, off the event loop.
+
+        Concurrent callers wait on the same load instead of each starting one.
+
+        Returns:
+            Loaded Llama model
+        """
+        if self._phi3_model is None:
+            if self._phi3_lock is None:
+                self._phi3_lock = asyncio.Lock()
+            async with self._phi3_lock:
+                if self._phi3_model is None:
+                    logger.info("Loading shared Phi-3 model for local specialists")
+                    self._phi3_model = await asyncio.to_thread(get_shared_phi3)
+        return self._phi3_model
+
+    async def _llama_server_up(self) -> bool:
+        """
+        Whether the llama-server should serve local specialists.
+
+        The probe result is reused for settings.provider_probe_ttl_s, so a
+        server that starts (or stops) after startup is picked up.
+
+        Returns:
+            True if the server is enabled and answered its last probe
+        """
+        if not self.llama_server_enabled:
+            return False
+
+        now = time.monotonic()
+        state = self._llama_server_state
+        if state is not None and now - state[0] < settings.provider_probe_ttl_s:
+            return state[1]
+
+        up = await llama_server_available(settings.provider_probe_timeout_s)
+        if state is None or state[1] != up:
+            state_text = 'reachable' if up else 'unreachable'
+            logger.info(f"llama-server {state_text} at {settings.llama_server_host}")
+        self._set_llama_server_state(up)
+        return up
+
+    def _set_llama_server_state(self, up: bool):
+        """Record a llama-server probe; Local is available while it is up or a model exists."""
+        self._llama_server_state = (time.monotonic(), up)
+        self.has_local = self.has_local_model or up
+
+    async def _local_specialist(self, specialist_type: str) -> 'LocalSpecialistPhi3Service':
+        """Create a local Phi-3 specialist on the llama-server or the shared model."""
+        if await self._llama_server_up():
+            return LlamaServerPhi3Service(specialist_type)
+        if not self.has_local_model:
+            raise RuntimeError(
+                "llama-server is not reachable and no local Phi-3 model is configured"
+            )
+        return LocalSpecialistPhi3Service(specialist_type, await self._ensure_phi3())
+
+    async def _in_process_after_server_error(
             self,
+            specialist: Any,
+            error: Exception,
             specialist_type: str
-    ) -> Union[CloudSpecialistAnthropicService, CloudSpecialistGoogleService, 'LocalSpecialistPhi3Service']:
+    ) -> Optional['LocalSpecialistPhi3Service']:
         """
-        Get best available specialist with cascading fallback.
+        Switch to in-process Phi-3 when a llama-server call could not connect.
 
         Args:
-            specialist_type: Type of specialist needed
+            specialist: Local specialist that failed
+            error: Its error
+            specialist_type: Type of specialist
 
         Returns:
-            Specialist service instance
+            In-process specialist to retry with, or None if the error was not
+            a lost server or no local model is configured
+        """
+        if LlamaServerPhi3Service is None or not isinstance(specialist, LlamaServerPhi3Service):
+            return None
+        if not isinstance(error, httpx.TransportError):
+            return None
+
+        self._set_llama_server_state(False)
+        if not self.has_local_model:
+            return None
+        logger.warning(f"llama-server unreachable ({error}), using in-process Phi-3")
+        return LocalSpecialistPhi3Service(specialist_type, await self._ensure_phi3())
+
+    def _available_providers(
+            self
+    ) -> Iterator[Tuple[str, Callable[[str], Any], Optional[CircuitBreaker], float]]:
+        """
+        Yield usable providers in priority order as (name, factory, breaker, timeout).
 
-        Raises:
-            RuntimeError: If no specialists available
+        Circuit state is checked lazily, as each provider is reached. Local
+        Phi-3 has no breaker - it is the last resort. A timeout of 0 means no limit.
         """
-        # Try Anthropic first
         if self.has_anthropic and not self.anthropic_breaker.is_open():
-            try:
-                specialist = CloudSpecialistAnthropicService(specialist_type)
-                logger.debug(f"Using Anthropic specialist: {specialist_type}")
-                return specialist
-            except Exception as e:
-                logger.warning(f"Anthropic specialist creation failed: {e}")
-                self.anthropic_breaker.record_failure()
-
-        # Try Google second
+            yield (
+                "Anthropic", self._anthropic_specialist, self.anthropic_breaker,
+                settings.anthropic_timeout_s
+            )
         if self.has_google and not self.google_breaker.is_open():
-            try:
-                specialist = CloudSpecialistGoogleService(specialist_type)
-                logger.debug(f"Using Google specialist: {specialist_type}")
-                return specialist
-            except Exception as e:
-                logger.warning(f"Google specialist creation failed: {e}")
-                self.google_breaker.record_failure()
-
-        # Fallback to local Phi-3 (non-production only)
+            yield "Google", self._google_specialist, self.google_breaker, settings.google_timeout_s
         if self.has_local and settings.environment != "production":
-            try:
-                # Load shared model if not already loaded
-                if self._phi3_model is None:
-                    logger.info("Loading shared Phi-3 model for local specialists")
-                    self._phi3_model = Llama(
-                        model_path=settings.llamacpp_chat_model_path,
-                        n_ctx=settings.llamacpp_n_ctx,
-                        n_batch=settings.llamacpp_n_batch,
-                        n_threads=settings.llamacpp_n_threads,
-                        temperature=settings.llamacpp_temperature,
-                        verbose=settings.debug
-                    )
-
-                specialist = LocalSpecialistPhi3Service(specialist_type, self._phi3_model)
-                logger.debug(f"Using local Phi-3 specialist: {specialist_type}")
-                return specialist
-            except Exception as e:
-                logger.error(f"Local specialist creation failed: {e}")
-                raise RuntimeError(f"Failed to create local specialist: {e}")
+            yield "Local", self._local_specialist, None, settings.local_timeout_s
+
+    async def _reachable(self, name: str) -> bool:
+        """
+        Cheap pre-flight for a cloud provider that failed recently.
+
+        A TCP connect to the provider's API host (cached for
+        settings.provider_probe_ttl_s) lets a plainly unreachable provider be
+        skipped instead of costing a full call timeout. Healthy providers and
+        proxied deployments are never probed.
+
+        Args:
+            name: Provider name
+
+        Returns:
+            False if the provider is known to be unreachable
+        """
+        host = self.PROVIDER_HOSTS.get(name)
+        entry = self._reachability.get(name)
+        if host is None or entry is None or settings.provider_probe_ttl_s <= 0:
+            return True
+        if "https" in urllib.request.getproxies():
+            return True
+
+        checked_at, reachable = entry
+        if time.monotonic() - checked_at < settings.provider_probe_ttl_s:
+            return reachable
+
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, 443),
+                settings.provider_probe_timeout_s
+            )
+            writer.close()
+            reachable = True
+        except (OSError, asyncio.TimeoutError):
+            reachable = False
+
+        self._reachability[name] = (time.monotonic(), reachable)
+        if not reachable:
+            logger.warning(f"{name} unreachable ({host}:443), skipping")
+        return reachable
+
+    def _mark_suspect(self, name: str) -> None:
+        """Require a reachability probe before the provider's next attempt."""
+        self._reachability[name] = (float("-inf"), False)
+
+    @staticmethod
+    async def _create(factory: Callable[[str], Any], specialist_type: str):
+        """Call a provider factory, awaiting it if it is async."""
+        specialist = factory(specialist_type)
+        if inspect.isawaitable(specialist):
+            specialist = await specialist
+        return specialist
+
+    @staticmethod
+    async def _call_with_timeout(
+            action: Callable[[Any], Awaitable[Any]],
+            specialist: Any,
+            timeout: float,
+            budget: Optional[float] = None
+    ) -> Any:
+        """
+        Run a non-streaming action under the provider's time limit.
+
+        A hung provider (black-holed connection, stalled queue) would otherwise
+        hold the request until the caller's overall timeout and the fallback
+        providers would never get a turn. Nothing arrives until the whole answer
+        is generated, so the stall timeout is extended by the time a full-length
+        answer takes at settings.min_output_tokens_per_s. A timeout is not
+        retried: the provider already had long enough for a complete answer.
+
+        Args:
+            action: Coroutine function applied to the specialist
+            specialist: Specialist instance
+            timeout: Stall timeout in seconds (0 = no limit)
+            budget: Seconds the call may take at most (None = no limit)
+
+        Returns:
+            Result of the action
 
-        # No specialists available
-        env_note = " (local not available in production)" if settings.environment == "production" else ""
-        raise RuntimeError(
+        Raises:
+            asyncio.TimeoutError: If the call timed out
+        """
+        limit = None
+        if timeout > 0:
+            limit = timeout
+            if settings.min_output_tokens_per_s > 0:
+                limit += settings.specialist_max_tokens / settings.min_output_tokens_per_s
+        if budget is not None:
+            limit = max(0.0, budget) if limit is None else min(limit, max(0.0, budget))
+        try:
+            return await asyncio.wait_for(action(specialist), limit)
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"no response within {limit:g}s")
+
+    def _unavailable_error(self, specialist_type: str) -> RuntimeError:
+        """Build the error raised when no provider could serve a request."""
+        env_note = ""
+        if settings.environment == "production":
+            env_note = " (local not available in production)"
+        return RuntimeError(
             f"No specialists available for {specialist_type}{env_note}. "
             f"Anthropic: {'circuit open' if self.anthropic_breaker.is_open() else 'unavailable'}, "
             f"Google: {'circuit open' if self.google_breaker.is_open() else 'unavailable'}, "
             f"Local: unavailable"
         )
 
+    async def _run_with_fallback(
+            self,
+            specialist_type: str,
+            action: Callable[[Any], Awaitable[Any]],
+            label: str,
+            record_success: bool = True
+    ) -> Any:
+        """
+        Run an action on the first provider that succeeds.
+
+        A cloud failure trips that provider's breaker and moves on; a local
+        failure is final. The caller gives up after settings.specialist_timeout,
+        so each cloud provider gets at most an equal share of what is left of
+        that budget, and the providers after it still get their turn.
+
+        Args:
+            specialist_type: Type of specialist
+            action: Coroutine function applied to the specialist instance
+            label: What is being attempted, for log messages
+            record_success: Whether success counts as a healthy breaker call
+
+        Returns:
+            Result of the action
+
+        Raises:
+            RuntimeError: If all specialists fail
+        """
+        providers = list(self._available_providers())
+        deadline = None
+        if settings.specialist_timeout > 0:
+            deadline = time.monotonic() + settings.specialist_timeout
+        for index, (name, factory, breaker, timeout) in enumerate(providers):
+            if not await self._reachable(name):
+                continue
+            budget = None
+            if breaker is not None and deadline is not None:
+                budget = (deadline - time.monotonic()) / (len(providers) - index)
+            specialist = None
+            try:
+                specialist = await self._create(factory, specialist_type)
+                result = await self._call_with_timeout(action, specialist, timeout, budget)
+            except Exception as e:
+                if breaker is None:
+                    try:
+                        fallback = await self._in_process_after_server_error(
+                            specialist, e, specialist_type
+                        )
+                        if fallback is not None:
+                            return await self._call_with_timeout(action, fallback, timeout)
+                    except Exception as retry_error:
+                        e = retry_error
+                    logger.error(f"Local {label} failed: {e}")
+                    raise RuntimeError(f"All specialists failed for {specialist_type}: {e}")
+                logger.warning(f"{name} {label} failed: {e}")
+                breaker.record_failure()
+                self._mark_suspect(name)
+                continue
+
+            if breaker is not None and record_success:
+                # No latency sample: a full generation's duration grows with the
+                # answer length, so only stream time-to-first-chunk is tracked
+                breaker.record_success()
+                self._reachability.pop(name, None)
+            logger.debug(f"Used {name} specialist: {specialist_type}")
+            return result
+
+        raise self._unavailable_error(specialist_type)
+
+    async def get_specialist(
+            self,
+            specialist_type: str
+    ) -> Union[
+        CloudSpecialistAnthropicService, CloudSpecialistGoogleService, 'LocalSpecialistPhi3Service'
+    ]:
+        """
+        Get best available specialist with cascading fallback.
+
+        Args:
+            specialist_type: Type of specialist needed
+
+        Returns:
+            Specialist service instance
+
+        Raises:
+            RuntimeError: If no specialists available
+        """
+        async def identity(specialist):
+            return specialist
+
+        # Creating an instance says nothing about provider health
+        return await self._run_with_fallback(
+            specialist_type, identity, "specialist creation", record_success=False
+        )
+
     async def execute_with_fallback(
             self,
             specialist_type: str,
@@ -158,51 +459,11 @@ class SpecialistManager:
         Raises:
             RuntimeError: If all specialists fail
         """
-        # Try Anthropic
-        if self.has_anthropic and not self.anthropic_breaker.is_open():
-            try:
-                specialist = CloudSpecialistAnthropicService(specialist_type)
-                response = await specialist.execute(message, context)
-                self.anthropic_breaker.record_success()
-                return response
-            except Exception as e:
-                logger.warning(f"Anthropic execution failed: {e}")
-                self.anthropic_breaker.record_failure()
-
-        # Try Google
-        if self.has_google and not self.google_breaker.is_open():
-            try:
-                specialist = CloudSpecialistGoogleService(specialist_type)
-                response = await specialist.execute(message, context)
-                self.google_breaker.record_success()
-                return response
-            except Exception as e:
-                logger.warning(f"Google execution failed: {e}")
-                self.google_breaker.record_failure()
-
-        # Try local (non-production only)
-        if self.has_local and settings.environment != "production":
-            try:
-                # Load shared model if not already loaded
-                if self._phi3_model is None:
-                    logger.info("Loading shared Phi-3 model for fallback")
-                    self._phi3_model = Llama(
-                        model_path=settings.llamacpp_chat_model_path,
-                        n_ctx=settings.llamacpp_n_ctx,
-                        n_batch=settings.llamacpp_n_batch,
-                        n_threads=settings.llamacpp_n_threads,
-                        temperature=settings.llamacpp_temperature,
-                        verbose=settings.debug
-                    )
-
-                specialist = LocalSpecialistPhi3Service(specialist_type, self._phi3_model)
-                response = await specialist.execute(message, context)
-                return response
-            except Exception as e:
-                logger.error(f"Local execution failed: {e}")
-                raise RuntimeError(f"All specialists failed for {specialist_type}")
-
-        raise RuntimeError("No specialists available")
+        return await self._run_with_fallback(
+            specialist_type,
+            lambda specialist: specialist.execute(message, context),
+            "execution"
+        )
 
     async def execute_stream_with_fallback(
             self,
@@ -224,54 +485,121 @@ class SpecialistManager:
         Raises:
             RuntimeError: If all specialists fail
         """
-        # Try Anthropic
-        if self.has_anthropic and not self.anthropic_breaker.is_open():
+        for name, factory, breaker, timeout in self._available_providers():
+            if not await self._reachable(name):
+                continue
+            # Cloud providers must start answering quickly or we move on while
+            # nothing has been sent; the local fallback gets its normal budget
+            first_timeout = settings.first_token_timeout_s if breaker is not None else timeout
+            sent = False
+            specialist = None
             try:
-                specialist = CloudSpecialistAnthropicService(specialist_type)
-                async for chunk in specialist.execute_stream(message, context):
-                    yield chunk
-                self.anthropic_breaker.record_success()
-                return  # Success, exit
+                specialist = await self._create(factory, specialist_type)
+                stream = specialist.execute_stream(message, context)
+                started = time.monotonic()
+                try:
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(
+                                stream.__anext__(),
+                                (timeout if sent else first_timeout) or None
+                            )
+                        except StopAsyncIteration:
+                            break
+                        if not sent and breaker is not None:
+                            # Time to first chunk is the latency users feel
+                            breaker.record_latency((time.monotonic() - started) * 1000)
+                        sent = True
+                        yield chunk
+                finally:
+                    await stream.aclose()
             except Exception as e:
-                logger.warning(f"Anthropic streaming failed: {e}")
-                self.anthropic_breaker.record_failure()
+                if isinstance(e, asyncio.TimeoutError):
+                    budget = timeout if sent else first_timeout
+                    e = RuntimeError(f"stream stalled for {budget:g}s")
+                if breaker is None:
+                    try:
+                        fallback = None
+                        if not sent:
+                            fallback = await self._in_process_after_server_error(
+                                specialist, e, specialist_type
+                            )
+                        if fallback is not None:
+                            async for chunk in fallback.execute_stream(message, context):
+                                yield chunk
+                            return
+                    except Exception as retry_error:
+                        e = retry_error
+                    logger.error(f"Local streaming failed: {e}")
+                    raise RuntimeError(f"All specialists failed for {specialist_type}: {e}")
+                logger.warning(f"{name} streaming failed: {e}")
+                breaker.record_failure()
+                self._mark_suspect(name)
+                if sent:
+                    # Chunks already reached the caller; another provider would
+                    # start a second, different answer after them
+                    raise RuntimeError(f"{name} stream failed mid-response: {e}")
+                continue
+
+            if breaker is not None:
+                breaker.record_success()
+                self._reachability.pop(name, None)
+            return  # Success, exit
+
+        raise self._unavailable_error(specialist_type)
+
+    def prewarm_local(self) -> None:
+        """
+        Probe the llama-server and start loading the Phi-3 fallback model in the background.
 
-        # Try Google
-        if self.has_google and not self.google_breaker.is_open():
-            try:
-                specialist = CloudSpecialistGoogleService(specialist_type)
-                async for chunk in specialist.execute_stream(message, context):
-                    yield chunk
-                self.google_breaker.record_success()
-                return  # Success, exit
-            except Exception as e:
-                logger.warning(f"Google streaming failed: {e}")
-                self.google_breaker.record_failure()
+        The model is otherwise loaded on the first fallback, i.e. when both
+        cloud providers are already failing. Must be called from the event loop.
+        """
+        if self._phi3_preload is not None or self._phi3_model is not None:
+            return
+        load_model = self.has_local_model and settings.preload_local_specialist
+        if not (self.llama_server_enabled or load_model):
+            return
 
-        # Try local (non-production only)
-        if self.has_local and settings.environment != "production":
-            try:
-                # Load shared model if not already loaded
-                if self._phi3_model is None:
-                    logger.info("Loading shared Phi-3 model for streaming fallback")
-                    self._phi3_model = Llama(
-                        model_path=settings.llamacpp_chat_model_path,
-                        n_ctx=settings.llamacpp_n_ctx,
-                        n_batch=settings.llamacpp_n_batch,
-                        n_threads=settings.llamacpp_n_threads,
-                        temperature=settings.llamacpp_temperature,
-                        verbose=settings.debug
-                    )
-
-                specialist = LocalSpecialistPhi3Service(specialist_type, self._phi3_model)
-                async for chunk in specialist.execute_stream(message, context):
-                    yield chunk
-                return  # Success, exit
-            except Exception as e:
-                logger.error(f"Local streaming failed: {e}")
-                raise RuntimeError(f"All specialists failed for {specialist_type}")
+        async def preload():
+            # A running llama-server already holds the model
+            if not await self._llama_server_up() and load_model:
+                await self._ensure_phi3()
+
+        def log_failure(task: asyncio.Future) -> None:
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning(f"Phi-3 preload failed: {task.exception()}")
+
+        self._phi3_preload = asyncio.ensure_future(preload())
+        self._phi3_preload.add_done_callback(log_failure)
+
+    async def prewarm_anthropic(self) -> None:
+        """
+        Open a connection to Anthropic before the first chat turn.
 
-        raise RuntimeError("No specialists available for streaming")
+        Builds the shared client and issues a cheap models listing so the
+        TLS connection is pooled before user traffic arrives.
+        """
+        if not self.has_anthropic:
+            return
+
+        client = get_anthropic_client()
+        await client.models.list(limit=1)
+        logger.info("Anthropic client prewarmed")
+
+    async def prewarm_google(self) -> None:
+        """
+        Open a connection to Google before the first chat turn.
+
+        Configures the SDK and fetches the model metadata so the underlying
+        channel is established before user traffic arrives.
+        """
+        if not self.has_google:
+            return
+
+        configure_client(settings.google_api_key)
+        await asyncio.to_thread(genai.get_model, f"models/{settings.google_model}")
+        logger.info("Google client prewarmed")
 
     def get_status(self) -> dict:
         """Get status of all providers."""
@@ -287,10 +615,17 @@ class SpecialistManager:
             "local": {
                 "available": self.has_local,
                 "model_loaded": self._phi3_model is not None,
+                "via_server": bool(self._llama_server_state and self._llama_server_state[1]),
                 "environment": settings.environment
             }
         }
 
+    def reset_caches(self):
+        """Drop cached specialist instances (e.g. after an API key or model change)."""
+        self._anthropic_specialists.clear()
+        self._google_specialists.clear()
+        logger.info("Specialist caches reset")
+
     def reset_circuit_breakers(self):
         """Manually reset all circuit breakers."""
         self.anthropic_breaker.reset()
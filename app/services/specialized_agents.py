@@ -1,7 +1,8 @@
 """
 Specialized agent factory for creating ADK agents.
 """
-from typing import Optional, List
+from functools import lru_cache, wraps
+from typing import Callable, Dict, Optional, List
 from google.adk.agents import LlmAgent
 from google.adk.models.lite_llm import LiteLlm
 
@@ -12,6 +13,38 @@ from app.services.rag_anthropic import RAGAnthropicService
 from app.services.rag_google import RAGGoogleService
 
 
+@lru_cache(maxsize=16)
+def _build_litellm(model: str, api_base: Optional[str] = None, api_key: Optional[str] = None) -> LiteLlm:
+    """
+    Build a LiteLlm model, shared by every agent on the same backend.
+
+    Args:
+        model: LiteLLM model string
+        api_base: Server URL for OpenAI-compatible backends
+        api_key: API key for the backend
+
+    Returns:
+        Cached LiteLlm instance
+    """
+    kwargs = {"supports_function_calling": True}
+    if api_base:
+        kwargs["api_base"] = api_base
+        kwargs["api_key"] = api_key
+    return LiteLlm(model=model, **kwargs)
+
+
+def _cached_agent(create: Callable[..., LlmAgent]) -> Callable[..., LlmAgent]:
+    """Build an agent once per factory and return the same instance afterwards."""
+    @wraps(create)
+    def wrapper(self) -> LlmAgent:
+        agent = self._agents.get(create.__name__)
+        if agent is None:
+            agent = create(self)
+            self._agents[create.__name__] = agent
+        return agent
+    return wrapper
+
+
 class SpecializedAgentsFactory:
     """Factory for creating specialized agents."""
 
@@ -25,6 +58,9 @@ class SpecializedAgentsFactory:
         self.rag_anthropic_service = rag_anthropic_service
         self.rag_google_service = rag_google_service
 
+        # Agents keyed by factory method; tools and models never change after init
+        self._agents: Dict[str, LlmAgent] = {}
+
         # Create models
         self.phi3_model = self._create_phi3_model()
         self.mistral_model = self._create_mistral_model()
@@ -42,36 +78,29 @@ class SpecializedAgentsFactory:
         """Create phi3mini model instance (fast, for most agents)."""
         if settings.provider_type == "ollama":
             logger.info("Creating Phi-3 model via Ollama")
-            return LiteLlm(
-                model="ollama_chat/phi3:mini",
-                supports_function_calling=True
-            )
+            return _build_litellm("ollama_chat/phi3:mini")
         else:  # llamacpp
             logger.info(f"Creating Phi-3 model via llama-server on port {settings.llama_server_port}")
-            return LiteLlm(
-                model="openai/phi3-fast",
+            return _build_litellm(
+                "openai/phi3-fast",
                 api_base=f"http://{settings.llama_server_host}:{settings.llama_server_port}/v1",
-                api_key="dummy",
-                supports_function_calling=True
+                api_key="dummy"
             )
 
     def _create_mistral_model(self) -> LiteLlm:
         """Create mistral7b model instance (slower, for complex reasoning)."""
         if settings.provider_type == "ollama":
             logger.info("Creating Mistral-7B model via Ollama")
-            return LiteLlm(
-                model="ollama_chat/mistral",
-                supports_function_calling=True
-            )
+            return _build_litellm("ollama_chat/mistral")
         else:  # llamacpp
             logger.info(f"Creating Mistral-7B model via llama-server on port {settings.llama_server_mistral_port}")
-            return LiteLlm(
-                model="openai/mistral-smart",
+            return _build_litellm(
+                "openai/mistral-smart",
                 api_base=f"http://{settings.llama_server_host}:{settings.llama_server_mistral_port}/v1",
-                api_key="dummy",
-                supports_function_calling=True
+                api_key="dummy"
             )
 
+    @_cached_agent
     def create_code_validation_agent(self) -> LlmAgent:
         """
         Create agent specialized in code syntax validation.
@@ -94,6 +123,7 @@ Be direct and helpful. Only validate syntax - do not generate or modify code."""
             tools=[validate_code]
         )
 
+    @_cached_agent
     def create_rag_query_agent(self) -> LlmAgent:
         """
         Create agent specialized in knowledge base queries.
@@ -128,6 +158,7 @@ Always cite information when using the knowledge base.""",
             tools=self.rag_tools
         )
 
+    @_cached_agent
     def create_code_generation_agent(self) -> LlmAgent:
         """
         Create agent specialized in generating new code.
@@ -151,6 +182,7 @@ Keep code simple and maintainable. Focus on correctness and clarity.""",
             tools=[validate_code]
         )
 
+    @_cached_agent
     def create_code_analysis_agent(self) -> LlmAgent:
         """
         Create agent specialized in analyzing and explaining code.
@@ -176,6 +208,7 @@ Be thorough but clear. Focus on helping the user understand the code.""",
             tools=all_tools
         )
 
+    @_cached_agent
     def create_complex_reasoning_agent(self) -> LlmAgent:
         """
         Create agent specialized in complex, multi-step reasoning.
@@ -203,6 +236,7 @@ Take your time to think through complex problems thoroughly.""",
             tools=all_tools
         )
 
+    @_cached_agent
     def create_general_chat_agent(self) -> LlmAgent:
         """
         Create agent for general conversation.
@@ -230,6 +264,8 @@ You don't have access to tools - rely on your training for answers.""",
         """
         Create all 6 specialized agents.
 
+        Each agent is built once per factory; repeated calls return the same instances.
+
         Returns:
             List of LlmAgent instances
         """
@@ -0,0 +1,82 @@
+"""
+Bounded in-memory cache whose entries expire after a TTL.
+"""
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Thread-safe dict cache with per-entry expiry and a size bound.
+
+    The TTL is passed on each call so callers can keep reading it from
+    settings. When the cache grows past max_entries, expired entries are
+    pruned first and then the oldest ones.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept
+        """
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, ttl_seconds: float) -> Optional[Any]:
+        """
+        Look up a value.
+
+        Args:
+            key: Cache key
+            ttl_seconds: Seconds an entry stays valid
+
+        Returns:
+            Stored value, or None if missing or expired
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None
+
+            stored_at, value = cached
+            if time.monotonic() - stored_at >= ttl_seconds:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float):
+        """
+        Store a value, pruning expired and oldest entries when full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Seconds an entry stays valid (0 or less stores nothing)
+        """
+        if ttl_seconds <= 0:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now, value)
+
+            if len(self._entries) > self.max_entries:
+                self._entries = {
+                    k: entry for k, entry in self._entries.items()
+                    if now - entry[0] < ttl_seconds
+                }
+                # Still full of live entries - drop the oldest (dicts keep insertion order)
+                while len(self._entries) > self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
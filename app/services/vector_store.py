@@ -1,21 +1,87 @@
 """
 Vector store service for managing document embeddings and retrieval.
 """
-from typing import List, Optional, Tuple, Dict, Any, TYPE_CHECKING
+from typing import Iterator, List, Optional, Tuple, Dict, Any, TYPE_CHECKING
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
+import base64
+import hashlib
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
 import time
-import json
 
 # Conditional imports - only loaded when actually used (not in cloud mode)
 if TYPE_CHECKING:
     from langchain_chroma import Chroma
 
-from langchain_community.document_loaders import PyPDFDirectoryLoader, CSVLoader
+import numpy as np
+import orjson
+from langchain_community.document_loaders import CSVLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
 
 from config import settings, logger
 from app.core.providers import ProviderFactory
+from app.services.disk_cache import open_disk_cache
+from app.services.embedding_batcher import CoalescingEmbeddings
+from app.services.pdf_loader import load_pdf
+
+
+# Read buffer for JSONL files, large enough to keep syscalls off the parse loop
+JSONL_READ_BUFFER = 1 << 20
+# Fields holding a JSONL record's text, in order of preference
+JSON_TEXT_FIELDS = ('text', 'content', 'body', 'message', 'description', 'summary')
+# Longer queries (e.g. whole prompts) are unlikely to repeat and are not cached
+SEARCH_CACHE_MAX_QUERY_CHARS = 1024
+
+
+@lru_cache(maxsize=4096)
+def source_name(source: str) -> str:
+    """
+    Get the display name (basename) of a document source path.
+
+    Args:
+        source: Source path from document metadata
+
+    Returns:
+        File name used when citing the source
+    """
+    return os.path.basename(source)
+
+
+def pack_embedding(embedding: List[float]) -> str:
+    """
+    Encode an embedding as base64 float16 for persistent caching.
+
+    Half precision keeps relative error around 0.1% at a quarter of the
+    size of JSON floats.
+
+    Args:
+        embedding: Embedding vector
+
+    Returns:
+        Base64 string of the float16 bytes
+    """
+    return base64.b64encode(np.asarray(embedding, dtype=np.float16).tobytes()).decode("ascii")
+
+
+def unpack_embedding(packed: str) -> List[float]:
+    """
+    Decode an embedding stored by pack_embedding.
+
+    Args:
+        packed: Base64 string of float16 bytes
+
+    Returns:
+        Embedding vector as float32 values
+    """
+    return np.frombuffer(base64.b64decode(packed), dtype=np.float16).astype(np.float32).tolist()
 
 
 class VectorStoreService:
@@ -30,6 +96,16 @@ class VectorStoreService:
         """
         provider_type = provider_type or settings.provider_type
 
+        # Retrievers reused per k; dropped whenever the underlying store is replaced
+        self._retrievers: Dict[int, Any] = {}
+        self._retrievers_store = None
+        self._embedding_cache = None
+
+        # Exact-match search results; dropped when documents are added or the store is replaced
+        self._search_cache: "OrderedDict[Tuple[str, int], List[Document]]" = OrderedDict()
+        self._search_cache_store = None
+        self._search_cache_lock = threading.Lock()
+
         # Cloud mode - no local vector store
         if provider_type == 'cloud':
             logger.info("Cloud mode: vector store disabled")
@@ -67,6 +143,23 @@ class VectorStoreService:
 
         # Get embeddings from provider
         self.embeddings = self.provider.get_embedding_provider().get_embeddings()
+        if provider_type == 'ollama' and settings.query_embed_window_ms > 0:
+            # Concurrent retrievals (e.g. parallel agent tool calls) share one embedding request
+            self.embeddings = CoalescingEmbeddings(
+                self.embeddings,
+                window_ms=settings.query_embed_window_ms,
+                max_batch=settings.query_embed_batch_size
+            )
+        # Chunk embeddings by content, so a rebuilt store need not re-embed.
+        # Kept out of vector_store_dir, whose contents mean "a store exists".
+        self._embedding_cache = open_disk_cache(
+            "embeddings",
+            default_dir=settings.base_dir / "cache"
+        ) if settings.embedding_cache_enabled else None
+        self._embedding_model_id = provider_type + "\0" + (
+            settings.embedding_model if provider_type == 'ollama'
+            else settings.llamacpp_embedding_model_path
+        )
         self.vectorstore: Optional[Chroma] = None
         self._initialize()
 
@@ -108,7 +201,11 @@ class VectorStoreService:
 
     def _store_exists(self) -> bool:
         """Check if vector store exists."""
-        return settings.vector_store_dir.exists() and any(settings.vector_store_dir.iterdir())
+        store_dir = settings.vector_store_dir
+        # Chroma >= 0.4 keeps its manifest here - one stat instead of a listing
+        if (store_dir / "chroma.sqlite3").is_file():
+            return True
+        return store_dir.exists() and any(store_dir.iterdir())
 
     def _load_csv_files(self, directory: Path) -> List[Document]:
         """
@@ -159,14 +256,14 @@ class VectorStoreService:
 
         for jsonl_file in jsonl_files:
             try:
-                with open(jsonl_file, 'r', encoding='utf-8') as f:
+                # Raw bytes straight into orjson; it skips surrounding whitespace itself
+                with open(jsonl_file, 'rb', buffering=JSONL_READ_BUFFER) as f:
                     for line_num, line in enumerate(f, 1):
-                        line = line.strip()
-                        if not line:
+                        if line.isspace():
                             continue
 
                         try:
-                            data = json.loads(line)
+                            data = orjson.loads(line)
                             text = self._extract_text_from_json(data)
 
                             if text:
@@ -179,7 +276,7 @@ class VectorStoreService:
                                     }
                                 )
                                 docs.append(doc)
-                        except json.JSONDecodeError as e:
+                        except orjson.JSONDecodeError as e:
                             logger.warning(f"Invalid JSON at line {line_num} in {jsonl_file.name}: {e}")
                             continue
 
@@ -200,38 +297,113 @@ class VectorStoreService:
         Returns:
             Extracted text content
         """
-        text_fields = ['text', 'content', 'body', 'message', 'description', 'summary']
+        # Called once per JSONL record; parsed JSON only holds exact builtin
+        # types, so type() identity checks stand in for isinstance()
+        for field in JSON_TEXT_FIELDS:
+            value = data.get(field)
+            if type(value) is str:
+                return value
+
+        return "\n".join(
+            f"{key}: {value}" if type(value) is str else f"{key}: {orjson.dumps(value).decode()}"
+            for key, value in data.items()
+            if (type(value) is str and value and not value.isspace()) or type(value) in (list, dict)
+        )
+
+    def _iter_pdf_files(self, directory: Path) -> Iterator[Document]:
+        """
+        Load PDF pages from a directory tree, parsing files in worker processes.
 
-        for field in text_fields:
-            if field in data and isinstance(data[field], str):
-                return data[field]
+        pypdf is pure Python and CPU-bound, so files are fanned out over
+        settings.pdf_loader_workers processes. Only a couple of files per
+        worker are in flight at once, and pages are yielded in file order.
 
-        text_parts = []
-        for key, value in data.items():
-            if isinstance(value, str) and value.strip():
-                text_parts.append(f"{key}: {value}")
-            elif isinstance(value, (list, dict)):
-                text_parts.append(f"{key}: {json.dumps(value)}")
+        Args:
+            directory: Directory containing PDF files
 
-        return "\n".join(text_parts)
+        Yields:
+            Document per PDF page
+        """
+        pdf_files = [str(p) for p in sorted(directory.rglob("*.pdf")) if not p.name.startswith('.')]
+        workers = min(settings.pdf_loader_workers or os.cpu_count() or 1, len(pdf_files))
+
+        if workers <= 1:
+            for pdf_file in pdf_files:
+                try:
+                    pages = load_pdf(pdf_file)
+                except Exception as e:
+                    logger.error(f"Error loading PDF file {Path(pdf_file).name}: {e}")
+                    continue
+                yield from pages
+            return
 
-    def _load_pdf_files(self, directory: Path) -> List[Document]:
+        # spawn: forking a process that already runs threads (and Chroma) is unsafe
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        try:
+            remaining = iter(pdf_files)
+            pending = deque(
+                (pdf_file, executor.submit(load_pdf, pdf_file))
+                for pdf_file in itertools.islice(remaining, 2 * workers)
+            )
+            while pending:
+                pdf_file, future = pending.popleft()
+                next_file = next(remaining, None)
+                if next_file is not None:
+                    pending.append((next_file, executor.submit(load_pdf, next_file)))
+                try:
+                    pages = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error loading PDF file {Path(pdf_file).name}: {e}")
+                    continue
+                yield from pages
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _iter_documents(self, directory: Path, file_types: List[str]) -> Iterator[Document]:
         """
-        Load PDF files from a directory.
+        Yield documents of the requested types; each type is loaded only when reached.
 
         Args:
-            directory: Directory containing PDF files
+            directory: Directory containing documents
+            file_types: File types to load
 
-        Returns:
-            List of Document objects
+        Yields:
+            Document objects
         """
-        loader = PyPDFDirectoryLoader(str(directory))
-        docs = loader.load()
+        if 'pdf' in file_types:
+            yield from self._iter_pdf_files(directory)
+        if 'csv' in file_types:
+            yield from self._load_csv_files(directory)
+        if 'jsonl' in file_types:
+            yield from self._load_jsonl_files(directory)
 
-        if docs:
-            logger.info(f"Loaded {len(docs)} PDF document(s)")
+    def _prepare_store(self, overwrite: bool) -> None:
+        """
+        Open the vector store that ingested chunks are added to.
 
-        return docs
+        Args:
+            overwrite: Whether to start a new store instead of loading the existing one
+        """
+        if overwrite or not self._store_exists():
+            # Import Chroma only when actually needed
+            from langchain_chroma import Chroma
+
+            logger.info("Creating new vector store with optimized index settings...")
+            self.vectorstore = Chroma(
+                embedding_function=self.embeddings,
+                collection_name=settings.collection_name,
+                persist_directory=str(settings.vector_store_dir),
+                collection_metadata=self._get_collection_metadata()
+            )
+        else:
+            logger.info("Adding documents to existing vector store...")
+            if self.vectorstore is None:
+                self._initialize()
 
     def ingest_documents(
         self,
@@ -242,6 +414,10 @@ class VectorStoreService:
         """
         Ingest documents (PDF, CSV, JSONL) into the vector store.
 
+        Documents are loaded and split on a background thread and handed over
+        through a bounded queue, so only a few batches of chunks are held in
+        memory and file parsing overlaps with embedding.
+
         Args:
             directory: Directory containing documents (defaults to settings.data_dir)
             file_types: List of file types to ingest (e.g., ['pdf', 'csv', 'jsonl'])
@@ -263,67 +439,196 @@ class VectorStoreService:
         logger.info(f"Loading documents from '{data_dir}'...")
         logger.info(f"File types: {', '.join(file_types)}")
 
-        all_docs = []
-        filenames = []
-
-        if 'pdf' in file_types:
-            pdf_docs = self._load_pdf_files(data_dir)
-            all_docs.extend(pdf_docs)
-            if pdf_docs:
-                pdf_files = list(set([Path(doc.metadata.get('source', '')).name for doc in pdf_docs]))
-                filenames.extend(pdf_files)
-
-        if 'csv' in file_types:
-            csv_docs = self._load_csv_files(data_dir)
-            all_docs.extend(csv_docs)
-            if csv_docs:
-                csv_files = list(set([Path(doc.metadata.get('source', '')).name for doc in csv_docs]))
-                filenames.extend(csv_files)
-
-        if 'jsonl' in file_types:
-            jsonl_docs = self._load_jsonl_files(data_dir)
-            all_docs.extend(jsonl_docs)
-            if jsonl_docs:
-                jsonl_files = list(set([Path(doc.metadata.get('source', '')).name for doc in jsonl_docs]))
-                filenames.extend(jsonl_files)
-
-        if not all_docs:
-            logger.warning("No documents found to ingest")
-            return 0, 0, []
-
-        logger.info(f"Loaded {len(all_docs)} total document(s)")
-
-        logger.info("Splitting documents into chunks...")
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=settings.chunk_size,
             chunk_overlap=settings.chunk_overlap
         )
-        splits = text_splitter.split_documents(all_docs)
-        logger.info(f"Created {len(splits)} text chunks")
+        # One group keeps every concurrent embedding request busy
+        group_size = max(1, settings.embed_batch_size) * max(1, settings.embed_concurrency)
+        chunks: queue.Queue = queue.Queue(maxsize=2 * group_size)
+        stop = threading.Event()
+        done = object()
+        num_docs = 0
+        filenames: Dict[str, None] = {}
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            nonlocal num_docs
+            try:
+                for doc in self._iter_documents(data_dir, file_types):
+                    num_docs += 1
+                    filenames.setdefault(source_name(str(doc.metadata.get('source', ''))))
+                    for chunk in text_splitter.split_documents([doc]):
+                        if not put(chunk):
+                            return
+                put(done)
+            except Exception as e:
+                put(e)
 
-        if overwrite or not self._store_exists():
-            # Import Chroma only when actually needed
-            from langchain_chroma import Chroma
+        producer = threading.Thread(target=produce, name="ingest-loader", daemon=True)
+        producer.start()
 
-            logger.info("Creating new vector store with optimized index settings...")
-            self.vectorstore = Chroma.from_documents(
-                documents=splits,
-                embedding=self.embeddings,
-                collection_name=settings.collection_name,
-                persist_directory=str(settings.vector_store_dir),
-                collection_metadata=self._get_collection_metadata()
-            )
-        else:
-            logger.info("Adding documents to existing vector store...")
-            if self.vectorstore is None:
-                self._initialize()
-            self.vectorstore.add_documents(splits)
+        num_chunks = 0
+        num_added = 0
+        batch: List[Document] = []
+        try:
+            while True:
+                item = chunks.get()
+                if item is not done and not isinstance(item, Exception):
+                    batch.append(item)
+                if batch and (len(batch) >= group_size or item is done):
+                    if num_chunks == 0:
+                        self._prepare_store(overwrite)
+                    num_added += self._add_splits(batch)
+                    num_chunks += len(batch)
+                    batch = []
+                if isinstance(item, Exception):
+                    raise item
+                if item is done:
+                    break
+        finally:
+            stop.set()
+            producer.join()
+
+        if num_chunks == 0:
+            logger.warning("No documents found to ingest")
+            return 0, 0, []
 
         duration = time.time() - start_time
         count = self.vectorstore._collection.count()
+        logger.info(
+            f"Loaded {num_docs} total document(s), created {num_chunks} text chunks "
+            f"({num_added} new)"
+        )
         logger.info(f"✅ Ingestion complete in {duration:.2f}s. Total embeddings: {count}")
 
-        return len(all_docs), len(splits), filenames
+        return num_docs, num_chunks, list(filenames)
+
+    @staticmethod
+    def _chunk_id(doc: Document) -> str:
+        """Content-addressed ID for a chunk, scoped to its source so citations stay per file."""
+        key = f"{doc.metadata.get('source', '')}\0{doc.page_content}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, reusing persisted embeddings for content seen before.
+
+        Args:
+            texts: Chunk texts
+
+        Returns:
+            One embedding per text
+        """
+        cache = self._embedding_cache
+        if cache is None:
+            return self.embeddings.embed_documents(texts)
+
+        keys = [f"fp16\0{self._embedding_model_id}\0{text}" for text in texts]
+        embeddings = [unpack_embedding(e) if e is not None else None for e in cache.get_many(keys)]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            fresh = self.embeddings.embed_documents([texts[i] for i in missing])
+            for i, embedding in zip(missing, fresh):
+                embeddings[i] = embedding
+            cache.set_many([(keys[i], pack_embedding(embeddings[i])) for i in missing])
+        return embeddings
+
+    @staticmethod
+    def _pack_batches(chunks: List[Tuple[str, Document]]) -> List[List[Tuple[str, Document]]]:
+        """
+        Group chunks of similar length into embedding batches.
+
+        Chunks are sorted by an estimated token count (about 4 bytes per
+        token) and packed greedily, so a batch is not padded out to one long
+        outlier. A batch holds at most settings.embed_batch_size chunks and
+        settings.embed_batch_tokens estimated tokens.
+
+        Args:
+            chunks: (chunk_id, document) pairs
+
+        Returns:
+            Batches of (chunk_id, document) pairs
+        """
+        batch_size = max(1, settings.embed_batch_size)
+        max_tokens = settings.embed_batch_tokens
+
+        def tokens(chunk: Tuple[str, Document]) -> int:
+            return len(chunk[1].page_content.encode("utf-8")) // 4 + 1
+
+        batches: List[List[Tuple[str, Document]]] = []
+        batch: List[Tuple[str, Document]] = []
+        batch_tokens = 0
+        for chunk in sorted(chunks, key=tokens):
+            size = tokens(chunk)
+            if batch and (len(batch) >= batch_size or (max_tokens and batch_tokens + size > max_tokens)):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(chunk)
+            batch_tokens += size
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _add_splits(self, splits: List[Document]) -> int:
+        """
+        Embed new chunks in concurrent batches and bulk-add them to the collection.
+
+        Chunks already stored (same source and content) are skipped, so
+        re-ingesting a directory only embeds what changed. Each length-bucketed
+        batch is one embedding request; up to settings.embed_concurrency requests are in
+        flight, so ingestion is bound by the embedding model rather than by
+        HTTP round-trips.
+
+        Args:
+            splits: Chunked documents to store
+
+        Returns:
+            Number of chunks added
+        """
+        collection = self.vectorstore._collection
+        chunks = {self._chunk_id(doc): doc for doc in splits}
+        existing = set(collection.get(ids=list(chunks), include=[])["ids"])
+        new_chunks = [(chunk_id, doc) for chunk_id, doc in chunks.items() if chunk_id not in existing]
+        if not new_chunks:
+            logger.info(f"All {len(splits)} chunks already stored")
+            return 0
+
+        batches = self._pack_batches(new_chunks)
+
+        def embed(batch: List[Tuple[str, Document]]) -> List[List[float]]:
+            return self._embed_batch([doc.page_content for _, doc in batch])
+
+        with ThreadPoolExecutor(
+                max_workers=max(1, settings.embed_concurrency),
+                thread_name_prefix="embed"
+        ) as executor:
+            # map() yields in order, so each batch is stored as soon as it is ready.
+            # Upsert keeps a resumed or concurrent ingest idempotent on chunk IDs.
+            for batch, embeddings in zip(batches, executor.map(embed, batches)):
+                collection.upsert(
+                    ids=[chunk_id for chunk_id, _ in batch],
+                    embeddings=embeddings,
+                    documents=[doc.page_content for _, doc in batch],
+                    metadatas=[doc.metadata or None for _, doc in batch]
+                )
+
+        with self._search_cache_lock:
+            self._search_cache.clear()
+
+        logger.info(
+            f"Embedded {len(new_chunks)} new chunks in {len(batches)} batch(es), "
+            f"{len(splits) - len(new_chunks)} already stored"
+        )
+        return len(new_chunks)
 
     def ingest_pdfs(
         self,
@@ -363,15 +668,54 @@ class VectorStoreService:
             return []
 
         k = k or settings.retrieval_k
+        key = (query.strip(), k)
+        cacheable = settings.search_cache_size > 0 and len(query) < SEARCH_CACHE_MAX_QUERY_CHARS
+
+        if cacheable:
+            with self._search_cache_lock:
+                if self._search_cache_store is not self.vectorstore:
+                    self._search_cache.clear()
+                    self._search_cache_store = self.vectorstore
+                cached = self._search_cache.get(key)
+                if cached is not None:
+                    self._search_cache.move_to_end(key)
+                    return list(cached)
 
         try:
             results = self.vectorstore.similarity_search(query, k=k)
             logger.debug(f"Retrieved {len(results)} documents for query: '{query}'")
-            return results
         except Exception as e:
             logger.error(f"Error during similarity search: {e}")
             return []
 
+        if cacheable:
+            with self._search_cache_lock:
+                self._search_cache[key] = list(results)
+                self._search_cache.move_to_end(key)
+                while len(self._search_cache) > settings.search_cache_size:
+                    self._search_cache.popitem(last=False)
+
+        return results
+
+    def search_by_vector(self, embedding: List[float], k: Optional[int] = None) -> List[Document]:
+        """
+        Perform similarity search with an already computed query embedding.
+
+        Args:
+            embedding: Query embedding
+            k: Number of results (defaults to settings.retrieval_k)
+
+        Returns:
+            List of relevant documents
+
+        Raises:
+            ValueError: If the vector store is not initialized
+        """
+        if self.vectorstore is None:
+            raise ValueError("Vector store not initialized. Run ingestion first.")
+
+        return self.vectorstore.similarity_search_by_vector(embedding, k=k or settings.retrieval_k)
+
     def get_retriever(self, k: Optional[int] = None):
         """
         Get a retriever instance.
@@ -385,8 +729,16 @@ class VectorStoreService:
         if self.vectorstore is None:
             raise ValueError("Vector store not initialized. Run ingestion first.")
 
+        if self._retrievers_store is not self.vectorstore:
+            self._retrievers = {}
+            self._retrievers_store = self.vectorstore
+
         k = k or settings.retrieval_k
-        return self.vectorstore.as_retriever(search_kwargs={"k": k})
+        retriever = self._retrievers.get(k)
+        if retriever is None:
+            retriever = self.vectorstore.as_retriever(search_kwargs={"k": k})
+            self._retrievers[k] = retriever
+        return retriever
 
     def get_collection(self):
         """
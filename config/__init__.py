@@ -1,5 +1,11 @@
 """Config package."""
+import os
+
 from config.settings import settings
 from config.logging_config import logger
 
+# litellm reads this when it is first imported; set once instead of flipping
+# the deprecated litellm.set_verbose global per provider
+os.environ.setdefault("LITELLM_LOG", "DEBUG" if settings.debug else "WARNING")
+
 __all__ = ['settings', 'logger']
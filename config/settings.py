@@ -39,7 +39,22 @@ class Settings:
     collection_name: str = "adk_local_rag"
     chunk_size: int = 1024
     chunk_overlap: int = 100
+    embed_batch_size: int = 64  # Chunks embedded per request during ingestion
+    embed_batch_tokens: int = 8192  # Estimated tokens per embedding request (0 = no cap)
+    embed_concurrency: int = 4  # Embedding requests in flight during ingestion
+    pdf_loader_workers: int = 0  # Processes parsing PDFs during ingestion (0 = CPU count, 1 = in-process)
     retrieval_k: int = 3
+    search_cache_size: int = 256  # Cached vector store searches by exact query (0 disables)
+    query_embed_window_ms: float = 5.0  # Concurrent query embeddings within this window share one request (0 disables)
+    query_embed_batch_size: int = 16  # Queries that flush a window early
+    rag_answer_cache_ttl: int = 600  # seconds to reuse answers for the same question and documents (0 disables)
+    semantic_cache_size: int = 1024  # Cloud RAG answers cached by question embedding
+    semantic_cache_ttl: int = 300  # seconds a semantically cached answer stays valid (0 disables)
+    semantic_cache_threshold: float = 0.85  # Minimum question cosine similarity for a cache hit
+    rag_retriever_workers: int = 8  # Threads for cloud RAG retrieval (caps concurrent vector store calls)
+    persistent_cache_dir: Optional[str] = None  # SQLite caches for routing/RAG answers across restarts (unset disables)
+    persistent_cache_ttl: int = 7 * 86400  # seconds a persisted entry stays valid
+    embedding_cache_enabled: bool = True  # persist chunk embeddings (in base_dir/cache unless persistent_cache_dir is set)
 
     # ChromaDB Performance Settings
     chroma_hnsw_space: str = "cosine"
@@ -63,6 +78,10 @@ class Settings:
     llamacpp_n_threads: Optional[int] = None
     llamacpp_temperature: float = 0.7
     llamacpp_max_tokens: int = 512
+    llamacpp_prompt_cache_bytes: int = 256 * 1024 * 1024  # KV state cache for shared prompt prefixes (0 disables)
+    llamacpp_n_gpu_layers: int = 0  # Layers offloaded to GPU (-1 for all)
+    llamacpp_use_mmap: bool = True  # Map GGUF weights instead of copying them into memory
+    llamacpp_use_mlock: bool = True  # Pin mmapped weights in RAM (llama.cpp warns and continues if the memlock ulimit is too low)
 
     # llama-server Configuration (Dual Model Support)
     llama_server_host: str = "127.0.0.1"
@@ -78,22 +97,44 @@ class Settings:
     # Specialist Fallback Configuration
     cloud_retry_attempts: int = 3
     enable_local_fallback: bool = True
+    preload_local_specialist: bool = True  # Load the Phi-3 fallback model in the background at startup
+    local_specialist_via_server: bool = True  # Use the running Phi-3 llama-server for local specialists instead of loading the model in-process
     circuit_breaker_failure_threshold: int = 5
     circuit_breaker_timeout: int = 60  # seconds
+    circuit_breaker_latency_ms: float = 15000.0  # p95 time to first streamed chunk that opens a provider's circuit (0 disables)
+    specialist_timeout: int = 60  # seconds per specialist call
+    anthropic_timeout_s: float = 20.0  # seconds Anthropic may stall before falling back (0 = no limit)
+    google_timeout_s: float = 20.0  # seconds Google may stall before falling back (0 = no limit)
+    local_timeout_s: float = 0.0  # seconds local Phi-3 may stall (0 = bounded only by specialist_timeout)
+    specialist_max_tokens: int = 2048  # output cap for cloud specialist answers
+    min_output_tokens_per_s: float = 25.0  # slowest healthy cloud output rate; a non-streaming call may take its stall timeout plus specialist_max_tokens at this rate
+    first_token_timeout_s: float = 10.0  # seconds a cloud stream may take to start before falling back (0 = no limit)
+    provider_probe_ttl_s: float = 10.0  # seconds a failed cloud provider's reachability check (or the llama-server probe) is reused (0 disables)
+    provider_probe_timeout_s: float = 0.5  # connect timeout for that check
+    stream_idle_timeout: int = 30  # seconds allowed between streamed chunks
+    specialist_cache_ttl: int = 300  # seconds to reuse parallel specialist responses (0 disables)
+    max_parallel_specialists: int = 4  # Concurrent specialist calls per request
+    hedge_confidence_threshold: float = 0.4  # Below this, parallel routes return the first answer
+    stream_flush_chunks: int = 16  # Streamed chunks coalesced into one event
+    stream_flush_interval_ms: int = 50  # Max time a chunk waits before being flushed
+    speculative_general_chat: bool = False  # Run general_chat while the router classifies
+    speculative_rag_context: bool = True  # Retrieve RAG documents while the router classifies
 
     # Router Configuration (Optional - if not set, router is disabled)
     router_model_path: Optional[str] = None
     router_n_ctx: int = 2048
     router_n_batch: int = 512
     router_n_threads: Optional[int] = None
-    router_temperature: float = 0.1  # Lower for deterministic routing
-    router_max_tokens: int = 256
+    router_temperature: float = 0.0  # Greedy decoding for deterministic routing
+    router_max_tokens: int = 128  # Grammar-constrained JSON decision is short
+    router_cache_size: int = 4096  # Cached routing decisions (0 disables)
 
     # Coordinator Agent Configuration
     use_coordinator_agent: bool = False  # Feature flag - disabled by default
 
     # Session Management
     session_timeout_minutes: int = 60
+    known_sessions_cache_size: int = 10000  # Session IDs the coordinator remembers as existing (0 always checks the database)
 
     secret_key: str = "dev-secret-key-change-in-production"  # For future JWT use if needed
 
@@ -192,6 +233,10 @@ class Settings:
             llamacpp_n_threads=int(os.getenv("LLAMACPP_N_THREADS")) if os.getenv("LLAMACPP_N_THREADS") else None,
             llamacpp_temperature=float(os.getenv("LLAMACPP_TEMPERATURE", "0.7")),
             llamacpp_max_tokens=int(os.getenv("LLAMACPP_MAX_TOKENS", "512")),
+            llamacpp_prompt_cache_bytes=int(os.getenv("LLAMACPP_PROMPT_CACHE_BYTES", str(256 * 1024 * 1024))),
+            llamacpp_n_gpu_layers=int(os.getenv("LLAMACPP_N_GPU_LAYERS", "0")),
+            llamacpp_use_mmap=os.getenv("LLAMACPP_USE_MMAP", "true").lower() == "true",
+            llamacpp_use_mlock=os.getenv("LLAMACPP_USE_MLOCK", "true").lower() == "true",
 
             # llama-server (Dual Model Support)
             llama_server_host=os.getenv("LLAMA_SERVER_HOST", "127.0.0.1"),
@@ -207,24 +252,61 @@ class Settings:
             # Specialist Fallback
             cloud_retry_attempts=int(os.getenv("CLOUD_RETRY_ATTEMPTS", "3")),
             enable_local_fallback=os.getenv("ENABLE_LOCAL_FALLBACK", "true").lower() == "true",
+            preload_local_specialist=os.getenv("PRELOAD_LOCAL_SPECIALIST", "true").lower() == "true",
+            local_specialist_via_server=os.getenv("LOCAL_SPECIALIST_VIA_SERVER", "true").lower() == "true",
             circuit_breaker_failure_threshold=int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5")),
             circuit_breaker_timeout=int(os.getenv("CIRCUIT_BREAKER_TIMEOUT", "60")),
+            circuit_breaker_latency_ms=float(os.getenv("CIRCUIT_BREAKER_LATENCY_MS", "15000")),
+            specialist_timeout=int(os.getenv("SPECIALIST_TIMEOUT", "60")),
+            anthropic_timeout_s=float(os.getenv("ANTHROPIC_TIMEOUT_S", "20")),
+            google_timeout_s=float(os.getenv("GOOGLE_TIMEOUT_S", "20")),
+            local_timeout_s=float(os.getenv("LOCAL_TIMEOUT_S", "0")),
+            specialist_max_tokens=int(os.getenv("SPECIALIST_MAX_TOKENS", "2048")),
+            min_output_tokens_per_s=float(os.getenv("MIN_OUTPUT_TOKENS_PER_S", "25")),
+            first_token_timeout_s=float(os.getenv("FIRST_TOKEN_TIMEOUT_S", "10")),
+            provider_probe_ttl_s=float(os.getenv("PROVIDER_PROBE_TTL_S", "10")),
+            provider_probe_timeout_s=float(os.getenv("PROVIDER_PROBE_TIMEOUT_S", "0.5")),
+            stream_idle_timeout=int(os.getenv("STREAM_IDLE_TIMEOUT", "30")),
+            specialist_cache_ttl=int(os.getenv("SPECIALIST_CACHE_TTL", "300")),
+            max_parallel_specialists=int(os.getenv("MAX_PARALLEL_SPECIALISTS", "4")),
+            hedge_confidence_threshold=float(os.getenv("HEDGE_CONFIDENCE_THRESHOLD", "0.4")),
+            stream_flush_chunks=int(os.getenv("STREAM_FLUSH_CHUNKS", "16")),
+            stream_flush_interval_ms=int(os.getenv("STREAM_FLUSH_INTERVAL_MS", "50")),
+            speculative_general_chat=os.getenv("SPECULATIVE_GENERAL_CHAT", "false").lower() == "true",
+            speculative_rag_context=os.getenv("SPECULATIVE_RAG_CONTEXT", "true").lower() == "true",
 
             # Router (Optional)
             router_model_path=router_model_path,
             router_n_ctx=int(os.getenv("ROUTER_N_CTX", "2048")),
             router_n_batch=int(os.getenv("ROUTER_N_BATCH", "512")),
             router_n_threads=int(os.getenv("ROUTER_N_THREADS")) if os.getenv("ROUTER_N_THREADS") else None,
-            router_temperature=float(os.getenv("ROUTER_TEMPERATURE", "0.1")),
-            router_max_tokens=int(os.getenv("ROUTER_MAX_TOKENS", "256")),
+            router_temperature=float(os.getenv("ROUTER_TEMPERATURE", "0.0")),
+            router_max_tokens=int(os.getenv("ROUTER_MAX_TOKENS", "128")),
+            router_cache_size=int(os.getenv("ROUTER_CACHE_SIZE", "4096")),
 
             # Coordinator Agent
             use_coordinator_agent=os.getenv("USE_COORDINATOR_AGENT", "false").lower() == "true",
+            known_sessions_cache_size=int(os.getenv("KNOWN_SESSIONS_CACHE_SIZE", "10000")),
 
             # Other settings
             log_level=os.getenv("LOG_LEVEL", "INFO"),
             log_to_file=os.getenv("LOG_TO_FILE", "false").lower() == "true",
             retrieval_k=int(os.getenv("RETRIEVAL_K", "3")),
+            search_cache_size=int(os.getenv("SEARCH_CACHE_SIZE", "256")),
+            query_embed_window_ms=float(os.getenv("QUERY_EMBED_WINDOW_MS", "5")),
+            query_embed_batch_size=int(os.getenv("QUERY_EMBED_BATCH_SIZE", "16")),
+            rag_answer_cache_ttl=int(os.getenv("RAG_ANSWER_CACHE_TTL", "600")),
+            semantic_cache_size=int(os.getenv("SEMANTIC_CACHE_SIZE", "1024")),
+            semantic_cache_ttl=int(os.getenv("SEMANTIC_CACHE_TTL", "300")),
+            semantic_cache_threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.85")),
+            rag_retriever_workers=int(os.getenv("RAG_RETRIEVER_WORKERS", "8")),
+            persistent_cache_dir=os.getenv("PERSISTENT_CACHE_DIR") or None,
+            persistent_cache_ttl=int(os.getenv("PERSISTENT_CACHE_TTL", str(7 * 86400))),
+            embedding_cache_enabled=os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true",
+            embed_batch_size=int(os.getenv("EMBED_BATCH_SIZE", "64")),
+            embed_batch_tokens=int(os.getenv("EMBED_BATCH_TOKENS", "8192")),
+            embed_concurrency=int(os.getenv("EMBED_CONCURRENCY", "4")),
+            pdf_loader_workers=int(os.getenv("PDF_LOADER_WORKERS", "0")),
             chroma_hnsw_construction_ef=int(os.getenv("CHROMA_HNSW_CONSTRUCTION_EF", "100")),
             chroma_hnsw_search_ef=int(os.getenv("CHROMA_HNSW_SEARCH_EF", "50")),
 
@@ -170,6 +170,14 @@ class TestSpecializedAgentsFactory:
         ]
         assert agent_names == expected_names
 
+    def test_agents_built_once_per_factory(self, factory_basic):
+        """Test repeated requests reuse the same agent instances."""
+        agent = factory_basic.create_rag_query_agent()
+
+        assert factory_basic.create_rag_query_agent() is agent
+        assert factory_basic.create_all_agents()[1] is agent
+        assert all(a is b for a, b in zip(factory_basic.create_all_agents(), factory_basic.create_all_agents()))
+
     def test_all_agents_have_required_fields(self, factory_basic):
         """Test all agents have required ADK fields."""
         agents = factory_basic.create_all_agents()
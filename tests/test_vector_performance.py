@@ -1,6 +1,7 @@
 """
 Tests for vector store performance optimizations.
 """
+import json
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -106,6 +107,42 @@ class TestVectorStoreOptimizations:
         # Verify it used the custom k
         service.vectorstore.similarity_search.assert_called_once_with("test query", k=10)
 
+    def test_search_by_vector_uses_precomputed_embedding(self):
+        """Test that searching by vector does not embed the query again."""
+        from config import settings
+
+        service = VectorStoreService()
+        with pytest.raises(ValueError, match="Run ingestion first"):
+            service.search_by_vector([0.1, 0.2])
+
+        service.vectorstore = Mock()
+        service.vectorstore.similarity_search_by_vector = Mock(return_value=[])
+        service.search_by_vector([0.1, 0.2])
+
+        service.vectorstore.similarity_search_by_vector.assert_called_once_with(
+            [0.1, 0.2], k=settings.retrieval_k
+        )
+
+    def test_search_results_cached_until_store_changes(self):
+        """Test that repeated searches are served from cache until documents change."""
+        service = VectorStoreService()
+        service.vectorstore = Mock()
+        service.vectorstore.similarity_search = Mock(side_effect=lambda query, k: [Mock()])
+
+        first = service.search("test query")
+        assert service.search(" test query ") == first
+        assert service.vectorstore.similarity_search.call_count == 1
+
+        service.search("test query", k=10)
+        assert service.vectorstore.similarity_search.call_count == 2
+
+        # Replacing the store drops cached results
+        store = service.vectorstore
+        service.vectorstore = Mock()
+        service.vectorstore.similarity_search = store.similarity_search
+        service.search("test query")
+        assert service.vectorstore.similarity_search.call_count == 3
+
     def test_get_retriever_uses_reduced_k(self):
         """Test that get_retriever uses the reduced k value by default."""
         service = VectorStoreService()
@@ -123,6 +160,209 @@ class TestVectorStoreOptimizations:
             search_kwargs={"k": settings.retrieval_k}
         )
 
+    def test_get_retriever_reused_per_k(self):
+        """Test that retrievers are cached per k until the store is replaced."""
+        service = VectorStoreService()
+
+        service.vectorstore = Mock()
+        service.vectorstore.as_retriever = Mock(side_effect=lambda **kwargs: Mock())
+
+        first = service.get_retriever()
+        assert service.get_retriever() is first
+        assert service.get_retriever(k=10) is not first
+        assert service.vectorstore.as_retriever.call_count == 2
+
+        # A new store (e.g. after re-ingestion) gets fresh retrievers
+        service.vectorstore = Mock()
+        service.vectorstore.as_retriever = Mock(return_value=Mock())
+        assert service.get_retriever() is not first
+
+    def test_store_exists_checks_chroma_manifest(self, tmp_path):
+        """Test that the store is detected from chroma.sqlite3, or any content for older layouts."""
+        service = VectorStoreService()
+
+        with patch('app.services.vector_store.settings.vector_store_dir', tmp_path / "chroma"):
+            assert not service._store_exists()
+            (tmp_path / "chroma").mkdir()
+            assert not service._store_exists()
+            (tmp_path / "chroma" / "chroma.sqlite3").touch()
+            assert service._store_exists()
+
+        legacy = tmp_path / "legacy"
+        legacy.mkdir()
+        (legacy / "index.bin").touch()
+        with patch('app.services.vector_store.settings.vector_store_dir', legacy):
+            assert service._store_exists()
+
+    def test_embedding_cache_kept_out_of_store_dir(self, tmp_path):
+        """Test that the embedding cache does not make a fresh install look ingested."""
+        store_dir = tmp_path / "chroma"
+        with patch.multiple('app.services.vector_store.settings',
+                            vector_store_dir=store_dir, base_dir=tmp_path, embedding_cache_enabled=True), \
+                patch('app.services.disk_cache.settings.persistent_cache_dir', None), \
+                patch('app.services.vector_store.ProviderFactory'):
+            service = VectorStoreService(provider_type='ollama')
+
+            assert service._embedding_cache.path == tmp_path / "cache" / "embeddings.sqlite3"
+            assert not service._store_exists()
+            assert service.vectorstore is None
+
+    def test_embedding_cache_disabled_overrides_persistent_dir(self, tmp_path):
+        """Test that EMBEDDING_CACHE_ENABLED=false wins over PERSISTENT_CACHE_DIR."""
+        with patch('app.services.vector_store.settings.embedding_cache_enabled', False), \
+                patch('app.services.disk_cache.settings.persistent_cache_dir', str(tmp_path)), \
+                patch('app.services.vector_store.ProviderFactory'):
+            assert VectorStoreService(provider_type='ollama')._embedding_cache is None
+
+    def test_add_splits_embeds_in_batches(self):
+        """Test that chunks are embedded per batch and bulk-added in order."""
+        from langchain_core.documents import Document
+
+        service = VectorStoreService()
+        service.embeddings = Mock()
+        service.embeddings.embed_documents = Mock(
+            side_effect=lambda texts: [[float(len(text))] for text in texts]
+        )
+        service.vectorstore = Mock()
+        service.vectorstore._collection.get.return_value = {"ids": []}
+        splits = [Document(page_content="x" * (i + 1), metadata={"source": "a.pdf"}) for i in range(5)]
+
+        with patch('app.services.vector_store.settings.embed_batch_size', 2):
+            service._add_splits(splits)
+
+        assert service.embeddings.embed_documents.call_count == 3
+        adds = service.vectorstore._collection.upsert.call_args_list
+        assert [len(call.kwargs["ids"]) for call in adds] == [2, 2, 1]
+        assert [e for call in adds for e in call.kwargs["embeddings"]] == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        assert adds[0].kwargs["metadatas"] == [{"source": "a.pdf"}, {"source": "a.pdf"}]
+
+    def test_pack_batches_groups_similar_lengths_under_token_cap(self):
+        """Test that batches are length-sorted and capped by estimated tokens."""
+        from langchain_core.documents import Document
+
+        chunks = [(str(i), Document(page_content="x" * size))
+                  for i, size in enumerate([400, 8, 400, 8, 8, 400])]
+
+        with patch.multiple('app.services.vector_store.settings', embed_batch_size=64, embed_batch_tokens=210):
+            batches = VectorStoreService._pack_batches(chunks)
+
+        assert [[chunk_id for chunk_id, _ in batch] for batch in batches] == [["1", "3", "4", "0"], ["2", "5"]]
+
+    def test_add_splits_skips_stored_chunks(self, tmp_path):
+        """Test that re-ingested chunks are not embedded again."""
+        from langchain_core.documents import Document
+        from app.services.disk_cache import DiskCache
+
+        service = VectorStoreService()
+        service.embeddings = Mock()
+        service.embeddings.embed_documents = Mock(side_effect=lambda texts: [[1.0] for _ in texts])
+        service.vectorstore = Mock()
+        service._embedding_cache = DiskCache(tmp_path / "embeddings.sqlite3", ttl_seconds=60)
+        service._embedding_model_id = "nomic-embed-text"
+        old = Document(page_content="old", metadata={"source": "a.pdf"})
+        new = Document(page_content="new", metadata={"source": "a.pdf"})
+        service.vectorstore._collection.get.return_value = {"ids": [service._chunk_id(old)]}
+
+        assert service._add_splits([old, new, new]) == 1
+        service.embeddings.embed_documents.assert_called_once_with(["new"])
+        add = service.vectorstore._collection.upsert.call_args.kwargs
+        assert add["ids"] == [service._chunk_id(new)]
+
+        # A rebuilt store re-uses the persisted embedding
+        service.vectorstore._collection.get.return_value = {"ids": []}
+        assert service._add_splits([new]) == 1
+        assert service.embeddings.embed_documents.call_count == 1
+
+    def test_packed_embeddings_round_trip_at_half_precision(self):
+        """Test that cached embeddings shrink to float16 with small error."""
+        from app.services.vector_store import pack_embedding, unpack_embedding
+
+        embedding = [0.1234567, -0.9876543, 0.0, 0.5]
+        packed = pack_embedding(embedding)
+
+        assert len(packed) < len(json.dumps(embedding))
+        assert unpack_embedding(packed) == pytest.approx(embedding, rel=1e-3)
+
+    def test_ingest_streams_chunks_in_bounded_groups(self):
+        """Test that ingestion splits and stores documents as they are loaded."""
+        from langchain_core.documents import Document
+
+        service = VectorStoreService()
+        service.embeddings = Mock()
+        service.embeddings.embed_documents = Mock(side_effect=lambda texts: [[0.0] for _ in texts])
+        service.vectorstore = Mock()
+        service.vectorstore._collection.count.return_value = 5
+        service.vectorstore._collection.get.return_value = {"ids": []}
+        docs = [Document(page_content=f"page {i}", metadata={"source": f"/data/{name}"})
+                for i, name in enumerate(["a.pdf", "a.pdf", "b.pdf", "c.csv", "c.csv"])]
+
+        with patch.object(service, '_iter_documents', return_value=iter(docs)), \
+                patch.object(service, '_prepare_store') as prepare, \
+                patch.multiple('app.services.vector_store.settings', embed_batch_size=2, embed_concurrency=1):
+            result = service.ingest_documents(directory=Path("/data"))
+
+        assert result == (5, 5, ["a.pdf", "b.pdf", "c.csv"])
+        prepare.assert_called_once_with(False)
+        adds = service.vectorstore._collection.upsert.call_args_list
+        assert [len(call.kwargs["ids"]) for call in adds] == [2, 2, 1]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_pdf_files_loaded_in_order(self, tmp_path, workers):
+        """Test that PDFs load in file order, in-process or across worker processes."""
+        from pypdf import PdfWriter
+
+        for name in ["b", "a", "c"]:
+            writer = PdfWriter()
+            writer.add_blank_page(width=100, height=100)
+            writer.add_blank_page(width=100, height=100)
+            writer.write(str(tmp_path / f"{name}.pdf"))
+        (tmp_path / "broken.pdf").write_bytes(b"not a pdf")
+
+        service = VectorStoreService()
+        with patch('app.services.vector_store.settings.pdf_loader_workers', workers):
+            docs = list(service._iter_pdf_files(tmp_path))
+
+        assert [Path(doc.metadata["source"]).name for doc in docs] == [
+            "a.pdf", "a.pdf", "b.pdf", "b.pdf", "c.pdf", "c.pdf"
+        ]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_pymupdf_pages_match_pypdf_metadata(self, tmp_path, workers):
+        """Test that PyMuPDF is used on every loading path and matches pypdf's pages and metadata."""
+        pytest.importorskip("pymupdf")
+        from pypdf import PdfWriter
+        from langchain_community.document_loaders import PyPDFLoader
+
+        for name in ["a", "b"]:
+            writer = PdfWriter()
+            writer.add_blank_page(width=100, height=100)
+            writer.add_blank_page(width=100, height=100)
+            writer.write(str(tmp_path / f"{name}.pdf"))
+        expected = [
+            doc.metadata
+            for name in ["a", "b"]
+            for doc in PyPDFLoader(str(tmp_path / f"{name}.pdf")).load()
+        ]
+
+        service = VectorStoreService()
+        with patch('app.services.vector_store.settings.pdf_loader_workers', workers), \
+                patch('langchain_community.document_loaders.PyPDFLoader.load',
+                      side_effect=AssertionError("pypdf used")):
+            docs = list(service._iter_pdf_files(tmp_path))
+
+        assert [doc.metadata for doc in docs] == expected
+
+    def test_ingest_without_documents_leaves_store_untouched(self):
+        """Test that an empty directory does not create a store."""
+        service = VectorStoreService()
+        service.embeddings = Mock()
+
+        with patch.object(service, '_iter_documents', return_value=iter([])), \
+                patch.object(service, '_prepare_store') as prepare:
+            assert service.ingest_documents(directory=Path("/data")) == (0, 0, [])
+
+        prepare.assert_not_called()
+
 
 class TestEnvironmentConfiguration:
     """Test environment variable configuration for performance settings."""
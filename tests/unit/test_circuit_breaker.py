@@ -0,0 +1,55 @@
+"""
+Unit tests for the specialist circuit breaker.
+"""
+from app.services.circuit_breaker import CircuitBreaker
+
+
+def test_opens_after_consecutive_failures():
+    """Test the circuit opens after the failure threshold."""
+    breaker = CircuitBreaker(name="test", failure_threshold=2, timeout=60)
+
+    breaker.record_failure()
+    assert not breaker.is_open()
+    breaker.record_failure()
+
+    assert breaker.is_open()
+
+
+def test_opens_when_p95_latency_exceeds_threshold():
+    """Test a slow p95 opens the circuit even without failures."""
+    breaker = CircuitBreaker(name="test", latency_threshold_ms=1000, min_latency_samples=20)
+
+    for _ in range(18):
+        breaker.record_latency(100)
+    for _ in range(2):
+        breaker.record_latency(5000)
+
+    assert breaker.is_open()
+    assert breaker.latency_p95() is None  # window restarts after opening
+
+
+def test_latency_needs_enough_samples_and_tolerates_outliers():
+    """Test few samples or rare outliers do not open the circuit."""
+    breaker = CircuitBreaker(name="test", latency_threshold_ms=1000, min_latency_samples=20)
+
+    for _ in range(5):
+        breaker.record_latency(5000)
+    assert not breaker.is_open()
+
+    breaker = CircuitBreaker(name="test", latency_threshold_ms=1000, min_latency_samples=20)
+    for _ in range(95):
+        breaker.record_latency(100)
+    for _ in range(5):
+        breaker.record_latency(5000)
+    assert not breaker.is_open()
+    assert breaker.latency_p95() == 100
+
+
+def test_latency_ignored_without_threshold():
+    """Test latency is only tracked when a threshold is set."""
+    breaker = CircuitBreaker(name="test")
+
+    for _ in range(50):
+        breaker.record_latency(60000)
+
+    assert not breaker.is_open()
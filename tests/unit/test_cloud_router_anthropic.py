@@ -0,0 +1,50 @@
+"""
+Unit tests for Anthropic cloud router service.
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services.cloud_router_anthropic import CloudRouterAnthropicService
+
+
+DECISION = (
+    '{"primary_agent": "rag_query", "parallel_agents": [], '
+    '"confidence": 0.9, "reasoning": "docs question"}'
+)
+
+
+@pytest.fixture
+def router():
+    """Create router with a mock Anthropic client."""
+    with patch('app.services.cloud_router_anthropic.Anthropic') as mock:
+        mock.return_value = MagicMock()
+        yield CloudRouterAnthropicService()
+
+
+@pytest.mark.parametrize("response", [
+    DECISION,
+    f"```json\n{DECISION}\n```",
+    f"Here is the classification:\n{DECISION}\nLet me know if you need more.",
+])
+def test_parse_routing_response_extracts_json(router, response):
+    """Test the JSON object is found with or without surrounding text."""
+    decision = router._parse_routing_response(response)
+
+    assert decision["primary_agent"] == "rag_query"
+    assert decision["confidence"] == 0.9
+
+
+def test_parse_routing_response_without_json(router):
+    """Test responses without a JSON object are rejected."""
+    with pytest.raises(ValueError):
+        router._parse_routing_response("general_chat")
+
+
+def test_route_falls_back_on_bad_response(router):
+    """Test unparseable responses fall back to general chat."""
+    router.client.messages.create.return_value.content = [MagicMock(text="not json")]
+
+    decision = router.route("hello")
+
+    assert decision["primary_agent"] == "general_chat"
+    assert decision["reasoning"].startswith("Routing failed")
@@ -0,0 +1,330 @@
+"""
+Unit tests for coordinator routing and session caches.
+"""
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+
+from app.services.coordinator_agent import CoordinatorAgentService
+
+
+@pytest.fixture
+def mock_router():
+    """Create mock router service."""
+    router = Mock()
+    router.route.return_value = {
+        "primary_agent": "code_generation",
+        "parallel_agents": [],
+        "confidence": 0.95,
+        "reasoning": "code request"
+    }
+    return router
+
+
+@pytest.fixture
+def coordinator(mock_router):
+    """Create coordinator with specialist and session services mocked."""
+    with patch('app.services.coordinator_agent.SpecialistManager'), \
+            patch('app.services.coordinator_agent.PostgreSQLSessionService'):
+        return CoordinatorAgentService(
+            rag_service=Mock(),
+            router_service=mock_router
+        )
+
+
+@pytest.mark.asyncio
+async def test_route_leaves_caching_to_router(coordinator, mock_router):
+    """Test repeated messages go to the router service, which owns the decision cache."""
+    first = await coordinator._route("How do closures work")
+    second = await coordinator._route("How do closures work")
+
+    assert first == second
+    assert mock_router.route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_route_without_router():
+    """Test cloud mode (no router) routes to general chat."""
+    with patch('app.services.coordinator_agent.SpecialistManager'), \
+            patch('app.services.coordinator_agent.PostgreSQLSessionService'):
+        service = CoordinatorAgentService(rag_service=Mock(), router_service=None)
+
+    decision = await service._route("hello")
+    assert decision["primary_agent"] == "general_chat"
+
+
+@pytest.mark.asyncio
+async def test_ensure_session_exists_checks_once(coordinator):
+    """Test warm sessions skip the database existence check."""
+    coordinator.session_service.session_exists = AsyncMock(return_value=True)
+
+    await coordinator._ensure_session_exists("session-1", "user-1")
+    await coordinator._ensure_session_exists("session-1", "user-1")
+
+    coordinator.session_service.session_exists.assert_awaited_once_with("session-1")
+
+
+@pytest.mark.asyncio
+async def test_known_sessions_evict_least_recently_used(coordinator):
+    """Test remembered sessions stay within the configured size."""
+    coordinator.session_service.session_exists = AsyncMock(return_value=True)
+
+    with patch('app.services.coordinator_agent.settings') as mock_settings:
+        mock_settings.known_sessions_cache_size = 2
+        for session_id in ("s1", "s2", "s1", "s3", "s1"):
+            await coordinator._ensure_session_exists(session_id, "user-1")
+
+    assert list(coordinator._known_sessions) == ["s3", "s1"]
+    assert coordinator.session_service.session_exists.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_parallel_specialists_dedupe_and_cache(coordinator):
+    """Test duplicate categories run once and repeat prompts hit the cache."""
+    coordinator.specialist_manager.execute_with_fallback = AsyncMock(
+        side_effect=lambda specialist_type, message, context: f"{specialist_type} answer"
+    )
+    categories = ["code_validation", "code_analysis", "code_validation"]
+
+    first = await coordinator._run_parallel_specialists(categories, "check this", "s1")
+    second = await coordinator._run_parallel_specialists(categories, "check this", "s1")
+
+    assert first == [
+        ("code_validation", "code_validation answer"),
+        ("code_analysis", "code_analysis answer"),
+    ]
+    assert second == first
+    assert coordinator.specialist_manager.execute_with_fallback.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_parallel_specialists_cancel_slow(coordinator):
+    """Test specialists past the fan-out deadline are dropped."""
+    async def execute(specialist_type, message, context):
+        if specialist_type == "complex_reasoning":
+            await asyncio.sleep(10)
+        return f"{specialist_type} answer"
+
+    coordinator.specialist_manager.execute_with_fallback = execute
+
+    with patch('app.services.coordinator_agent.settings') as mock_settings:
+        mock_settings.specialist_timeout = 0.1
+        mock_settings.specialist_cache_ttl = 0
+        results = await coordinator._run_parallel_specialists(
+            ["code_analysis", "complex_reasoning"], "think hard", "s1"
+        )
+
+    assert results == [
+        ("code_analysis", "code_analysis answer"),
+        ("complex_reasoning", None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_first_successful_returns_fastest(coordinator):
+    """Test low-confidence fan-out returns the first answer and cancels the rest."""
+    cancelled = []
+
+    async def execute(specialist_type, message, context):
+        if specialist_type == "complex_reasoning":
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(specialist_type)
+                raise
+        return f"{specialist_type} answer"
+
+    coordinator.specialist_manager.execute_with_fallback = execute
+
+    response = await coordinator._run_first_successful(
+        ["complex_reasoning", "code_analysis"], "hmm"
+    )
+    await asyncio.sleep(0.05)  # let the cancellation reach the slow specialist
+
+    assert response == "code_analysis answer"
+    assert cancelled == ["complex_reasoning"]
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_coalesces_chunks(coordinator):
+    """Test streamed chunks are batched into fewer content events."""
+    async def stream(agent_type, message, session_id):
+        for i in range(5):
+            yield f"t{i} "
+
+    coordinator._run_streaming_specialist = stream
+    coordinator._ensure_session_exists = AsyncMock()
+    coordinator._add_to_session = AsyncMock()
+
+    with patch('app.services.coordinator_agent.settings') as mock_settings:
+        mock_settings.router_cache_size = 0
+        mock_settings.stream_flush_chunks = 2
+        mock_settings.stream_flush_interval_ms = 60000
+        events = [event async for event in coordinator.chat_stream("hi", "u1", "s1")]
+
+    content = [event["data"] for event in events if event["type"] == "content"]
+    assert content == ["t0 ", "t1 t2 ", "t3 t4 "]
+    coordinator._add_to_session.assert_awaited_once_with("s1", "hi", "t0 t1 t2 t3 t4 ")
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_flushes_buffer_while_model_pauses(coordinator):
+    """Test buffered text is flushed after the interval even if no new chunk arrives."""
+    received = []
+
+    async def stream(agent_type, message, session_id):
+        yield "a"
+        yield "b"
+        yield "c"
+        await asyncio.sleep(0.3)
+        # The pause is longer than the flush interval, so "bc" is already out
+        assert received == ["a", "bc"]
+        yield "d"
+
+    coordinator._run_streaming_specialist = stream
+    coordinator._ensure_session_exists = AsyncMock()
+    coordinator._add_to_session = AsyncMock()
+
+    with patch('app.services.coordinator_agent.settings') as mock_settings:
+        mock_settings.router_cache_size = 0
+        mock_settings.stream_flush_chunks = 16
+        mock_settings.stream_flush_interval_ms = 20
+        async for event in coordinator.chat_stream("hi", "u1", "s1"):
+            if event["type"] == "content":
+                received.append(event["data"])
+            assert event["type"] != "error", event
+
+    assert received == ["a", "bc", "d"]
+
+
+@pytest.mark.parametrize("message,expected", [
+    ("Write a python function to reverse a string", "code_generation"),
+    ("please validate this code: print('x')", "code_validation"),
+    ("Explain this function", "code_analysis"),
+    ("search the docs for retry settings", "rag_query"),
+    ("Hello there!", "general_chat"),
+    ("thank you", "general_chat"),
+    ("   ", "general_chat"),
+])
+@pytest.mark.asyncio
+async def test_fast_route_single_intent(coordinator, mock_router, message, expected):
+    """Test obvious requests skip the router."""
+    decision = await coordinator._route(message)
+
+    assert decision["primary_agent"] == expected
+    mock_router.route.assert_not_called()
+
+
+@pytest.mark.parametrize("message", [
+    "validate and explain this code",
+    "check this code. Then write a function for it",
+    "what's the weather like?",
+    "hi, can you explain decorators",
+])
+@pytest.mark.asyncio
+async def test_fast_route_defers_to_router(coordinator, mock_router, message):
+    """Test ambiguous or multi-part requests still use the router."""
+    await coordinator._route(message)
+
+    mock_router.route.assert_called_once_with(message)
+
+
+@pytest.mark.asyncio
+async def test_chat_reuses_speculative_general_chat(coordinator, mock_router):
+    """Test the speculative general_chat call is used when the router agrees."""
+    mock_router.route.return_value = {
+        "primary_agent": "general_chat",
+        "parallel_agents": [],
+        "confidence": 0.9,
+        "reasoning": "small talk"
+    }
+    coordinator.specialist_manager.execute_with_fallback = AsyncMock(return_value="hi there")
+    coordinator._ensure_session_exists = AsyncMock()
+    coordinator._add_to_session = AsyncMock()
+
+    with patch('app.services.coordinator_agent.settings') as mock_settings:
+        mock_settings.speculative_general_chat = True
+        mock_settings.router_cache_size = 0
+        mock_settings.specialist_timeout = 5
+        response = await coordinator.chat("how are you today", "u1", "s1")
+
+    assert response == "hi there"
+    coordinator.specialist_manager.execute_with_fallback.assert_awaited_once()
+    coordinator._add_to_session.assert_awaited_once_with("s1", "how are you today", "hi there")
+
+
+@pytest.mark.asyncio
+async def test_chat_falls_back_when_all_parallel_fail(coordinator, mock_router):
+    """Test an all-failed fan-out uses the general assistant fallback."""
+    mock_router.route.return_value = {
+        "primary_agent": "code_analysis",
+        "parallel_agents": ["complex_reasoning"],
+        "confidence": 0.9,
+        "reasoning": "needs analysis and reasoning"
+    }
+    coordinator._ensure_session_exists = AsyncMock()
+    coordinator._run_parallel_specialists = AsyncMock(return_value=[
+        ("code_analysis", None),
+        ("complex_reasoning", None),
+    ])
+    coordinator._fallback_to_general_assistant = AsyncMock(return_value="fallback")
+
+    response = await coordinator.chat("think about this snippet", "u1", "s1")
+
+    assert response == "fallback"
+    coordinator._fallback_to_general_assistant.assert_awaited_once_with(
+        "think about this snippet", "s1"
+    )
+
+
+@pytest.mark.asyncio
+async def test_chat_uses_speculative_rag_retrieval(coordinator, mock_router):
+    """Test documents retrieved during routing feed the rag_query answer."""
+    mock_router.route.return_value = {
+        "primary_agent": "rag_query",
+        "parallel_agents": [],
+        "confidence": 0.9,
+        "reasoning": "knowledge question"
+    }
+    retrieval = Mock()
+    coordinator.rag_service.aretrieve = AsyncMock(return_value=retrieval)
+    coordinator.rag_service.aquery = AsyncMock(return_value=("retrieved context", None))
+    coordinator._ensure_session_exists = AsyncMock()
+    coordinator._run_single_specialist = AsyncMock(return_value="answer")
+
+    with patch('app.services.coordinator_agent.settings') as mock_settings:
+        mock_settings.speculative_rag_context = True
+        mock_settings.speculative_general_chat = False
+        mock_settings.router_cache_size = 0
+        mock_settings.specialist_timeout = 5
+        response = await coordinator.chat("what is our retry policy", "u1", "s1")
+
+    assert response == "answer"
+    coordinator.rag_service.aretrieve.assert_awaited_once_with("what is our retry policy")
+    coordinator.rag_service.aquery.assert_awaited_once_with(
+        "what is our retry policy", include_sources=False, retrieval=retrieval
+    )
+    coordinator._run_single_specialist.assert_awaited_once_with(
+        "rag_query", "what is our retry policy", "s1", context="retrieved context"
+    )
+
+
+@pytest.mark.asyncio
+async def test_speculative_rag_only_retrieves_for_other_routes(coordinator, mock_router):
+    """Test no RAG answer is generated when the router picks another specialist."""
+    coordinator.rag_service.aretrieve = AsyncMock(return_value=Mock())
+    coordinator.rag_service.aquery = AsyncMock()
+    coordinator._ensure_session_exists = AsyncMock()
+    coordinator._run_single_specialist = AsyncMock(return_value="code")
+
+    with patch('app.services.coordinator_agent.settings') as mock_settings:
+        mock_settings.speculative_rag_context = True
+        mock_settings.speculative_general_chat = False
+        mock_settings.router_cache_size = 0
+        response = await coordinator.chat("please write some code for me", "u1", "s1")
+
+    assert response == "code"
+    coordinator.rag_service.aquery.assert_not_called()
+    coordinator._run_single_specialist.assert_awaited_once_with(
+        "code_generation", "please write some code for me", "s1", context=None
+    )
@@ -0,0 +1,65 @@
+"""
+Unit tests for the persistent disk cache.
+"""
+from unittest.mock import patch
+
+from app.services.disk_cache import DiskCache, open_disk_cache
+
+
+def test_round_trip_and_persistence(tmp_path):
+    """Test values are readable from a new instance on the same file."""
+    path = tmp_path / "cache.sqlite3"
+    DiskCache(path, ttl_seconds=60).set("key", {"answer": "42", "sources": ["a.pdf"]})
+
+    assert DiskCache(path, ttl_seconds=60).get("key") == {"answer": "42", "sources": ["a.pdf"]}
+
+
+def test_missing_and_expired_entries(tmp_path):
+    """Test missing keys and expired entries return None."""
+    cache = DiskCache(tmp_path / "cache.sqlite3", ttl_seconds=10)
+
+    with patch("app.services.disk_cache.time.time", return_value=1000.0):
+        cache.set("key", "value")
+    with patch("app.services.disk_cache.time.time", return_value=1011.0):
+        assert cache.get("key") is None
+
+    assert cache.get("other") is None
+
+
+def test_clear(tmp_path):
+    """Test clear removes all entries."""
+    cache = DiskCache(tmp_path / "cache.sqlite3", ttl_seconds=60)
+    cache.set("key", "value")
+
+    cache.clear()
+
+    assert cache.get("key") is None
+
+
+def test_open_disk_cache_disabled_without_dir():
+    """Test persistent caching is off unless a directory is configured."""
+    with patch("app.services.disk_cache.settings") as mock_settings:
+        mock_settings.persistent_cache_dir = None
+        mock_settings.persistent_cache_ttl = 60
+        assert open_disk_cache("router") is None
+
+
+def test_get_many_and_set_many(tmp_path):
+    """Test batched reads and writes match single-key access."""
+    cache = DiskCache(tmp_path / "cache.sqlite3", ttl_seconds=60)
+    cache.set_many([("a", [1, 2]), ("b", "two")])
+    cache.set("c", 3)
+
+    with patch.object(DiskCache, "SQL_BATCH", 2):
+        assert cache.get_many(["c", "missing", "a", "b"]) == [3, None, [1, 2], "two"]
+    assert cache.get("a") == [1, 2]
+
+
+def test_open_disk_cache_default_dir(tmp_path):
+    """Test a caller-supplied directory is used when none is configured."""
+    with patch("app.services.disk_cache.settings") as mock_settings:
+        mock_settings.persistent_cache_dir = None
+        mock_settings.persistent_cache_ttl = 60
+        cache = open_disk_cache("embeddings", default_dir=tmp_path)
+
+    assert cache.path == tmp_path / "embeddings.sqlite3"
@@ -0,0 +1,57 @@
+"""
+Unit tests for query embedding micro-batching.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from app.services.embedding_batcher import CoalescingEmbeddings
+
+
+def _inner():
+    inner = Mock()
+    inner.embed_documents = Mock(side_effect=lambda texts: [[float(len(text))] for text in texts])
+    return inner
+
+
+def test_concurrent_queries_share_one_request():
+    """Test queries arriving within the window are embedded together."""
+    inner = _inner()
+    embeddings = CoalescingEmbeddings(inner, window_ms=200, max_batch=4)
+    queries = ["a", "bb", "ccc", "dddd"]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(embeddings.embed_query, queries))
+
+    assert results == [[1.0], [2.0], [3.0], [4.0]]
+    inner.embed_documents.assert_called_once()
+    assert sorted(inner.embed_documents.call_args.args[0]) == sorted(queries)
+
+
+def test_single_query_flushes_after_window():
+    """Test a lone query is embedded once its window expires."""
+    inner = _inner()
+    embeddings = CoalescingEmbeddings(inner, window_ms=1)
+
+    assert embeddings.embed_query("abc") == [3.0]
+    assert embeddings.embed_query("de") == [2.0]
+    assert inner.embed_documents.call_count == 2
+
+
+def test_errors_reach_every_caller():
+    """Test a failed batch request raises for the waiting callers."""
+    inner = Mock()
+    inner.embed_documents = Mock(side_effect=RuntimeError("ollama down"))
+    embeddings = CoalescingEmbeddings(inner, window_ms=1)
+
+    with pytest.raises(RuntimeError, match="ollama down"):
+        embeddings.embed_query("abc")
+
+
+def test_documents_pass_through():
+    """Test document embedding is delegated unchanged."""
+    inner = _inner()
+    embeddings = CoalescingEmbeddings(inner)
+
+    assert embeddings.embed_documents(["ab", "c"]) == [[2.0], [1.0]]
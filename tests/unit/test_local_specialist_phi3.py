@@ -0,0 +1,156 @@
+"""
+Unit tests for the local Phi-3 specialist service.
+"""
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+from unittest.mock import Mock, patch
+
+from config import settings
+from app.services.local_specialist_phi3 import (
+    LlamaServerPhi3Service,
+    LocalSpecialistPhi3Service,
+    get_shared_phi3
+)
+
+
+@pytest.fixture
+def mock_model():
+    """Create mock Llama model."""
+    model = Mock()
+    model.return_value = {"choices": [{"text": " Phi-3 response "}]}
+    return model
+
+
+@pytest.fixture
+def specialist(mock_model):
+    """Create specialist using the mock model."""
+    with patch('app.services.local_specialist_phi3.LLAMA_CPP_AVAILABLE', True):
+        return LocalSpecialistPhi3Service("general_chat", model=mock_model)
+
+
+def test_prompt_templates_render_like_format():
+    """Test compiled templates match str.format output."""
+    for specialist_type, template in LocalSpecialistPhi3Service.SPECIALIST_PROMPTS.items():
+        render = LocalSpecialistPhi3Service.COMPILED_PROMPTS[specialist_type]
+        assert render("hello", "ctx") == template.format(message="hello", context="ctx")
+
+
+@pytest.mark.asyncio
+async def test_execute(specialist, mock_model):
+    """Test execute strips the generated text."""
+    response = await specialist.execute("Hi there")
+
+    assert response == "Phi-3 response"
+    assert "Hi there" in mock_model.call_args[0][0]
+
+
+@pytest.mark.asyncio
+async def test_execute_shares_identical_inflight_prompts(specialist, mock_model):
+    """Test concurrent identical prompts run a single generation."""
+    release = threading.Event()
+
+    def slow_generate(prompt, **kwargs):
+        release.wait(1)
+        return {"choices": [{"text": "shared"}]}
+
+    mock_model.side_effect = slow_generate
+
+    tasks = [asyncio.ensure_future(specialist.execute("Same question")) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert results == ["shared", "shared", "shared"]
+    assert mock_model.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_stream(specialist, mock_model):
+    """Test streaming yields each non-empty chunk."""
+    mock_model.return_value = iter([
+        {"choices": [{"text": "Hel"}]},
+        {"choices": [{"text": ""}]},
+        {"choices": [{"text": "lo"}]},
+    ])
+
+    chunks = [chunk async for chunk in specialist.execute_stream("Hi")]
+
+    assert chunks == ["Hel", "lo"]
+
+
+def test_shared_model_loaded_with_mmap_and_mlock():
+    """Test the shared model honours the mmap/mlock settings."""
+    with patch('app.services.local_specialist_phi3.LLAMA_CPP_AVAILABLE', True), \
+            patch('app.services.local_specialist_phi3._shared_model', None), \
+            patch('app.services.local_specialist_phi3.Llama', create=True) as mock_llama, \
+            patch('app.services.local_specialist_phi3.LlamaRAMCache', create=True), \
+            patch.multiple(settings, llamacpp_use_mmap=True, llamacpp_use_mlock=True):
+        get_shared_phi3()
+
+    kwargs = mock_llama.call_args.kwargs
+    assert kwargs["use_mmap"] is True
+    assert kwargs["use_mlock"] is True
+
+
+def _server_specialist(handler):
+    """Create a llama-server specialist whose client is served by handler."""
+    client = httpx.AsyncClient(base_url="http://llama/v1", transport=httpx.MockTransport(handler))
+    with patch('app.services.local_specialist_phi3.get_llama_server_client', return_value=client):
+        return LlamaServerPhi3Service("general_chat")
+
+
+@pytest.mark.asyncio
+async def test_server_execute_posts_phi3_prompt():
+    """Test the llama-server specialist sends the rendered prompt without loading a model."""
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={"choices": [{"text": " served "}]})
+
+    with patch('app.services.local_specialist_phi3.Llama', create=True) as mock_llama:
+        specialist = _server_specialist(handler)
+        response = await specialist.execute("Hi there")
+
+    assert response == "served"
+    assert requests[0]["prompt"] == LocalSpecialistPhi3Service.COMPILED_PROMPTS["general_chat"]("Hi there")
+    assert requests[0]["stop"] == ["<|end|>", "<|user|>", "<|system|>"]
+    mock_llama.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_server_execute_stream_parses_events():
+    """Test streamed server-sent events are yielded as text chunks."""
+    events = (
+        'data: {"choices": [{"text": "Hel"}]}\n\n'
+        'data: {"choices": [{"text": ""}]}\n\n'
+        'data: {"choices": [{"text": "lo"}]}\n\n'
+        'data: [DONE]\n\n'
+    )
+    specialist = _server_specialist(lambda request: httpx.Response(200, text=events))
+
+    chunks = [chunk async for chunk in specialist.execute_stream("Hi")]
+
+    assert chunks == ["Hel", "lo"]
+
+
+@pytest.mark.asyncio
+async def test_llama_server_available_probes_models():
+    """Test the async probe reports up on 200 and down on connection errors."""
+    from app.services.local_specialist_phi3 import llama_server_available
+
+    def refuse(request):
+        raise httpx.ConnectError("connection refused")
+
+    up = httpx.AsyncClient(base_url="http://llama/v1", transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"data": []})
+    ))
+    down = httpx.AsyncClient(base_url="http://llama/v1", transport=httpx.MockTransport(refuse))
+    with patch('app.services.local_specialist_phi3.get_llama_server_client', return_value=up):
+        assert await llama_server_available()
+    with patch('app.services.local_specialist_phi3.get_llama_server_client', return_value=down):
+        assert not await llama_server_available()
@@ -0,0 +1,107 @@
+"""
+Unit tests for the local RAG service.
+"""
+import pytest
+from unittest.mock import Mock, patch
+from langchain_core.documents import Document
+
+from app.services.rag import RAGService
+from app.services.vector_store import VectorStoreService
+
+
+@pytest.fixture
+def mock_vector_store():
+    """Create mock vector store returning two documents."""
+    vector_store = Mock(spec=VectorStoreService)
+    retriever = Mock()
+    retriever.invoke.return_value = [
+        Document(page_content="Content 1", metadata={"source": "/docs/doc1.pdf"}),
+        Document(page_content="Content 2", metadata={"source": "/docs/doc2.pdf"}),
+    ]
+    vector_store.get_retriever.return_value = retriever
+    return vector_store
+
+
+@pytest.fixture
+def rag_service(mock_vector_store):
+    """Create RAG service with a mock chat provider."""
+    service = RAGService(mock_vector_store, provider_type="cloud")
+    service.chat_provider = Mock()
+    service.chat_provider.generate.return_value = "Test answer"
+    return service
+
+
+def test_query_success(rag_service):
+    """Test query returns the answer with sources in retrieval order."""
+    answer, sources = rag_service.query("What is X?")
+
+    assert answer.startswith("Test answer")
+    assert sources == ["doc1.pdf", "doc2.pdf"]
+
+
+def test_query_reuses_cached_answer(rag_service):
+    """Test the same question over the same documents skips generation."""
+    rag_service.query("What is X?")
+    answer, sources = rag_service.query("  what is   x? ")
+
+    assert answer.startswith("Test answer")
+    assert sources == ["doc1.pdf", "doc2.pdf"]
+    rag_service.chat_provider.generate.assert_called_once()
+
+
+def test_query_cache_disabled(rag_service):
+    """Test a zero TTL always regenerates."""
+    with patch('app.services.rag.settings') as mock_settings:
+        mock_settings.rag_answer_cache_ttl = 0
+        rag_service.query("What is X?")
+        rag_service.query("What is X?")
+
+    assert rag_service.chat_provider.generate.call_count == 2
+
+
+def test_query_cache_disabled_skips_disk_tier(rag_service, tmp_path):
+    """Test a zero TTL neither reads nor writes the persistent cache."""
+    from app.services.disk_cache import DiskCache
+
+    rag_service._disk_cache = DiskCache(tmp_path / "rag_answers.sqlite3", ttl_seconds=60)
+    rag_service.query("What is X?")
+
+    with patch('app.services.rag.settings.rag_answer_cache_ttl', 0):
+        rag_service._answer_cache.clear()
+        rag_service.query("What is X?")
+        rag_service.query("What is Y?")
+
+    assert rag_service.chat_provider.generate.call_count == 3
+    key = rag_service._answer_key("What is Y?", ["Content 1", "Content 2"])
+    assert rag_service._disk_cache.get(rag_service._disk_key(key)) is None
+
+
+def test_disk_cache_not_shared_across_chat_models(mock_vector_store, tmp_path):
+    """Test answers persisted for one chat model are not served for another."""
+    from app.services.disk_cache import DiskCache
+
+    services = []
+    for model in ("/models/a.gguf", "/models/b.gguf"):
+        with patch('app.services.rag.settings.llamacpp_chat_model_path', model), \
+                patch('app.services.rag.ProviderFactory'):
+            service = RAGService(mock_vector_store, provider_type="llamacpp")
+        service.chat_provider = Mock()
+        service.chat_provider.generate.return_value = f"Answer from {model}"
+        service._disk_cache = DiskCache(tmp_path / "rag_answers.sqlite3", ttl_seconds=60)
+        services.append(service)
+
+    services[0].query("What is X?")
+    answer, _ = services[1].query("What is X?")
+
+    assert answer.startswith("Answer from /models/b.gguf")
+
+
+def test_query_does_not_cache_errors(rag_service):
+    """Test generation failures are retried on the next query."""
+    rag_service.chat_provider.generate.side_effect = [RuntimeError("boom"), "Recovered"]
+
+    first, _ = rag_service.query("What is X?")
+    second, _ = rag_service.query("What is X?")
+
+    assert first.startswith("❌")
+    assert second.startswith("Recovered")
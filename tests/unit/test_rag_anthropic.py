@@ -1,9 +1,10 @@
 """
 Unit tests for RAG Anthropic service.
 """
-import os
+import threading
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
+from config import settings
 from app.services.rag_anthropic import RAGAnthropicService
 from app.services.vector_store import VectorStoreService
 
@@ -18,7 +19,8 @@ def mock_vector_store():
 @pytest.fixture
 def mock_anthropic_client():
     """Create mock Anthropic client."""
-    with patch('app.services.rag_anthropic.Anthropic') as mock:
+    with patch('app.services.rag_anthropic.Anthropic') as mock, \
+            patch('app.services.rag_anthropic._client', None):
         client = MagicMock()
         mock.return_value = client
         yield client
@@ -27,14 +29,14 @@ def mock_anthropic_client():
 @pytest.fixture
 def rag_anthropic_service(mock_vector_store, mock_anthropic_client):
     """Create RAG Anthropic service instance."""
-    with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}):
+    with patch.object(settings, "anthropic_api_key", "test-key"):
         service = RAGAnthropicService(mock_vector_store)
         return service
 
 
 def test_initialization(mock_vector_store, mock_anthropic_client):
     """Test service initialization."""
-    with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}):
+    with patch.object(settings, "anthropic_api_key", "test-key"):
         service = RAGAnthropicService(mock_vector_store)
         assert service.vector_store == mock_vector_store
         assert service.model == "claude-sonnet-4-20250514"
@@ -42,10 +44,7 @@ def test_initialization(mock_vector_store, mock_anthropic_client):
 
 def test_initialization_custom_model(mock_vector_store, mock_anthropic_client):
     """Test service initialization with custom model."""
-    with patch.dict(os.environ, {
-        "ANTHROPIC_API_KEY": "test-key",
-        "ANTHROPIC_MODEL": "claude-opus-4-20250514"
-    }):
+    with patch.multiple(settings, anthropic_api_key="test-key", anthropic_model="claude-opus-4-20250514"):
         service = RAGAnthropicService(mock_vector_store)
         assert service.model == "claude-opus-4-20250514"
 
@@ -101,6 +100,109 @@ def test_query_success(rag_anthropic_service, mock_vector_store):
     assert "📚 Sources:" in answer
 
 
+@pytest.mark.asyncio
+async def test_aquery_success(rag_anthropic_service, mock_vector_store):
+    """Test async query uses the async Anthropic client."""
+    mock_doc = Mock()
+    mock_doc.page_content = "Test content"
+    mock_doc.metadata = {"source": "/path/to/doc1.pdf"}
+
+    mock_retriever = Mock()
+    mock_retriever.invoke.return_value = [mock_doc]
+    mock_vector_store.get_retriever.return_value = mock_retriever
+
+    mock_message = Mock()
+    mock_message.content = [Mock(text="Async answer")]
+    rag_anthropic_service.async_client = Mock()
+    rag_anthropic_service.async_client.messages.create = AsyncMock(return_value=mock_message)
+
+    answer, sources = await rag_anthropic_service.aquery("test question")
+
+    assert answer == "Async answer\n\n📚 Sources: doc1.pdf"
+    assert sources == ["doc1.pdf"]
+    rag_anthropic_service.client.messages.create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_aquery_retrieves_on_retriever_pool(rag_anthropic_service, mock_vector_store):
+    """Test async retrieval runs on the shared retriever thread pool."""
+    threads = []
+
+    def invoke(question):
+        threads.append(threading.current_thread().name)
+        mock_doc = Mock()
+        mock_doc.page_content = "Test content"
+        mock_doc.metadata = {"source": "doc1.pdf"}
+        return [mock_doc]
+
+    mock_retriever = Mock()
+    mock_retriever.invoke.side_effect = invoke
+    mock_vector_store.get_retriever.return_value = mock_retriever
+
+    mock_message = Mock()
+    mock_message.content = [Mock(text="Async answer")]
+    rag_anthropic_service.async_client = Mock()
+    rag_anthropic_service.async_client.messages.create = AsyncMock(return_value=mock_message)
+
+    await rag_anthropic_service.aquery("test question")
+
+    assert len(threads) == 1
+    assert threads[0].startswith("rag-retriever")
+
+
+@pytest.mark.asyncio
+async def test_aquery_reuses_earlier_retrieval(rag_anthropic_service, mock_vector_store):
+    """Test documents fetched by aretrieve are answered from without searching again."""
+    mock_doc = Mock()
+    mock_doc.page_content = "Test content"
+    mock_doc.metadata = {"source": "doc1.pdf"}
+
+    mock_retriever = Mock()
+    mock_retriever.invoke.return_value = [mock_doc]
+    mock_vector_store.get_retriever.return_value = mock_retriever
+
+    mock_message = Mock()
+    mock_message.content = [Mock(text="Async answer")]
+    rag_anthropic_service.async_client = Mock()
+    rag_anthropic_service.async_client.messages.create = AsyncMock(return_value=mock_message)
+
+    retrieval = await rag_anthropic_service.aretrieve("test question")
+    rag_anthropic_service.async_client.messages.create.assert_not_called()
+
+    answer, sources = await rag_anthropic_service.aquery("test question", retrieval=retrieval)
+
+    assert answer == "Async answer\n\n📚 Sources: doc1.pdf"
+    assert sources == ["doc1.pdf"]
+    mock_retriever.invoke.assert_called_once_with("test question")
+
+
+@pytest.mark.asyncio
+async def test_aquery_stream_yields_chunks_then_sources(rag_anthropic_service, mock_vector_store):
+    """Test streaming query yields answer deltas followed by citations."""
+    mock_doc = Mock()
+    mock_doc.page_content = "Test content"
+    mock_doc.metadata = {"source": "/path/to/doc1.pdf"}
+
+    mock_retriever = Mock()
+    mock_retriever.invoke.return_value = [mock_doc]
+    mock_vector_store.get_retriever.return_value = mock_retriever
+
+    async def text_stream():
+        for text in ("Streamed ", "answer"):
+            yield text
+
+    stream = MagicMock()
+    stream.__aenter__.return_value.text_stream = text_stream()
+    rag_anthropic_service.async_client = Mock()
+    rag_anthropic_service.async_client.messages.stream.return_value = stream
+
+    chunks = [chunk async for chunk in rag_anthropic_service.aquery_stream("test question")]
+
+    assert chunks == ["Streamed ", "answer", "\n\n📚 Sources: doc1.pdf"]
+    call_args = rag_anthropic_service.async_client.messages.stream.call_args
+    assert call_args.kwargs["max_tokens"] == 1024
+
+
 def test_query_without_sources(rag_anthropic_service, mock_vector_store):
     """Test query without source citations."""
     mock_doc = Mock()
@@ -122,6 +224,27 @@ def test_query_without_sources(rag_anthropic_service, mock_vector_store):
     assert "📚 Sources:" not in answer
 
 
+def test_query_without_sources_skips_source_metadata(rag_anthropic_service, mock_vector_store):
+    """Test source names are not collected when neither shown nor cached."""
+    mock_doc = Mock()
+    mock_doc.page_content = "Test content"
+    mock_doc.metadata = MagicMock()
+
+    mock_retriever = Mock()
+    mock_retriever.invoke.return_value = [mock_doc]
+    mock_vector_store.get_retriever.return_value = mock_retriever
+
+    mock_message = Mock()
+    mock_message.content = [Mock(text="Answer")]
+    rag_anthropic_service.client.messages.create.return_value = mock_message
+
+    answer, sources = rag_anthropic_service.query("test", include_sources=False)
+
+    assert answer == "Answer"
+    assert sources is None
+    mock_doc.metadata.get.assert_not_called()
+
+
 def test_query_anthropic_api_error(rag_anthropic_service, mock_vector_store):
     """Test query when Anthropic API fails."""
     mock_doc = Mock()
@@ -141,6 +264,58 @@ def test_query_anthropic_api_error(rag_anthropic_service, mock_vector_store):
     assert sources == ["doc.pdf"]
 
 
+
+@pytest.mark.asyncio
+async def test_query_batch(rag_anthropic_service, mock_vector_store):
+    """Test batch queries retrieve once and answer in question order."""
+    doc1 = Mock(page_content="Content 1", metadata={"source": "/path/to/doc1.pdf"})
+    doc2 = Mock(page_content="Content 2", metadata={"source": "/path/to/doc2.pdf"})
+
+    mock_retriever = Mock()
+    mock_retriever.batch.return_value = [[doc1], [doc2]]
+    mock_vector_store.get_retriever.return_value = mock_retriever
+
+    rag_anthropic_service.async_client = Mock()
+    rag_anthropic_service.async_client.messages.create = AsyncMock(side_effect=[
+        Mock(content=[Mock(text="Answer 1")]),
+        Mock(content=[Mock(text="Answer 2")]),
+    ])
+
+    results = await rag_anthropic_service.query_batch(["q1", "q2"], include_sources=False)
+
+    assert results == [("Answer 1", None), ("Answer 2", None)]
+    mock_retriever.batch.assert_called_once_with(["q1", "q2"])
+    mock_retriever.invoke.assert_not_called()
+
+
+def test_query_semantic_cache_hit(rag_anthropic_service, mock_vector_store):
+    """Test a repeated question is answered from the semantic cache."""
+    mock_doc = Mock()
+    mock_doc.page_content = "Test content"
+    mock_doc.metadata = {"source": "/path/to/doc1.pdf"}
+
+    mock_retriever = Mock()
+    mock_vector_store.get_retriever.return_value = mock_retriever
+    mock_vector_store.search_by_vector.return_value = [mock_doc]
+    mock_vector_store.embeddings = Mock()
+    mock_vector_store.embeddings.embed_query.return_value = [0.6, 0.8]
+
+    mock_message = Mock()
+    mock_message.content = [Mock(text="Cached answer")]
+    rag_anthropic_service.client.messages.create.return_value = mock_message
+
+    first = rag_anthropic_service.query("test question", include_sources=False)
+    second = rag_anthropic_service.query("test question?")
+
+    assert first == ("Cached answer", None)
+    assert second == ("Cached answer\n\n📚 Sources: doc1.pdf", ["doc1.pdf"])
+    rag_anthropic_service.client.messages.create.assert_called_once()
+    # Retrieval reuses the cache's question embedding instead of embedding again
+    mock_vector_store.search_by_vector.assert_called_once_with([0.6, 0.8], k=None)
+    assert mock_vector_store.embeddings.embed_query.call_count == 2  # once per question
+    mock_retriever.invoke.assert_not_called()
+    assert rag_anthropic_service.get_stats()["hits"] == 1
+
 def test_build_prompt(rag_anthropic_service):
     """Test prompt building."""
     contexts = ["Context 1", "Context 2"]
@@ -168,4 +343,15 @@ def test_generate(rag_anthropic_service):
     assert call_args[1]["model"] == "claude-sonnet-4-20250514"
     assert call_args[1]["max_tokens"] == 1024
     assert call_args[1]["messages"][0]["role"] == "user"
-    assert call_args[1]["messages"][0]["content"] == "test prompt"
\ No newline at end of file
+    assert call_args[1]["messages"][0]["content"] == "test prompt"
+
+
+def test_client_shared_between_instances(mock_vector_store, mock_anthropic_client):
+    """Test service instances reuse one module-level client."""
+    with patch.object(settings, "anthropic_api_key", "test-key"):
+        first = RAGAnthropicService(mock_vector_store)
+        second = RAGAnthropicService(mock_vector_store)
+
+    assert first.client is mock_anthropic_client
+    assert second.client is first.client
+    assert second.async_client is first.async_client
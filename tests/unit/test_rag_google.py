@@ -1,9 +1,9 @@
 """
 Unit tests for RAG Google service.
 """
-import os
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
+from config import settings
 from app.services.rag_google import RAGGoogleService
 from app.services.vector_store import VectorStoreService
 
@@ -18,14 +18,16 @@ def mock_vector_store():
 @pytest.fixture
 def mock_genai():
     """Create mock Google GenAI."""
-    with patch('app.services.rag_google.genai') as mock:
+    with patch('app.services.rag_google.genai') as mock, \
+            patch('app.services.cloud_specialist_google.genai', mock), \
+            patch('app.services.cloud_specialist_google._configured_key', None):
         yield mock
 
 
 @pytest.fixture
 def rag_google_service(mock_vector_store, mock_genai):
     """Create RAG Google service instance."""
-    with patch.dict(os.environ, {"GOOGLE_API_KEY": "test-key"}):
+    with patch.object(settings, "google_api_key", "test-key"):
         mock_model = MagicMock()
         mock_genai.GenerativeModel.return_value = mock_model
         service = RAGGoogleService(mock_vector_store)
@@ -34,7 +36,7 @@ def rag_google_service(mock_vector_store, mock_genai):
 
 def test_initialization(mock_vector_store, mock_genai):
     """Test service initialization."""
-    with patch.dict(os.environ, {"GOOGLE_API_KEY": "test-key"}):
+    with patch.object(settings, "google_api_key", "test-key"):
         mock_model = MagicMock()
         mock_genai.GenerativeModel.return_value = mock_model
         service = RAGGoogleService(mock_vector_store)
@@ -45,10 +47,7 @@ def test_initialization(mock_vector_store, mock_genai):
 
 def test_initialization_custom_model(mock_vector_store, mock_genai):
     """Test service initialization with custom model."""
-    with patch.dict(os.environ, {
-        "GOOGLE_API_KEY": "test-key",
-        "GOOGLE_MODEL": "gemini-1.5-pro"
-    }):
+    with patch.multiple(settings, google_api_key="test-key", google_model="gemini-1.5-pro"):
         mock_model = MagicMock()
         mock_genai.GenerativeModel.return_value = mock_model
         service = RAGGoogleService(mock_vector_store)
@@ -106,6 +105,54 @@ def test_query_success(rag_google_service, mock_vector_store):
     assert "📚 Sources:" in answer
 
 
+@pytest.mark.asyncio
+async def test_aquery_success(rag_google_service, mock_vector_store):
+    """Test async query uses the async Gemini API."""
+    mock_doc = Mock()
+    mock_doc.page_content = "Test content"
+    mock_doc.metadata = {"source": "/path/to/doc1.pdf"}
+
+    mock_retriever = Mock()
+    mock_retriever.invoke.return_value = [mock_doc]
+    mock_vector_store.get_retriever.return_value = mock_retriever
+
+    mock_response = Mock()
+    mock_response.text = "Async answer"
+    rag_google_service.model.generate_content_async = AsyncMock(return_value=mock_response)
+
+    answer, sources = await rag_google_service.aquery("test question", include_sources=False)
+
+    assert answer == "Async answer"
+    assert sources is None
+    rag_google_service.model.generate_content.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_aquery_stream_yields_chunks(rag_google_service, mock_vector_store):
+    """Test streaming query yields Gemini chunks as they arrive."""
+    mock_doc = Mock()
+    mock_doc.page_content = "Test content"
+    mock_doc.metadata = {"source": "/path/to/doc1.pdf"}
+
+    mock_retriever = Mock()
+    mock_retriever.invoke.return_value = [mock_doc]
+    mock_vector_store.get_retriever.return_value = mock_retriever
+
+    async def response():
+        for text in ("Streamed ", "", "answer"):
+            yield Mock(text=text)
+
+    rag_google_service.model.generate_content_async = AsyncMock(return_value=response())
+
+    chunks = [
+        chunk async for chunk in rag_google_service.aquery_stream("test question", include_sources=False)
+    ]
+
+    assert chunks == ["Streamed ", "answer"]
+    call_args = rag_google_service.model.generate_content_async.call_args
+    assert call_args.kwargs["stream"] is True
+
+
 def test_query_without_sources(rag_google_service, mock_vector_store):
     """Test query without source citations."""
     mock_doc = Mock()
@@ -146,6 +193,27 @@ def test_query_google_api_error(rag_google_service, mock_vector_store):
     assert sources == ["doc.pdf"]
 
 
+
+@pytest.mark.asyncio
+async def test_query_batch(rag_google_service, mock_vector_store):
+    """Test batch queries retrieve once and answer in question order."""
+    doc1 = Mock(page_content="Content 1", metadata={"source": "/path/to/doc1.pdf"})
+    doc2 = Mock(page_content="Content 2", metadata={"source": "/path/to/doc2.pdf"})
+
+    mock_retriever = Mock()
+    mock_retriever.batch.return_value = [[doc1], [doc2]]
+    mock_vector_store.get_retriever.return_value = mock_retriever
+
+    rag_google_service.model.generate_content_async = AsyncMock(
+        side_effect=[Mock(text="Answer 1"), Mock(text="Answer 2")]
+    )
+
+    results = await rag_google_service.query_batch(["q1", "q2"], include_sources=False)
+
+    assert results == [("Answer 1", None), ("Answer 2", None)]
+    mock_retriever.batch.assert_called_once_with(["q1", "q2"])
+    mock_retriever.invoke.assert_not_called()
+
 def test_build_prompt(rag_google_service):
     """Test prompt building."""
     contexts = ["Context 1", "Context 2"]
@@ -167,4 +235,27 @@ def test_generate(rag_google_service):
     answer = rag_google_service._generate("test prompt")
 
     assert answer == "Generated answer"
-    rag_google_service.model.generate_content.assert_called_once_with("test prompt")
\ No newline at end of file
+    rag_google_service.model.generate_content.assert_called_once_with("test prompt")
+
+
+def test_configure_called_once_per_key(mock_vector_store, mock_genai):
+    """Test the SDK is configured once and reused across instances."""
+    with patch.object(settings, "google_api_key", "test-key"):
+        RAGGoogleService(mock_vector_store)
+        RAGGoogleService(mock_vector_store)
+
+    mock_genai.configure.assert_called_once_with(api_key="test-key")
+
+
+def test_configure_shared_with_cloud_specialists(mock_vector_store, mock_genai):
+    """Test specialists and the router reuse the RAG service's SDK configuration."""
+    from app.services.cloud_router_google import CloudRouterGoogleService
+    from app.services.cloud_specialist_google import CloudSpecialistGoogleService
+
+    with patch.object(settings, "google_api_key", "test-key"), \
+            patch('app.services.cloud_router_google.genai', mock_genai):
+        RAGGoogleService(mock_vector_store)
+        CloudSpecialistGoogleService("general_chat")
+        CloudRouterGoogleService()
+
+    mock_genai.configure.assert_called_once_with(api_key="test-key")
@@ -0,0 +1,102 @@
+"""
+Unit tests for RouterService decision caching.
+"""
+import pytest
+from unittest.mock import Mock, patch
+
+from app.services.disk_cache import DiskCache
+from app.services.router import RouterService
+
+
+@pytest.fixture
+def router():
+    """Create router delegating to a mock cloud router."""
+    with patch.object(RouterService, '_check_enabled', return_value=False):
+        service = RouterService()
+    service.enabled = True
+    service.cloud_router = Mock()
+    service.cloud_router.route.return_value = {
+        "primary_agent": "code_generation",
+        "parallel_agents": ["code_analysis"],
+        "confidence": 0.9,
+        "reasoning": "code request"
+    }
+    return service
+
+
+def test_route_caches_normalized_message(router):
+    """Test messages differing only in case/whitespace reuse the decision."""
+    first = router.route("Write a sorting function")
+    second = router.route("  write a   SORTING function ")
+
+    assert second == first
+    router.cloud_router.route.assert_called_once()
+
+
+def test_route_returns_independent_copies(router):
+    """Test callers cannot mutate the cached decision."""
+    router.route("Write a sorting function")["parallel_agents"].append("rag_query")
+
+    assert router.route("Write a sorting function")["parallel_agents"] == ["code_analysis"]
+
+
+def test_route_does_not_cache_failures(router):
+    """Test router error fallbacks are retried."""
+    router.cloud_router.route.side_effect = RuntimeError("timeout")
+
+    router.route("Write a sorting function")
+    router.route("Write a sorting function")
+
+    assert router.cloud_router.route.call_count == 2
+
+
+def test_clear_cache(router):
+    """Test clearing the cache forces a new classification."""
+    router.route("Write a sorting function")
+    router.clear_cache()
+    router.route("Write a sorting function")
+
+    assert router.cloud_router.route.call_count == 2
+
+
+def test_route_uses_disk_cache_across_instances(router, tmp_path):
+    """Test decisions persisted to disk are reused after a restart."""
+    router._disk_cache = DiskCache(tmp_path / "router.sqlite3", ttl_seconds=60)
+    decision = router.route("Write a sorting function")
+
+    with patch.object(RouterService, '_check_enabled', return_value=False):
+        restarted = RouterService()
+    restarted.enabled = True
+    restarted.cloud_router = Mock()
+    restarted._disk_cache = DiskCache(tmp_path / "router.sqlite3", ttl_seconds=60)
+
+    assert restarted.route("write a sorting function") == decision
+    restarted.cloud_router.route.assert_not_called()
+
+
+def test_disk_keys_identify_model_and_prompt(router):
+    """Test persisted decisions are keyed on the routing model and prompt template."""
+    router.cloud_router = None
+    router.router_type = "local"
+    with patch('app.services.router.settings.router_model_path', "/models/router.gguf"):
+        setup = router._routing_setup_id()
+        with patch.object(RouterService, 'ROUTING_PROMPT_SUFFIX', "\nCategory:"):
+            edited_prompt = router._routing_setup_id()
+    with patch('app.services.router.settings.router_model_path', "/models/other.gguf"):
+        other_model = router._routing_setup_id()
+
+    assert len({setup, edited_prompt, other_model}) == 3
+
+
+def test_cache_disabled_skips_disk_tier(router, tmp_path):
+    """Test ROUTER_CACHE_SIZE=0 neither reads nor writes persisted decisions."""
+    router._disk_cache = DiskCache(tmp_path / "router.sqlite3", ttl_seconds=60)
+    router.route("Write a sorting function")
+
+    with patch('app.services.router.settings.router_cache_size', 0):
+        router._decision_cache.clear()
+        router.route("Write a sorting function")
+        router.route("Explain recursion")
+
+    assert router.cloud_router.route.call_count == 3
+    assert router._disk_cache.get(router._disk_key("explain recursion")) is None
@@ -0,0 +1,73 @@
+"""
+Unit tests for local RouterService model loading and warmup.
+"""
+from unittest.mock import MagicMock, patch
+
+from app.services.router import RouterService
+
+
+def _tokenize(text, add_bos):
+    """Fake tokenizer: one id per word, BOS as 1."""
+    return ([1] if add_bos else []) + [len(word) for word in text.decode().split()]
+
+
+def _init_local_router(llm):
+    llm.tokenize.side_effect = _tokenize
+    with patch.object(RouterService, '_check_enabled', return_value=False):
+        router = RouterService()
+    router.enabled = True
+    with patch('app.services.router.LLAMA_CPP_AVAILABLE', True), \
+            patch('app.services.router.Llama', create=True, return_value=llm), \
+            patch('app.services.router.LlamaGrammar', create=True):
+        router._initialize_llm()
+    return router
+
+
+def test_initialize_llm_runs_warmup_inference():
+    """Test a one-token routing prompt is evaluated at startup."""
+    llm = MagicMock()
+
+    router = _init_local_router(llm)
+
+    assert router.enabled
+    llm.assert_called_once()
+    assert llm.call_args.args[0] == router._build_routing_tokens("hello")
+    assert llm.call_args.kwargs["max_tokens"] == 1
+
+
+def test_routing_tokens_reuse_pretokenized_prefix_and_suffix():
+    """Test only the message is tokenized per call."""
+    llm = MagicMock()
+    router = _init_local_router(llm)
+    llm.tokenize.reset_mock()
+
+    tokens = router._build_routing_tokens("sort a list")
+
+    assert tokens == router._prefix_ids + [4, 1, 4] + router._suffix_ids
+    assert tokens[0] == 1
+    llm.tokenize.assert_called_once_with(b"sort a list", add_bos=False)
+
+
+def test_warmup_failure_keeps_router_enabled():
+    """Test warmup is best effort."""
+    llm = MagicMock(side_effect=RuntimeError("boom"))
+
+    router = _init_local_router(llm)
+
+    assert router.enabled
+    assert router.router_type == "local"
+
+
+def test_prompt_sent_as_text_when_tokenizer_not_split_stable():
+    """Test pretokenized parts are dropped if they differ from the joined prompt."""
+    llm = MagicMock()
+    router = _init_local_router(llm)
+    # SentencePiece-style: every call starts with a space piece (id 0)
+    llm.tokenize.side_effect = lambda text, add_bos: [1] * add_bos + [0] + _tokenize(text, False)
+    router._prefix_ids = router._suffix_ids = None
+
+    router._pretokenize_prompt()
+
+    assert router._prefix_ids is None
+    assert router._build_routing_tokens("sort a list") == router._build_routing_prompt("sort a list")
+    assert "User message: sort a list\n" in router._build_routing_prompt("sort a list")
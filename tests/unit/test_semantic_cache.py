@@ -0,0 +1,65 @@
+"""
+Unit tests for the semantic answer cache.
+"""
+import pytest
+from unittest.mock import patch
+
+from app.services.semantic_cache import SemanticCache
+
+
+@pytest.fixture
+def cache():
+    """Create a small semantic cache."""
+    return SemanticCache(max_size=2, ttl_seconds=60, threshold=0.9)
+
+
+def test_get_empty_cache_misses(cache):
+    """Test lookups on an empty cache miss."""
+    assert cache.get([1.0, 0.0]) is None
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_similar_question_hits(cache):
+    """Test a near-identical embedding returns the stored answer."""
+    cache.put([1.0, 0.0], "answer", ["doc1.pdf"])
+
+    assert cache.get([0.99, 0.05]) == ("answer", ["doc1.pdf"])
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_dissimilar_question_misses(cache):
+    """Test embeddings below the threshold miss."""
+    cache.put([1.0, 0.0], "answer", None)
+
+    assert cache.get([0.0, 1.0]) is None
+
+
+def test_expired_entries_miss(cache):
+    """Test entries are ignored once their TTL has passed."""
+    with patch('app.services.semantic_cache.time.monotonic', return_value=100.0):
+        cache.put([1.0, 0.0], "answer", None)
+
+    with patch('app.services.semantic_cache.time.monotonic', return_value=161.0):
+        assert cache.get([1.0, 0.0]) is None
+
+
+def test_full_cache_evicts_least_recently_used(cache):
+    """Test the least recently used entry is replaced when full."""
+    clock = iter(range(1, 10))
+    with patch('app.services.semantic_cache.time.monotonic', side_effect=lambda: float(next(clock))):
+        cache.put([1.0, 0.0], "first", None)
+        cache.put([0.0, 1.0], "second", None)
+        cache.get([1.0, 0.0])  # "first" is now the most recently used
+        cache.put([0.7, 0.7], "third", None)
+
+        assert cache.get([1.0, 0.0]) == ("first", None)
+        assert cache.get([0.0, 1.0]) is None
+    assert cache.get_stats()["size"] == 2
+
+
+def test_disabled_cache_stores_nothing():
+    """Test a zero TTL disables the cache."""
+    cache = SemanticCache(max_size=2, ttl_seconds=0)
+    cache.put([1.0, 0.0], "answer", None)
+
+    assert cache.get([1.0, 0.0]) is None
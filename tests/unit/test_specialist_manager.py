@@ -0,0 +1,383 @@
+"""
+Unit tests for SpecialistManager local model loading.
+"""
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from config import settings
+from app.services.specialist_manager import SpecialistManager
+
+
+@pytest.mark.asyncio
+async def test_ensure_phi3_loads_once_under_concurrency():
+    """Test concurrent first requests share a single model load."""
+    model = Mock()
+
+    def slow_load():
+        time.sleep(0.05)
+        return model
+
+    manager = SpecialistManager()
+    with patch('app.services.specialist_manager.get_shared_phi3', create=True,
+               side_effect=slow_load) as mock_load:
+        results = await asyncio.gather(*(manager._ensure_phi3() for _ in range(5)))
+
+    assert all(result is model for result in results)
+    mock_load.assert_called_once()
+    assert manager.get_status()["local"]["model_loaded"]
+
+
+@pytest.mark.asyncio
+async def test_prewarm_local_loads_model_in_background():
+    """Test startup prewarm schedules the Phi-3 load once."""
+    model = Mock()
+    manager = SpecialistManager()
+    manager.has_local = manager.has_local_model = True
+
+    with patch('app.services.specialist_manager.get_shared_phi3', create=True,
+               return_value=model) as mock_load, \
+            patch('app.services.specialist_manager.llama_server_available',
+                  AsyncMock(return_value=False)):
+        manager.prewarm_local()
+        manager.prewarm_local()
+        await manager._phi3_preload
+
+    mock_load.assert_called_once()
+    assert manager._phi3_model is model
+
+
+@pytest.mark.asyncio
+async def test_local_specialist_uses_llama_server_when_running():
+    """Test a running llama-server is used instead of loading Phi-3 in-process."""
+    probe = AsyncMock(return_value=True)
+    with patch('app.services.specialist_manager.llama_server_available', probe), \
+            patch.object(settings, 'local_specialist_via_server', True):
+        manager = SpecialistManager()
+        probe.assert_not_called()  # no blocking check at startup
+
+        assert manager.llama_server_enabled and not manager.has_local
+        with patch('app.services.specialist_manager.get_shared_phi3', create=True) as mock_load, \
+                patch('app.services.specialist_manager.LlamaServerPhi3Service') as mock_server:
+            manager.prewarm_local()
+            await manager._phi3_preload
+            assert manager.has_local  # the server answered the probe
+            specialist = await manager._local_specialist("general_chat")
+
+    assert specialist is mock_server.return_value
+    mock_load.assert_not_called()
+    probe.assert_called_once()  # second lookup reused the probe
+    assert manager.get_status()["local"]["via_server"]
+
+
+@pytest.mark.asyncio
+async def test_llama_server_probe_expires():
+    """Test a llama-server that comes up after startup is picked up once the probe expires."""
+    probe = AsyncMock(side_effect=[False, True])
+    with patch('app.services.specialist_manager.llama_server_available', probe), \
+            patch.object(settings, 'local_specialist_via_server', True), \
+            patch.object(settings, 'provider_probe_ttl_s', 0.0):
+        manager = SpecialistManager()
+        manager.has_local_model = False
+
+        with pytest.raises(RuntimeError, match="llama-server is not reachable"):
+            await manager._local_specialist("general_chat")
+        with patch('app.services.specialist_manager.LlamaServerPhi3Service') as mock_server:
+            assert await manager._local_specialist("general_chat") is mock_server.return_value
+
+
+@pytest.mark.asyncio
+async def test_lost_llama_server_falls_back_in_process():
+    """Test a llama-server connection failure retries on the in-process model."""
+    import httpx
+    from app.services.local_specialist_phi3 import LlamaServerPhi3Service
+
+    manager = SpecialistManager()
+    manager.has_anthropic = manager.has_google = False
+    manager.has_local = manager.has_local_model = True
+
+    server = Mock(spec=LlamaServerPhi3Service)
+    server.execute = AsyncMock(side_effect=httpx.ConnectError("connection refused"))
+    in_process = Mock()
+    in_process.execute = AsyncMock(return_value="local answer")
+
+    with patch.object(manager, '_local_specialist', AsyncMock(return_value=server)), \
+            patch.object(manager, '_ensure_phi3', AsyncMock()), \
+            patch('app.services.specialist_manager.LocalSpecialistPhi3Service', return_value=in_process):
+        response = await manager.execute_with_fallback("general_chat", "hi")
+
+    assert response == "local answer"
+    assert manager._llama_server_state[1] is False
+
+
+@pytest.mark.asyncio
+async def test_prewarm_local_skipped_without_local_model():
+    """Test nothing is scheduled when no local model is configured."""
+    manager = SpecialistManager()
+    manager.has_local = manager.has_local_model = manager.llama_server_enabled = False
+
+    manager.prewarm_local()
+
+    assert manager._phi3_preload is None
+
+
+@pytest.mark.asyncio
+async def test_local_unavailable_without_model_or_running_server():
+    """Test Local is not reported available just because llama-server mode is on."""
+    probe = AsyncMock(return_value=False)
+    with patch('app.services.specialist_manager.llama_server_available', probe), \
+            patch('app.services.specialist_manager.LLAMA_CPP_AVAILABLE', False):
+        manager = SpecialistManager()
+        assert not manager.has_local
+        assert not manager.get_status()["local"]["available"]
+
+        with patch('app.services.specialist_manager.get_shared_phi3', create=True) as mock_load:
+            manager.prewarm_local()
+            if manager._phi3_preload is not None:
+                await manager._phi3_preload
+
+    assert not manager.has_local
+    assert not manager.get_status()["local"]["available"]
+    mock_load.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cloud_specialists_reused_per_type():
+    """Test cloud specialists are built once per type until caches reset."""
+    manager = SpecialistManager()
+    manager.has_anthropic = True
+
+    with patch('app.services.specialist_manager.CloudSpecialistAnthropicService',
+               side_effect=lambda specialist_type: Mock(specialist_type=specialist_type)) as mock_cls:
+        first = await manager.get_specialist("code_generation")
+        again = await manager.get_specialist("code_generation")
+        other = await manager.get_specialist("code_analysis")
+        manager.reset_caches()
+        rebuilt = await manager.get_specialist("code_generation")
+
+    assert again is first
+    assert other is not first
+    assert rebuilt is not first
+    assert mock_cls.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_execute_falls_back_to_next_provider():
+    """Test a failing provider trips its breaker and the next one answers."""
+    manager = SpecialistManager()
+    manager.has_anthropic = True
+    manager.has_google = True
+    manager.has_local = False
+
+    failing = Mock()
+    failing.execute = AsyncMock(side_effect=RuntimeError("overloaded"))
+    working = Mock()
+    working.execute = AsyncMock(return_value="google answer")
+
+    with patch.object(manager, '_anthropic_specialist', return_value=failing), \
+            patch.object(manager, '_google_specialist', return_value=working), \
+            patch.object(manager.anthropic_breaker, 'record_failure') as anthropic_failure, \
+            patch.object(manager.google_breaker, 'record_success') as google_success:
+        response = await manager.execute_with_fallback("general_chat", "hi")
+
+    assert response == "google answer"
+    anthropic_failure.assert_called_once()
+    google_success.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_execute_stream_without_providers_raises():
+    """Test streaming with nothing configured reports unavailability."""
+    manager = SpecialistManager()
+    manager.has_anthropic = manager.has_google = manager.has_local = False
+
+    with pytest.raises(RuntimeError, match="No specialists available"):
+        async for _ in manager.execute_stream_with_fallback("general_chat", "hi"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_execute_times_out_and_falls_back():
+    """Test a hung provider is abandoned for the next one without a retry."""
+    manager = SpecialistManager()
+    manager.has_anthropic = True
+    manager.has_google = True
+    manager.has_local = False
+
+    async def hang(message, context):
+        await asyncio.sleep(10)
+
+    hung = Mock()
+    hung.execute = Mock(side_effect=hang)
+    working = Mock()
+    working.execute = AsyncMock(return_value="google answer")
+
+    with patch.multiple(settings, anthropic_timeout_s=0.01, min_output_tokens_per_s=0), \
+            patch.object(manager, '_anthropic_specialist', return_value=hung), \
+            patch.object(manager, '_google_specialist', return_value=working):
+        response = await manager.execute_with_fallback("general_chat", "hi")
+
+    assert response == "google answer"
+    assert hung.execute.call_count == 1
+    assert manager.anthropic_breaker.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_gives_long_answers_time_to_finish():
+    """Test the stall timeout is extended by the time a full-length answer takes."""
+    manager = SpecialistManager()
+    manager.has_anthropic = True
+    manager.has_google = True
+
+    async def long_answer(message, context):
+        await asyncio.sleep(0.1)
+        return "long answer"
+
+    slow = Mock()
+    slow.execute = Mock(side_effect=long_answer)
+    fallback = Mock()
+    fallback.execute = AsyncMock(return_value="google answer")
+
+    with patch.multiple(settings, specialist_timeout=0, anthropic_timeout_s=0.01,
+                        specialist_max_tokens=100, min_output_tokens_per_s=500), \
+            patch.object(manager, '_anthropic_specialist', return_value=slow), \
+            patch.object(manager, '_google_specialist', return_value=fallback):
+        response = await manager.execute_with_fallback("general_chat", "hi")
+
+    assert response == "long answer"
+    fallback.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_hung_cloud_providers_leave_time_for_local():
+    """Test both clouds hanging still lets Local answer within specialist_timeout."""
+    manager = SpecialistManager()
+    manager.has_anthropic = True
+    manager.has_google = True
+    manager.has_local = True
+
+    async def hang(message, context):
+        await asyncio.sleep(10)
+
+    hung = Mock()
+    hung.execute = Mock(side_effect=hang)
+    local = Mock()
+    local.execute = AsyncMock(return_value="local answer")
+
+    with patch.multiple(settings, specialist_timeout=0.3, anthropic_timeout_s=20.0,
+                        google_timeout_s=20.0), \
+            patch.object(manager, '_anthropic_specialist', return_value=hung), \
+            patch.object(manager, '_google_specialist', return_value=hung), \
+            patch.object(manager, '_local_specialist', return_value=local):
+        response = await asyncio.wait_for(
+            manager.execute_with_fallback("general_chat", "hi"), settings.specialist_timeout
+        )
+
+    assert response == "local answer"
+    assert hung.execute.call_count == 2  # once per cloud provider
+
+
+@pytest.mark.asyncio
+async def test_long_healthy_executions_do_not_open_breaker():
+    """Test full generation time is not counted against the latency threshold."""
+    with patch.object(settings, 'circuit_breaker_latency_ms', 1.0):
+        manager = SpecialistManager()
+    manager.has_anthropic = True
+
+    async def slow(message, context):
+        await asyncio.sleep(0.005)
+        return "long answer"
+
+    specialist = Mock()
+    specialist.execute = Mock(side_effect=slow)
+
+    with patch.object(manager, '_anthropic_specialist', return_value=specialist):
+        for _ in range(manager.anthropic_breaker.min_latency_samples + 5):
+            assert await manager.execute_with_fallback("general_chat", "hi") == "long answer"
+
+    assert manager.anthropic_breaker.state == "CLOSED"
+
+
+@pytest.mark.asyncio
+async def test_execute_stream_stall_falls_back():
+    """Test a stalled stream moves on to the next provider."""
+    manager = SpecialistManager()
+    manager.has_anthropic = True
+    manager.has_google = True
+    manager.has_local = False
+
+    async def stalled(message, context):
+        await asyncio.sleep(10)
+        yield "never"
+
+    async def streaming(message, context):
+        yield "google "
+        yield "answer"
+
+    hung = Mock(execute_stream=stalled)
+    working = Mock(execute_stream=streaming)
+
+    with patch.object(settings, 'first_token_timeout_s', 0.01), \
+            patch.object(manager, '_anthropic_specialist', return_value=hung), \
+            patch.object(manager, '_google_specialist', return_value=working):
+        chunks = [chunk async for chunk in manager.execute_stream_with_fallback("general_chat", "hi")]
+
+    assert chunks == ["google ", "answer"]
+    assert manager.anthropic_breaker.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_stream_failure_after_first_chunk_does_not_switch_provider():
+    """Test a stream that fails mid-response raises instead of appending another answer."""
+    manager = SpecialistManager()
+    manager.has_anthropic = True
+    manager.has_google = True
+    manager.has_local = False
+
+    async def breaks(message, context):
+        yield "partial "
+        raise RuntimeError("connection reset")
+
+    working = Mock()
+
+    chunks = []
+    with patch.object(manager, '_anthropic_specialist', return_value=Mock(execute_stream=breaks)), \
+            patch.object(manager, '_google_specialist', return_value=working):
+        with pytest.raises(RuntimeError, match="mid-response"):
+            async for chunk in manager.execute_stream_with_fallback("general_chat", "hi"):
+                chunks.append(chunk)
+
+    assert chunks == ["partial "]
+    working.execute_stream.assert_not_called()
+    assert manager.anthropic_breaker.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_unreachable_provider_skipped_after_failure():
+    """Test a failed provider is probed first and skipped while unreachable."""
+    manager = SpecialistManager()
+    manager.has_anthropic = True
+    manager.has_google = True
+    manager.has_local = False
+
+    failing = Mock()
+    failing.execute = AsyncMock(side_effect=RuntimeError("connection reset"))
+    working = Mock()
+    working.execute = AsyncMock(return_value="google answer")
+
+    with patch.object(manager, '_anthropic_specialist', return_value=failing), \
+            patch.object(manager, '_google_specialist', return_value=working), \
+            patch('app.services.specialist_manager.urllib.request.getproxies', return_value={}), \
+            patch('app.services.specialist_manager.asyncio.open_connection',
+                  side_effect=OSError("network unreachable")) as mock_connect:
+        await manager.execute_with_fallback("general_chat", "hi")
+        mock_connect.assert_not_called()  # healthy providers are never probed
+
+        await manager.execute_with_fallback("general_chat", "hi")
+        await manager.execute_with_fallback("general_chat", "hi")
+
+    assert failing.execute.call_count == 1
+    mock_connect.assert_called_once()  # probe result reused within the TTL
+    assert mock_connect.call_args.args == ("api.anthropic.com", 443)
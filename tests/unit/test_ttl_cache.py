@@ -0,0 +1,45 @@
+"""
+Unit tests for the in-memory TTL cache.
+"""
+from unittest.mock import patch
+
+from app.services.ttl_cache import TTLCache
+
+
+def test_entries_expire_after_ttl():
+    """Test values are returned within the TTL and dropped after it."""
+    cache = TTLCache()
+
+    with patch("app.services.ttl_cache.time.monotonic", return_value=100.0):
+        cache.set("key", "value", ttl_seconds=10)
+        assert cache.get("key", ttl_seconds=10) == "value"
+    with patch("app.services.ttl_cache.time.monotonic", return_value=110.0):
+        assert cache.get("key", ttl_seconds=10) is None
+
+    assert len(cache) == 0
+
+
+def test_zero_ttl_stores_nothing():
+    """Test a non-positive TTL disables caching."""
+    cache = TTLCache()
+    cache.set("key", "value", ttl_seconds=0)
+
+    assert cache.get("key", ttl_seconds=0) is None
+    assert len(cache) == 0
+
+
+def test_full_cache_prunes_expired_then_oldest():
+    """Test expired entries go first, then the oldest live ones."""
+    cache = TTLCache(max_entries=2)
+
+    with patch("app.services.ttl_cache.time.monotonic", return_value=0.0):
+        cache.set("old", 1, ttl_seconds=10)
+    with patch("app.services.ttl_cache.time.monotonic", return_value=20.0):
+        cache.set("a", 2, ttl_seconds=10)
+        cache.set("b", 3, ttl_seconds=10)
+        assert len(cache) == 2
+        cache.set("c", 4, ttl_seconds=10)
+
+        assert cache.get("a", ttl_seconds=10) is None
+        assert cache.get("b", ttl_seconds=10) == 3
+        assert cache.get("c", ttl_seconds=10) == 4